@@ -1,20 +1,22 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
-from .models import User, UserInterest, UserRating
+from .models import Recommendation, User, UserInterest, UserRating
 
 
 @admin.register(User)
 class UserAdmin(DjangoUserAdmin):
     list_display = ('username', 'email', 'city', 'neighborhood', 'is_restricted', 'is_staff')
     list_filter = ('is_restricted', 'is_staff', 'is_active', 'city')
+    list_select_related = ('city', 'neighborhood')
     search_fields = ('username', 'email')
 
     fieldsets = DjangoUserAdmin.fieldsets + (
         ('CityConnect Profile', {
-            'fields': ('gender', 'city', 'neighborhood', 'avatar', 'bio', 'is_restricted'),
+            'fields': ('gender', 'city', 'neighborhood', 'avatar', 'avatar_thumbnails', 'bio', 'is_restricted'),
         }),
     )
+    readonly_fields = ('avatar_thumbnails',)
 
 
 @admin.register(UserInterest)
@@ -28,4 +30,11 @@ class UserInterestAdmin(admin.ModelAdmin):
 class UserRatingAdmin(admin.ModelAdmin):
     list_display = ('rater', 'ratee', 'rating')
     list_filter = ('rating',)
-    search_fields = ('rater__username', 'ratee__username')
\ No newline at end of file
+    search_fields = ('rater__username', 'ratee__username')
+
+
+@admin.register(Recommendation)
+class RecommendationAdmin(admin.ModelAdmin):
+    list_display = ('user', 'computed_at')
+    readonly_fields = ('computed_at',)
+    search_fields = ('user__username',)
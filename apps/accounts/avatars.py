@@ -0,0 +1,178 @@
+"""
+Avatar thumbnails.
+
+Uploads are streamed to a temporary file on disk (FILE_UPLOAD_HANDLERS)
+and checked by validate_avatar() before they are stored. Pages never
+serve or decode the original: every avatar is rendered once into fixed
+square sizes in two formats,
+
+    avatars/thumbs/<avatar name>-<size>.<webp|jpg>    for size in SIZES
+
+and templates pick between them with srcset ({% avatar %} in
+templatetags/avatars.py). The storage makes every upload's full name
+(directory and extension included) unique, so thumbnail names built from
+it never collide — photo.png and photo.jpg get separate thumbnails — and
+their URLs change with every new avatar and can be cached forever.
+
+Rendering is off the request path: saving a new upload enqueues an
+'avatar_thumbnails' outbox message (apps/core/outbox.py) for
+`manage.py run_outbox`. User.avatar_thumbnails records which upload the
+thumbnails were rendered from; until it matches User.avatar the
+templates show the placeholder. `manage.py regenerate_avatars` redoes
+every user in parallel worker processes, e.g. after changing SIZES.
+
+Pillow is imported lazily so it stays out of request startup.
+"""
+
+import multiprocessing
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+
+SIZES = (48, 128, 256)
+# (extension, Pillow format, save options), preferred format first.
+FORMATS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+)
+THUMBNAIL_DIR = 'avatars/thumbs'
+# Fields a queryset needs for {% avatar %} without extra queries.
+AVATAR_FIELDS = ('avatar', 'avatar_thumbnails')
+
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+MAX_PIXELS = 40_000_000  # a 40-megapixel photo; anything bigger is a decompression bomb risk
+ALLOWED_FORMATS = {'JPEG', 'PNG', 'WEBP', 'GIF'}
+DEFAULT_CHUNK_SIZE = 100
+
+
+def validate_avatar(value):
+    """Model validator for User.avatar; only new uploads are opened."""
+    if getattr(value, '_committed', True):
+        return
+    if value.size > MAX_UPLOAD_BYTES:
+        raise ValidationError(f"Avatars can be at most {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.")
+
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        # Image.open() only parses the header, so this costs nothing like a decode.
+        with Image.open(value) as image:
+            image_format, (width, height) = image.format, image.size
+    except Image.DecompressionBombError:
+        # Pillow's own limit (2 x MAX_IMAGE_PIXELS), checked in Image.open().
+        raise ValidationError("That image is too large; please upload a smaller one.")
+    except (UnidentifiedImageError, OSError):
+        raise ValidationError("Upload a valid JPEG, PNG, WebP or GIF image.")
+    finally:
+        value.seek(0)
+    if image_format not in ALLOWED_FORMATS:
+        raise ValidationError("Upload a valid JPEG, PNG, WebP or GIF image.")
+    if width * height > MAX_PIXELS:
+        raise ValidationError("That image is too large; please upload a smaller one.")
+
+
+def thumbnail_name(avatar_name, size, ext):
+    return f'{THUMBNAIL_DIR}/{avatar_name}-{size}.{ext}'
+
+
+def _prepare(image):
+    """Upright RGB, with any transparency flattened onto white."""
+    from PIL import Image, ImageOps
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_thumbnails(avatar_name, storage=default_storage):
+    """Write every SIZES x FORMATS variant of `avatar_name`; returns the names written."""
+    from PIL import Image, ImageOps
+
+    largest = max(SIZES)
+    with storage.open(avatar_name, 'rb') as f, Image.open(f) as image:
+        # JPEGs decode straight at a reduced scale instead of full resolution.
+        image.draft('RGB', (largest * 2, largest * 2))
+        base = ImageOps.fit(_prepare(image), (largest, largest), Image.LANCZOS)
+
+    written = []
+    for size in SIZES:
+        thumb = base if size == largest else base.resize((size, size), Image.LANCZOS)
+        for ext, image_format, options in FORMATS:
+            buffer = BytesIO()
+            thumb.save(buffer, image_format, **options)
+            name = thumbnail_name(avatar_name, size, ext)
+            if storage.exists(name):
+                storage.delete(name)
+            written.append(storage.save(name, ContentFile(buffer.getvalue())))
+    return written
+
+
+def generate(user_id):
+    """Render thumbnails for the user's current avatar. Returns False if there is none."""
+    from apps.accounts.models import User
+
+    avatar_name = User.objects.filter(pk=user_id).values_list('avatar', flat=True).first()
+    if not avatar_name:
+        return False
+    render_thumbnails(avatar_name)
+    # Conditional, so a newer upload saved meanwhile isn't marked as done.
+    User.objects.filter(pk=user_id, avatar=avatar_name).update(avatar_thumbnails=avatar_name)
+    return True
+
+
+def schedule(user_id):
+    """Queue thumbnail rendering for `user_id`, or render now when the outbox is off."""
+    from apps.core import outbox
+    if outbox.is_enabled():
+        outbox.enqueue('avatar_thumbnails', {'user_id': user_id})
+        return
+    generate(user_id)
+
+
+def _generate_chunk(user_ids):
+    rendered = 0
+    for user_id in user_ids:
+        rendered += generate(user_id)
+    return rendered
+
+
+def generate_all(workers=None, chunk_size=DEFAULT_CHUNK_SIZE, missing_only=False, log=None):
+    """Re-render thumbnails for every user with an avatar. Returns the number rendered."""
+    from django.db.models import F
+
+    from apps.accounts.models import User
+
+    users = User.objects.exclude(avatar='')
+    if missing_only:
+        users = users.exclude(avatar_thumbnails=F('avatar'))
+    user_ids = list(users.order_by('pk').values_list('pk', flat=True))
+    chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+
+    workers = workers or multiprocessing.cpu_count()
+    rendered = done = 0
+    if workers > 1 and len(chunks) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Children must not inherit the parent's open database sockets.
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for chunk, count in zip(chunks, pool.map(_generate_chunk, chunks)):
+                rendered += count
+                done += len(chunk)
+                if log:
+                    log(f"Rendered avatars for {done}/{len(user_ids)} users")
+    else:
+        for chunk in chunks:
+            rendered += _generate_chunk(chunk)
+            done += len(chunk)
+            if log:
+                log(f"Rendered avatars for {done}/{len(user_ids)} users")
+    return rendered
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+from apps.accounts import identity
+
+
+class CachedUserBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() — run by AuthenticationMiddleware on
+    every request — answers from the identity snapshot in identity.py
+    when settings.IDENTITY_CACHE is on, and queries the User row as usual
+    otherwise. Authentication and permissions are unchanged.
+    """
+
+    def get_user(self, user_id):
+        if not getattr(settings, 'IDENTITY_CACHE', False):
+            return super().get_user(user_id)
+        user = identity.get_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
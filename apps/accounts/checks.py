@@ -0,0 +1,34 @@
+"""
+System checks for settings that are only safe on a cache every process
+shares. On the per-process LocMemCache a session ended, or an identity
+snapshot forgotten, in one worker stays live in every other worker's copy.
+"""
+
+from django.conf import settings
+from django.core import checks
+
+from apps.core.checks import is_per_process
+
+CACHED_SESSION_ENGINES = {
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+
+@checks.register(checks.Tags.security, checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    errors = []
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES and is_per_process(settings.SESSION_CACHE_ALIAS):
+        errors.append(checks.Error(
+            f"SESSION_ENGINE {settings.SESSION_ENGINE!r} needs a shared cache, "
+            f"but the {settings.SESSION_CACHE_ALIAS!r} cache is per-process.",
+            hint="Configure Redis or Memcached in CACHES, or use the 'db' session engine.",
+            id='accounts.E001',
+        ))
+    if getattr(settings, 'IDENTITY_CACHE', False) and is_per_process('default'):
+        errors.append(checks.Error(
+            "IDENTITY_CACHE needs a shared cache, but the 'default' cache is per-process.",
+            hint="Configure Redis or Memcached in CACHES, or turn IDENTITY_CACHE off.",
+            id='accounts.E002',
+        ))
+    return errors
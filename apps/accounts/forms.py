@@ -2,10 +2,55 @@ from django import forms
 from django.contrib.auth.forms import AuthenticationForm
 from django.core.exceptions import ValidationError
 
+from apps.core import reference
+
 from .models import User
 
 
+class ReferenceChoiceField(forms.ChoiceField):
+    """
+    Select over a reference table (City, Neighborhood, ...) served from the
+    in-process cache in apps.core.reference, so rendering and validating it
+    costs no queries. Cleans to the cached model instance.
+
+    `options` returns the instances to offer; `lookup` maps a submitted pk
+    back to an instance (or None).
+    """
+
+    def __init__(self, options, lookup, **kwargs):
+        self._options = options
+        self._lookup = lookup
+        super().__init__(choices=self._build_choices, **kwargs)
+
+    def _build_choices(self):
+        return [('', '---------')] + [(obj.pk, str(obj)) for obj in self._options()]
+
+    @property
+    def options(self):
+        return self._options()
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        obj = self._lookup(value)
+        if obj is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+        return obj
+
+    def validate(self, value):
+        if value is None and self.required:
+            raise ValidationError(self.error_messages['required'], code='required')
+
+
+def _neighborhood_in_city(postal_code, city_code):
+    neighborhood = reference.neighborhood(postal_code)
+    if neighborhood is None or str(neighborhood.city_id) != str(city_code):
+        return None
+    return neighborhood
+
+
 class SignupForm(forms.ModelForm):
+    city = ReferenceChoiceField(reference.cities, reference.city, required=False)
     password1 = forms.CharField(label='Password', widget=forms.PasswordInput, min_length=8)
     password2 = forms.CharField(label='Confirm password', widget=forms.PasswordInput)
 
@@ -13,6 +58,17 @@ class SignupForm(forms.ModelForm):
         model = User
         fields = ['username', 'email', 'gender', 'city', 'neighborhood']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Offer and accept only the chosen city's neighborhoods; the signup
+        # page refills the select from core:neighborhoods when the city changes.
+        city_code = self['city'].value()
+        self.fields['neighborhood'] = ReferenceChoiceField(
+            lambda: reference.neighborhoods(city_code) if city_code else [],
+            lambda postal_code: _neighborhood_in_city(postal_code, city_code),
+            required=False,
+        )
+
     def clean_email(self):
         email = self.cleaned_data['email']
         if User.objects.filter(email__iexact=email).exists():
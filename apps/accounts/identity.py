@@ -0,0 +1,75 @@
+"""
+Cached identity for authenticated requests.
+
+AuthenticationMiddleware resolves request.user on every request through
+the auth backend's get_user(), which normally SELECTs the whole User row.
+With settings.IDENTITY_CACHE on, CachedUserBackend (backends.py) answers
+from a compact snapshot in the cache instead:
+
+    {'values': [<SNAPSHOT_FIELDS...>], 'auth_hash': '<session auth hash>'}
+
+The snapshot becomes a real User instance via Model.from_db() with every
+other field deferred, so code that reads, say, user.bio still works (one
+query for that field) and user.save() only writes the fields it loaded.
+The session auth hash is stored instead of the password hash, and the
+city/neighborhood come from the reference snapshot, so a typical page
+knows who is asking without touching the database.
+
+Freshness: apps/accounts/signals.py forgets a user's snapshot on every
+User save or delete, and the counter/mask helpers that bypass save()
+(adjust_unread_counts, sync_interest_mask) forget it themselves. Bulk
+rebuild commands don't; SNAPSHOT_TIMEOUT bounds how long they can lag.
+Forgetting only reaches other processes through a shared cache, which is
+why checks.py refuses IDENTITY_CACHE on LocMemCache.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core import metrics, reference
+
+SNAPSHOT_TIMEOUT = 5 * 60  # 5 minutes
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'is_active', 'is_staff', 'is_superuser', 'is_restricted',
+    'city', 'neighborhood', 'unread_notification_count', 'interest_mask',
+)
+
+
+def _cache_key(user_id):
+    return f'identity:{user_id}'
+
+
+def _attnames():
+    # In concrete field order, which is what Model.from_db() expects.
+    from apps.accounts.models import User
+    return [f.attname for f in User._meta.concrete_fields if f.name in SNAPSHOT_FIELDS]
+
+
+def get_user(user_id):
+    """Return the User for `user_id` built from its snapshot, or None if it doesn't exist."""
+    from apps.accounts.models import User
+
+    data = cache.get(_cache_key(user_id))
+    metrics.record_cache(hit=data is not None)
+    if data is None:
+        user = User.objects.only(*SNAPSHOT_FIELDS, 'password').filter(pk=user_id).first()
+        if user is None:
+            return None
+        data = {
+            'values': [getattr(user, attname) for attname in _attnames()],
+            'auth_hash': user.get_session_auth_hash(),
+        }
+        cache.set(_cache_key(user_id), data, SNAPSHOT_TIMEOUT)
+
+    user = User.from_db(User.objects.db, _attnames(), data['values'])
+    user._session_auth_hash = data['auth_hash']
+    reference.attach([user])
+    return user
+
+
+def forget(*user_ids):
+    """Drop the snapshots of `user_ids` once the current transaction commits."""
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    if keys:
+        # After commit, so a concurrent request can't re-cache the old row.
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute \"people you may know\" recommendations for every user "
+        "from interest overlap and friends-of-friends. Meant to run nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default: CPU count; 1 runs in-process).")
+        parser.add_argument('--chunk-size', type=int, default=recommendations.DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        written = recommendations.compute_all(
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Stored recommendations for {written} users."))
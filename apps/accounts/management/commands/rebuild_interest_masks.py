@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = "Recompute User.interest_mask from UserInterest."
+
+    def handle(self, *args, **options):
+        from apps.accounts.match_index import interest_mask
+        from apps.accounts.models import User, UserInterest
+
+        masks = {}
+        rows = UserInterest.objects.values_list('user_id', 'interest_id').iterator(chunk_size=10_000)
+        for user_id, interest_id in rows:
+            masks[user_id] = masks.get(user_id, 0) | interest_mask([interest_id])
+
+        # One UPDATE per distinct mask — the catalog is small, so there are few.
+        by_mask = {}
+        for user_id, mask in masks.items():
+            by_mask.setdefault(mask, []).append(user_id)
+
+        with transaction.atomic():
+            User.objects.exclude(interest_mask=0).update(interest_mask=0)
+            for mask, user_ids in by_mask.items():
+                for i in range(0, len(user_ids), 10_000):
+                    User.objects.filter(pk__in=user_ids[i:i + 10_000]).update(interest_mask=mask)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt interest masks for {len(masks)} users ({len(by_mask)} distinct)."
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+class Command(BaseCommand):
+    help = "Recompute User.rating_sum and User.rating_count from UserRating."
+
+    def handle(self, *args, **options):
+        from apps.accounts.models import User, UserRating
+
+        received = (
+            UserRating.objects
+            .filter(ratee=OuterRef('pk'))
+            .order_by()
+            .values('ratee')
+        )
+        updated = User.objects.update(
+            rating_sum=Coalesce(
+                Subquery(received.annotate(total=Sum('rating')).values('total'), output_field=IntegerField()),
+                Value(0),
+            ),
+            rating_count=Coalesce(
+                Subquery(received.annotate(total=Count('id')).values('total'), output_field=IntegerField()),
+                Value(0),
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rating totals for {updated} users."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.accounts import avatars
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render every user's avatar thumbnails (all SIZES in WebP and JPEG) "
+        "in parallel worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Worker processes (default: CPU count; 1 runs in-process).")
+        parser.add_argument('--chunk-size', type=int, default=avatars.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--missing-only', action='store_true',
+                            help="Skip users whose thumbnails already match their avatar.")
+
+    def handle(self, *args, **options):
+        rendered = avatars.generate_all(
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            missing_only=options['missing_only'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rendered thumbnails for {rendered} avatars."))
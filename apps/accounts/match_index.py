@@ -0,0 +1,248 @@
+"""
+Precomputed interest-overlap index used by MatchingStrategy.
+
+Every matching scope (one city, or one neighborhood) keeps a small index
+in worker memory instead of re-running the UserInterest JOIN per request:
+
+    members: {user_id: mask, ...}
+    buckets: {mask: [(username, user_id), ...], ...}
+
+`mask` is a user's interest set packed into an int (bit n set means the
+user holds Interest pk n). Each bucket is kept sorted by username, and
+users without interests are never stored since they can't match anyone.
+
+Because the interest catalog is small, a scope can have at most
+2 ** len(interests) buckets however many users live in it. Ranking only
+has to group buckets by popcount(bucket_mask & user_mask) and merge the
+already-sorted bucket lists, so producing the next entry no longer costs
+a scan of everyone sharing an interest. Offset paging still walks past
+every skipped entry; keyset paging (ranked(after=...)) does not.
+
+Freshness: this is a single-process cache. The index is built lazily on
+first read and patched in place, under a lock, by apps/accounts/signals.py
+when UserInterest rows or a user's scope change in this process. Other
+workers only see those changes once their copy expires, so indexes are
+rebuilt from the database every MATCH_INDEX_TTL seconds.
+
+The same mask is stored on User.interest_mask, so code that has to stay
+in the database (the ORM matching fallback, search, admin) can filter
+with shares_interests() and rank with shared_interest_count() instead of
+joining UserInterest.
+"""
+
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.db.models import F, Value
+from django.db.models.lookups import GreaterThan
+
+from apps.core import metrics
+
+# Bounds how stale another worker's writes can look here.
+MATCH_INDEX_TTL = 60  # seconds
+SCOPES = ('city', 'neighborhood')
+# User.interest_mask is a signed 64-bit column; bit 63 would make it negative.
+MAX_INTEREST_ID = 62
+
+
+def interest_mask(interest_ids) -> int:
+    mask = 0
+    for interest_id in interest_ids:
+        if not 0 <= interest_id <= MAX_INTEREST_ID:
+            raise ValueError(
+                f"Interest pk {interest_id} doesn't fit User.interest_mask (max {MAX_INTEREST_ID})."
+            )
+        mask |= 1 << interest_id
+    return mask
+
+
+def interest_ids(mask) -> list:
+    return [bit for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+
+def shares_interests(mask):
+    """Filter expression: User.interest_mask has any bit of `mask` set."""
+    return GreaterThan(F('interest_mask').bitand(mask), 0)
+
+
+def shared_interest_count(mask):
+    """
+    Annotation: popcount(User.interest_mask & mask), spelled as a sum of
+    ((interest_mask >> n) & 1) over the bits of `mask` so it runs on any
+    backend without a popcount function.
+    """
+    bits = [F('interest_mask').bitrightshift(bit).bitand(1) for bit in interest_ids(mask)]
+    if not bits:
+        return Value(0)
+    total = bits[0]
+    for bit in bits[1:]:
+        total = total + bit
+    return total
+
+
+_lock = threading.Lock()
+_indexes = {}  # {(scope, scope_id): (MatchIndex, built_at)}
+
+
+class MatchIndex:
+    """Bucketed interest-overlap index for a single matching scope."""
+
+    def __init__(self, scope, scope_id, members=None, buckets=None):
+        self.scope = scope
+        self.scope_id = scope_id
+        self.members = members or {}
+        self.buckets = buckets or {}
+
+    # ------------------------------------------------------------------
+    # Loading / persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, scope, scope_id):
+        """Return this worker's index for the scope, (re)building it when missing or expired."""
+        entry = _indexes.get((scope, scope_id))
+        fresh = entry is not None and time.monotonic() - entry[1] < MATCH_INDEX_TTL
+        metrics.record_cache(hit=fresh)
+        if fresh:
+            return entry[0]
+        # Built outside the lock; a concurrent rebuild of the same scope
+        # just means the last one wins.
+        index = cls.build(scope, scope_id)
+        with _lock:
+            _indexes[(scope, scope_id)] = (index, time.monotonic())
+        return index
+
+    @classmethod
+    def build(cls, scope, scope_id):
+        from apps.accounts.models import User
+
+        rows = (
+            User.objects
+            .filter(**{f'{scope}_id': scope_id}, interest_mask__gt=0)
+            .values_list('id', 'username', 'interest_mask')
+        )
+        index = cls(scope, scope_id)
+        for user_id, username, mask in rows:
+            index._insert(user_id, username, mask)
+        return index
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------------
+    def _insert(self, user_id, username, mask):
+        if not mask:
+            return
+        self.members[user_id] = mask
+        insort(self.buckets.setdefault(mask, []), (username, user_id))
+
+    def _remove(self, user_id):
+        mask = self.members.pop(user_id, None)
+        if mask is None:
+            return
+        bucket = self.buckets.get(mask, [])
+        for i, (_, member_id) in enumerate(bucket):
+            if member_id == user_id:
+                del bucket[i]
+                break
+        if not bucket:
+            self.buckets.pop(mask, None)
+
+    def upsert(self, user_id, username, mask):
+        self._remove(user_id)
+        self._insert(user_id, username, mask)
+
+    def discard(self, user_id):
+        self._remove(user_id)
+
+    # ------------------------------------------------------------------
+    # Ranking
+    # ------------------------------------------------------------------
+    def _groups(self, user_mask):
+        """Return {shared_count: [bucket, ...]} for buckets overlapping user_mask."""
+        groups = {}
+        # list() snapshots the dict so a concurrent patch can't resize it mid-loop.
+        for mask, bucket in list(self.buckets.items()):
+            shared = (mask & user_mask).bit_count()
+            if shared:
+                groups.setdefault(shared, []).append(bucket)
+        return groups
+
+    def ranked(self, user_mask, after=None):
+        """
+        Yield (shared_count, username, user_id) ordered by
+        (-shared_count, username), optionally starting strictly after the
+        (shared_count, username) key `after`.
+        """
+        groups = self._groups(user_mask)
+        for shared in sorted(groups, reverse=True):
+            if after is not None and shared > after[0]:
+                continue
+            buckets = groups[shared]
+            if after is not None and shared == after[0]:
+                buckets = [b[bisect_left(b, (after[1], float('inf'))):] for b in buckets]
+            for username, user_id in heapq.merge(*buckets):
+                yield shared, username, user_id
+
+    def ranked_reverse(self, user_mask, before):
+        """
+        Yield (shared_count, username, user_id) in reverse ranking order,
+        starting strictly before the (shared_count, username) key `before`.
+        """
+        groups = self._groups(user_mask)
+        for shared in sorted(groups):
+            if shared < before[0]:
+                continue
+            buckets = groups[shared]
+            if shared == before[0]:
+                buckets = [b[:bisect_left(b, (before[1], float('-inf')))] for b in buckets]
+            for username, user_id in heapq.merge(*(reversed(b) for b in buckets), reverse=True):
+                yield shared, username, user_id
+
+    def count(self, user_mask, exclude_ids=()):
+        total = sum(
+            len(bucket) for mask, bucket in self.buckets.items() if mask & user_mask
+        )
+        for user_id in exclude_ids:
+            mask = self.members.get(user_id)
+            if mask is not None and mask & user_mask:
+                total -= 1
+        return total
+
+
+def invalidate(scope, scope_id):
+    """Drop this worker's index for a scope; the next read rebuilds it from the database."""
+    with _lock:
+        _indexes.pop((scope, scope_id), None)
+
+
+def update_user(user, mask, scopes=None):
+    """Re-slot `user` under `mask` in every cached index for its current scopes."""
+    for scope in scopes or SCOPES:
+        scope_id = getattr(user, f'{scope}_id')
+        if scope_id is None:
+            continue
+        _update_cached(scope, scope_id, lambda index: index.upsert(user.id, user.username, mask))
+
+
+def remove_user(user_id, scope, scope_id):
+    if scope_id is None:
+        return
+    _update_cached(scope, scope_id, lambda index: index.discard(user_id))
+
+
+def _update_cached(scope, scope_id, apply):
+    # Only patch indexes that are already warm — a cold scope is built
+    # from the database on its next read anyway. Patching in place under
+    # the lock keeps two writers from losing each other's change.
+    with _lock:
+        entry = _indexes.get((scope, scope_id))
+        if entry is not None:
+            apply(entry[0])
+
+
+def user_mask_from_db(user_id) -> int:
+    from apps.accounts.models import UserInterest
+    return interest_mask(
+        UserInterest.objects.filter(user_id=user_id).values_list('interest_id', flat=True)
+    )
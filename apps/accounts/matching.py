@@ -6,11 +6,34 @@ The platform supports matching by city scope and neighborhood scope.
 Encoding both as interchangeable strategy classes means adding a new
 scope (e.g., country-wide) requires only a new class — MatchingContext
 and every call site stay untouched.
+
+City and neighborhood scopes are served from the precomputed
+interest-overlap index in match_index.py; the ORM query remains the
+fallback for scopes that have no index. The 'recommended' scope ranks a
+city by a composite score instead (scoring.py), and 'people' reads the
+nightly "people you may know" table (recommendations.py).
 """
 
 from abc import ABC, abstractmethod
+from itertools import islice
+
+from apps.accounts import scoring
+from apps.accounts.match_index import MatchIndex, shared_interest_count, shares_interests
+from apps.accounts.recommendations import friendship_fields
+from apps.core import reference
+from apps.core.pagination import KeysetPage, build_keyset_page, decode_cursor, get_keyset_page
 
-from django.db.models import Count, Q
+
+def friend_ids(user_id):
+    """
+    IDs of `user_id`'s friends, excluded from every match list. Empty while
+    the social app has no Friendship model (see
+    recommendations.friendship_fields()), so matching works without it.
+    """
+    model, _ = friendship_fields()
+    if model is None:
+        return []
+    return model.objects.get_friend_ids(user_id)
 
 
 class MatchingStrategy(ABC):
@@ -21,50 +44,260 @@ class MatchingStrategy(ABC):
         """Return a Django ORM filter dict to scope the candidate user pool."""
         pass
 
+    # Name of the match_index scope this strategy can be served from. None
+    # means the strategy always runs the ORM query below.
+    index_scope = None
+
     def get_matches(self, user, page=1, per_page=10):
-        from apps.accounts.models import User
-        from apps.social.models import Friendship
+        if self.index_scope and getattr(user, f'{self.index_scope}_id') is not None:
+            return self._get_indexed_matches(user, page, per_page)
+        return self._get_queryset_matches(user, page, per_page)
+
+    def _get_indexed_matches(self, user, page, per_page):
+        """
+        Offset paging over the index: the merged ranking is walked from
+        the top and the first (page - 1) * per_page entries are skipped,
+        so page n costs O(n * per_page). get_matches_page() resumes from a
+        cursor instead and stays O(per_page) at any depth.
+        """
+        index = MatchIndex.load(self.index_scope, getattr(user, f'{self.index_scope}_id'))
+        user_mask = index.members.get(user.id, 0)
+        if not user_mask:
+            return [], 0
+
+        excluded = set(friend_ids(user.id))
+        excluded.add(user.id)
 
+        offset = (page - 1) * per_page
+        ranked = (entry for entry in index.ranked(user_mask) if entry[2] not in excluded)
+        entries = list(islice(ranked, offset, offset + per_page))
+        return _hydrate(entries), index.count(user_mask, excluded)
+
+    def _get_queryset_matches(self, user, page, per_page):
+        from apps.accounts.models import User
         scope_filter = self.get_scope_filter(user)
-        user_interest_ids = list(user.interests.values_list('id', flat=True))
+        user_mask = user.interest_mask
 
-        if not user_interest_ids:
+        if not user_mask:
             return [], 0
 
-        friend_ids = Friendship.objects.get_friend_ids(user.id)
+        excluded_ids = friend_ids(user.id)
 
         queryset = (
             User.objects
             .filter(**scope_filter)
-            .filter(interests__id__in=user_interest_ids)
+            .filter(shares_interests(user_mask))
             .exclude(id=user.id)
-            .exclude(id__in=friend_ids)
-            .annotate(shared_count=Count('interests', filter=Q(interests__id__in=user_interest_ids)))
+            .exclude(id__in=excluded_ids)
+            .annotate(shared_count=shared_interest_count(user_mask))
             .order_by('-shared_count', 'username')
-            .distinct()
         )
 
         total = queryset.count()
         offset = (page - 1) * per_page
         return queryset[offset:offset + per_page], total
 
+    def get_matches_page(self, user, cursor=None, per_page=10, with_count=False):
+        """
+        Keyset-paginated variant of get_matches(), seeking on
+        (-shared_count, username). Returns a KeysetPage whose
+        next_cursor / prev_cursor feed back into `cursor`.
+        """
+        if self.index_scope and getattr(user, f'{self.index_scope}_id') is not None:
+            return self._get_indexed_matches_page(user, cursor, per_page, with_count)
+        return self._get_queryset_matches_page(user, cursor, per_page, with_count)
+
+    def _get_indexed_matches_page(self, user, cursor, per_page, with_count):
+        index = MatchIndex.load(self.index_scope, getattr(user, f'{self.index_scope}_id'))
+        user_mask = index.members.get(user.id, 0)
+        if not user_mask:
+            return KeysetPage([], count=0 if with_count else None)
+
+        excluded = set(friend_ids(user.id))
+        excluded.add(user.id)
+
+        direction, key = decode_cursor(cursor)
+        if key is not None and len(key) != 2:
+            direction, key = None, None
+        if direction == 'prev':
+            ranked = index.ranked_reverse(user_mask, before=key)
+        else:
+            ranked = index.ranked(user_mask, after=key)
+        entries = list(islice((e for e in ranked if e[2] not in excluded), per_page + 1))
+
+        page = build_keyset_page(
+            entries, per_page, direction or 'next',
+            key=lambda entry: [entry[0], entry[1]],
+            had_cursor=key is not None,
+            count=index.count(user_mask, excluded) if with_count else None,
+        )
+        page.object_list = _hydrate(page.object_list)
+        return page
+
+    def _get_queryset_matches_page(self, user, cursor, per_page, with_count):
+        from apps.accounts.models import User
+        user_mask = user.interest_mask
+        if not user_mask:
+            return KeysetPage([], count=0 if with_count else None)
+
+        queryset = (
+            User.objects
+            .filter(**self.get_scope_filter(user))
+            .filter(shares_interests(user_mask))
+            .exclude(id=user.id)
+            .exclude(id__in=friend_ids(user.id))
+            .annotate(shared_count=shared_interest_count(user_mask))
+        )
+        return get_keyset_page(
+            queryset, cursor, per_page,
+            ordering=['-shared_count', 'username'],
+            with_count=with_count,
+            scope=user.id,
+        )
+
+
+def _hydrate(entries):
+    """Turn ranked (shared_count, username, user_id) entries into User objects."""
+    from apps.accounts.models import User
+
+    users = User.objects.in_bulk([user_id for _, _, user_id in entries])
+    reference.attach(users.values())
+    matches = []
+    for shared_count, _, user_id in entries:
+        match = users.get(user_id)
+        if match is not None:
+            match.shared_count = shared_count
+            matches.append(match)
+    return matches
+
 
 class CityMatchingStrategy(MatchingStrategy):
+    index_scope = 'city'
+
     def get_scope_filter(self, user) -> dict:
         return {'city': user.city}
 
 
 class NeighborhoodMatchingStrategy(MatchingStrategy):
+    index_scope = 'neighborhood'
+
     def get_scope_filter(self, user) -> dict:
         return {'neighborhood': user.neighborhood}
 
 
+class RankedListStrategy(MatchingStrategy):
+    """
+    Base for strategies whose ranking is already materialized as a
+    best-first list of (score, tiebreak, user_id, shared_count) entries;
+    paging is slicing, and cursors seek on (score, tiebreak).
+
+    _ranked() may return None to hand the request to `fallback_class`.
+    """
+
+    fallback_class = None
+
+    @abstractmethod
+    def _ranked(self, user):
+        pass
+
+    def _without_friends(self, user, entries):
+        if not entries:
+            return []
+        friends = set(friend_ids(user.id))
+        return [entry for entry in entries if entry[2] not in friends]
+
+    def get_matches(self, user, page=1, per_page=10):
+        ranked = self._ranked(user)
+        if ranked is None:
+            return self.fallback_class().get_matches(user, page, per_page)
+        offset = (page - 1) * per_page
+        return _hydrate_scored(ranked[offset:offset + per_page]), len(ranked)
+
+    def get_matches_page(self, user, cursor=None, per_page=10, with_count=False):
+        ranked = self._ranked(user)
+        if ranked is None:
+            return self.fallback_class().get_matches_page(user, cursor, per_page, with_count)
+
+        direction, key = decode_cursor(cursor)
+        if key is not None and len(key) != 2:
+            direction, key = None, None
+        if key is None:
+            rows = ranked[:per_page + 1]
+        elif direction == 'prev':
+            end = scoring.seek(ranked, key) - 1
+            rows = ranked[max(end - per_page - 1, 0):end][::-1]
+        else:
+            start = scoring.seek(ranked, key)
+            rows = ranked[start:start + per_page + 1]
+
+        page = build_keyset_page(
+            rows, per_page, direction or 'next',
+            key=lambda entry: [entry[0], entry[1]],
+            had_cursor=key is not None,
+            count=len(ranked) if with_count else None,
+        )
+        page.object_list = _hydrate_scored(page.object_list)
+        return page
+
+
+class RecommendedMatchingStrategy(RankedListStrategy):
+    """
+    City-wide matches ranked by scoring.py's composite of shared interests,
+    neighborhood, rating and recency rather than by shared_count alone.
+    Only the cached top scoring.TOP_K candidates are pageable.
+    """
+
+    def get_scope_filter(self, user) -> dict:
+        return {'city': user.city}
+
+    def _ranked(self, user):
+        if user.city_id is None:
+            return []
+        entries, _ = scoring.top_matches(user)
+        return self._without_friends(user, entries)
+
+
+class PeopleYouMayKnowStrategy(RankedListStrategy):
+    """
+    Reads the nightly precomputed recommendations (recommendations.py),
+    which mix interest overlap with friends-of-friends. Users who have no
+    row yet — typically signed up since the last run — get live city
+    matches instead.
+    """
+
+    fallback_class = CityMatchingStrategy
+
+    def get_scope_filter(self, user) -> dict:
+        return {}
+
+    def _ranked(self, user):
+        from apps.accounts.recommendations import stored_recommendations
+
+        entries = stored_recommendations(user.id)
+        if entries is None:
+            return None
+        return self._without_friends(user, [
+            (score, user_id, user_id, shared) for user_id, score, shared, _ in entries
+        ])
+
+
+def _hydrate_scored(entries):
+    """_hydrate() for (score, tiebreak, user_id, shared_count) entries; sets match_score too."""
+    matches = _hydrate([(shared, tiebreak, user_id) for _, tiebreak, user_id, shared in entries])
+    scores = {user_id: score for score, _, user_id, _ in entries}
+    for match in matches:
+        match.match_score = scores[match.id]
+    return matches
+
+
 class MatchingContext:
     """Selects and executes the appropriate matching strategy."""
 
     STRATEGIES = {
         'city': CityMatchingStrategy,
         'neighborhood': NeighborhoodMatchingStrategy,
+        'recommended': RecommendedMatchingStrategy,
+        'people': PeopleYouMayKnowStrategy,
     }
 
     def __init__(self, scope: str):
@@ -76,7 +309,11 @@ class MatchingContext:
     def get_matches(self, user, page=1, per_page=10):
         return self._strategy.get_matches(user, page, per_page)
 
+    def get_matches_page(self, user, cursor=None, per_page=10, with_count=False):
+        return self._strategy.get_matches_page(user, cursor, per_page, with_count)
+
 
 # Usage:
-#   context = MatchingContext(scope='city')  # or 'neighborhood'
-#   matches, total = context.get_matches(request.user, page=page_number)
\ No newline at end of file
+#   context = MatchingContext(scope='city')  # or 'neighborhood', 'recommended', 'people'
+#   matches, total = context.get_matches(request.user, page=page_number)
+#   page = context.get_matches_page(request.user, cursor=request.GET.get('cursor'))
\ No newline at end of file
@@ -1,6 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+
+from .avatars import validate_avatar
+from .match_index import MAX_INTEREST_ID
 
 
 class User(AbstractUser):
@@ -11,8 +14,31 @@ class User(AbstractUser):
     neighborhood = models.ForeignKey('core.Neighborhood', null=True, blank=True, on_delete=models.SET_NULL)
     interests = models.ManyToManyField('core.Interest', through='UserInterest', blank=True)
     is_restricted = models.BooleanField(default=False)
-    avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    avatar = models.ImageField(upload_to='avatars/', null=True, blank=True, validators=[validate_avatar])
+    # Name of the avatar upload the current thumbnails were rendered from;
+    # see avatars.py. Templates fall back to a placeholder until it matches.
+    avatar_thumbnails = models.CharField(max_length=100, blank=True, editable=False)
     bio = models.TextField(blank=True)
+    # Denormalized count of unread NotificationRecords, maintained by
+    # apps/core/notifications.py and rebuilt by `manage.py rebuild_unread_counts`.
+    unread_notification_count = models.PositiveIntegerField(default=0)
+    # Denormalized UserRating totals for ratings this user has received,
+    # maintained by apps/accounts/ratings.py and rebuilt by
+    # `manage.py rebuild_rating_totals`.
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    # The user's interests packed into one integer (bit n set means the
+    # user holds Interest pk n), kept in sync with UserInterest by
+    # signals.py so overlap queries never join the M2M table. Interest
+    # pks must stay at or below match_index.MAX_INTEREST_ID to fit, which
+    # UserInterest enforces.
+    interest_mask = models.BigIntegerField(default=0)
+
+    # Written only through their helpers' UPDATE ... SET col = col + n (or
+    # the rebuild commands), never by save(): an instance loaded before a
+    # notification or rating arrived would otherwise write its stale copy
+    # back over the maintained value.
+    DENORMALIZED_FIELDS = frozenset({'unread_notification_count', 'rating_sum', 'rating_count', 'interest_mask'})
 
     class Meta:
         indexes = [
@@ -23,10 +49,48 @@ class User(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The matching scope as loaded, so signals.py can tell whether a
+        # save moved the user without re-reading the row.
+        loaded = dict(zip(field_names, values))
+        if all(name in loaded for name in ('username', 'city_id', 'neighborhood_id')):
+            instance._loaded_match_scope = (loaded['username'], loaded['city_id'], loaded['neighborhood_id'])
+        return instance
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is None and not self._state.adding and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.DENORMALIZED_FIELDS and f.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+    def get_session_auth_hash(self):
+        # Identity snapshots (identity.py) carry the hash, not the password;
+        # once the password is loaded or changed, derive it as usual.
+        if 'password' not in self.__dict__ and hasattr(self, '_session_auth_hash'):
+            return self._session_auth_hash
+        return super().get_session_auth_hash()
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class UserInterest(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    interest = models.ForeignKey('core.Interest', on_delete=models.CASCADE)
+    # Interests past the last bit of User.interest_mask can't be held:
+    # forms and the admin neither offer nor accept them, and code that
+    # bypasses validation gets a ValueError from match_index.interest_mask().
+    interest = models.ForeignKey(
+        'core.Interest', on_delete=models.CASCADE,
+        limit_choices_to={'pk__lte': MAX_INTEREST_ID},
+    )
 
     class Meta:
         unique_together = ('user', 'interest')
@@ -45,4 +109,25 @@ class UserRating(models.Model):
         unique_together = ('rater', 'ratee')
 
     def __str__(self):
-        return f'{self.rater.username} -> {self.ratee.username}: {self.rating}'
\ No newline at end of file
+        return f'{self.rater.username} -> {self.ratee.username}: {self.rating}'
+
+    def save(self, *args, **kwargs):
+        # The ratee's rating totals are adjusted by signals (ratings.py);
+        # keep that UPDATE in the same transaction as the row itself.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class Recommendation(models.Model):
+    """
+    Precomputed "people you may know" for one user, written nightly by
+    `manage.py compute_recommendations`. `entries` is a best-first list of
+    [user_id, score, shared_interests, mutual_friends].
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    entries = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f'Recommendations for user {self.user_id}'
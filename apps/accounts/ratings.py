@@ -0,0 +1,58 @@
+"""
+Keeps User.rating_sum / User.rating_count in step with UserRating rows.
+
+Single-row saves and deletes (forms, admin, cascades from a deleted user)
+are handled by the signal receivers in signals.py, which call
+adjust_rating_totals() inside the same transaction as the row change —
+UserRating.save() opens one, and Django's deletion collector already runs
+in one. Code that writes UserRatings with bulk_create() or
+queryset.update() must call adjust_rating_totals() itself, or run
+`manage.py rebuild_rating_totals` afterwards.
+"""
+
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+
+def adjust_rating_totals(deltas):
+    """
+    Apply {user_id: (sum_delta, count_delta)} to the ratees' totals with
+    one UPDATE per distinct delta pair. Totals are clamped at zero.
+    """
+    from apps.accounts.models import User
+
+    by_delta = {}
+    for user_id, delta in deltas.items():
+        if any(delta):
+            by_delta.setdefault(delta, []).append(user_id)
+    for (sum_delta, count_delta), user_ids in by_delta.items():
+        User.objects.filter(pk__in=user_ids).update(
+            rating_sum=Greatest(F('rating_sum') + sum_delta, Value(0)),
+            rating_count=Greatest(F('rating_count') + count_delta, Value(0)),
+        )
+
+
+def change_deltas(before, after):
+    """
+    Return the {user_id: (sum_delta, count_delta)} for a rating going from
+    `before` to `after`, each a (ratee_id, rating) pair or None.
+    """
+    deltas = {}
+    if before is not None:
+        ratee_id, rating = before
+        deltas[ratee_id] = (-rating, -1)
+    if after is not None:
+        ratee_id, rating = after
+        sum_delta, count_delta = deltas.get(ratee_id, (0, 0))
+        deltas[ratee_id] = (sum_delta + rating, count_delta + 1)
+    return deltas
+
+
+def with_average_rating(queryset):
+    """Annotate User rows with `avg_rating` (None when unrated) from the stored totals."""
+    from django.db.models import FloatField
+    from django.db.models.functions import Cast, NullIf
+
+    return queryset.annotate(
+        avg_rating=Cast('rating_sum', FloatField()) / NullIf('rating_count', 0),
+    )
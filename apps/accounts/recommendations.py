@@ -0,0 +1,177 @@
+"""
+Offline "people you may know" recommendations.
+
+`manage.py compute_recommendations` loads a SocialGraph snapshot — every
+user's city, the per-city interest MatchIndex, and the friendship
+adjacency — once, then scores users in chunks across a process pool.
+Workers are forked after the snapshot is built, so they share it
+copy-on-write and never touch the database; the parent writes each
+chunk's results to Recommendation as they come back.
+
+A candidate's score mixes the two signals:
+
+    WEIGHT_INTERESTS * shared interests / the user's interest count
+  + WEIGHT_MUTUAL    * min(mutual friends, MUTUAL_SATURATION) / MUTUAL_SATURATION
+
+Interest candidates come from the user's city (the top INTEREST_CANDIDATES
+by overlap); friends-of-friends can live anywhere. Existing friends are
+excluded here, and again at read time for friendships made since the run.
+"""
+
+import heapq
+import multiprocessing
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.utils import timezone
+
+from apps.accounts.match_index import MatchIndex
+
+TOP_N = 50
+INTEREST_CANDIDATES = 200
+WEIGHT_INTERESTS = 0.6
+WEIGHT_MUTUAL = 0.4
+MUTUAL_SATURATION = 5
+DEFAULT_CHUNK_SIZE = 1000
+
+# The snapshot forked workers read from (see compute_all()).
+_graph = None
+
+
+def friendship_fields():
+    """Return the Friendship model and its two user FK attnames, or (None, None)."""
+    try:
+        model = apps.get_model('social', 'Friendship')
+    except LookupError:
+        return None, None
+    user_model = get_user_model()
+    fields = [
+        f.attname for f in model._meta.concrete_fields
+        if f.is_relation and f.related_model is user_model
+    ]
+    return (model, fields[:2]) if len(fields) >= 2 else (None, None)
+
+
+class SocialGraph:
+    """In-memory snapshot of everything recommend() needs."""
+
+    def __init__(self, city_of, indexes, friends):
+        self.city_of = city_of    # {user_id: city_id}
+        self.indexes = indexes    # {city_id: MatchIndex}
+        self.friends = friends    # {user_id: set(user_id)}
+
+    @classmethod
+    def load(cls):
+        city_of = dict(get_user_model().objects.values_list('id', 'city_id').iterator(chunk_size=10_000))
+        indexes = {
+            city_id: MatchIndex.build('city', city_id)
+            for city_id in set(city_of.values()) if city_id is not None
+        }
+        friends = defaultdict(set)
+        model, fields = friendship_fields()
+        if model is not None:
+            for a, b in model.objects.values_list(*fields).iterator(chunk_size=10_000):
+                friends[a].add(b)
+                friends[b].add(a)
+        return cls(city_of, indexes, dict(friends))
+
+    def recommend(self, user_id, limit=TOP_N):
+        """Return up to `limit` best-first [user_id, score, shared, mutual] entries."""
+        friends = self.friends.get(user_id, set())
+
+        mutual = Counter()
+        for friend_id in friends:
+            for candidate_id in self.friends.get(friend_id, ()):
+                if candidate_id != user_id and candidate_id not in friends:
+                    mutual[candidate_id] += 1
+
+        shared = {}
+        index = self.indexes.get(self.city_of.get(user_id))
+        user_mask = index.members.get(user_id, 0) if index else 0
+        if user_mask:
+            ranked = (e for e in index.ranked(user_mask) if e[2] != user_id and e[2] not in friends)
+            for shared_count, _, candidate_id in islice(ranked, INTEREST_CANDIDATES):
+                shared[candidate_id] = shared_count
+            for candidate_id in mutual:
+                mask = index.members.get(candidate_id)
+                if mask and candidate_id not in shared:
+                    shared[candidate_id] = (mask & user_mask).bit_count()
+
+        interest_weight = WEIGHT_INTERESTS / max(user_mask.bit_count(), 1)
+        mutual_weight = WEIGHT_MUTUAL / MUTUAL_SATURATION
+        scored = []
+        for candidate_id in shared.keys() | mutual.keys():
+            shared_count, mutual_count = shared.get(candidate_id, 0), mutual.get(candidate_id, 0)
+            score = round(
+                interest_weight * shared_count + mutual_weight * min(mutual_count, MUTUAL_SATURATION), 6,
+            )
+            if score:
+                scored.append((-score, candidate_id, shared_count, mutual_count))
+        return [
+            [candidate_id, -neg_score, shared_count, mutual_count]
+            for neg_score, candidate_id, shared_count, mutual_count in heapq.nsmallest(limit, scored)
+        ]
+
+
+def _recommend_chunk(user_ids):
+    return [(user_id, _graph.recommend(user_id)) for user_id in user_ids]
+
+
+def compute_all(workers=None, chunk_size=DEFAULT_CHUNK_SIZE, log=None):
+    """Recompute and store recommendations for every user. Returns the number written."""
+    global _graph
+
+    started = timezone.now()
+    _graph = SocialGraph.load()
+    user_ids = sorted(_graph.city_of)
+    chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+
+    workers = workers or multiprocessing.cpu_count()
+    written = 0
+    try:
+        if workers > 1 and len(chunks) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Children must not inherit the parent's open database sockets.
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                for results in pool.map(_recommend_chunk, chunks):
+                    written += _store(results, started)
+                    if log:
+                        log(f"Stored recommendations for {written}/{len(user_ids)} users")
+        else:
+            for chunk in chunks:
+                written += _store(_recommend_chunk(chunk), started)
+                if log:
+                    log(f"Stored recommendations for {written}/{len(user_ids)} users")
+    finally:
+        _graph = None
+
+    from apps.accounts.models import Recommendation
+    # Anything not rewritten belongs to a user who has since been deleted
+    # or was created mid-run; the latter is recomputed next time.
+    Recommendation.objects.filter(computed_at__lt=started).delete()
+    return written
+
+
+def _store(results, computed_at):
+    from apps.accounts.models import Recommendation
+
+    Recommendation.objects.bulk_create(
+        [Recommendation(user_id=user_id, entries=entries, computed_at=computed_at) for user_id, entries in results],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['entries', 'computed_at'],
+    )
+    return len(results)
+
+
+def stored_recommendations(user_id):
+    """The user's precomputed entries, or None if the batch job hasn't covered them yet."""
+    from apps.accounts.models import Recommendation
+
+    return Recommendation.objects.filter(user_id=user_id).values_list('entries', flat=True).first()
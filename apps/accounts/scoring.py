@@ -0,0 +1,189 @@
+"""
+Composite match scoring for RecommendedMatchingStrategy.
+
+A candidate's score is a weighted sum of four signals, each in [0, 1]:
+
+    interests   shared interests / the user's own interest count
+    proximity   1 in the same neighborhood, PROXIMITY_SAME_CITY otherwise
+                (neighborhoods carry no coordinates, so that is as fine
+                as distance gets)
+    rating      Bayesian-smoothed average from User.rating_sum/rating_count
+    recency     halves every RECENCY_HALF_LIFE_DAYS since the last login
+
+Scores are computed in one pass over a city's candidate pool: interest
+masks come straight from the city's MatchIndex, and the other features
+come from a per-city FeaturePool (one tuple per user). Like MatchIndex,
+pools live in worker memory: a user change drops that one row in place
+(forget_user(), from signals.py) instead of round-tripping the whole
+city through the cache, and other workers rebuild theirs every POOL_TTL
+seconds. The scoring loop is plain Python over those tuples.
+Each user's top TOP_K results are cached until their interests or
+location change (evict(), called from signals.py) or SCORES_TIMEOUT
+passes, which also bounds how stale other users' ratings can get.
+"""
+
+import threading
+import time
+from bisect import bisect_right
+
+from django.core.cache import cache
+
+from apps.accounts.match_index import MatchIndex
+from apps.core import metrics
+
+WEIGHTS = {
+    'interests': 0.5,
+    'proximity': 0.2,
+    'rating': 0.2,
+    'recency': 0.1,
+}
+PROXIMITY_SAME_CITY = 0.3
+RATING_PRIOR_MEAN = 3.0
+RATING_PRIOR_WEIGHT = 5
+RECENCY_HALF_LIFE_DAYS = 14
+
+TOP_K = 500
+# Bounds how stale another worker's user changes can look here.
+POOL_TTL = 5 * 60  # seconds
+SCORES_TIMEOUT = 10 * 60  # seconds
+
+
+def _scores_key(user_id):
+    return f'match_scores:{user_id}'
+
+
+_lock = threading.Lock()
+_pools = {}  # {city_id: (FeaturePool, built_at)}
+
+
+class FeaturePool:
+    """Non-interest features for the users of one city, one tuple per user."""
+
+    def __init__(self, city_id, features=None):
+        self.city_id = city_id
+        # {user_id: (username, neighborhood_id, rating, last_active_timestamp)},
+        # or None for an id with no User row (deleted since the index was built).
+        self.features = features or {}
+
+    @classmethod
+    def load(cls, city_id, user_ids):
+        """Return this worker's pool for the city, fetching features for any of `user_ids` it lacks."""
+        entry = _pools.get(city_id)
+        fresh = entry is not None and time.monotonic() - entry[1] < POOL_TTL
+        metrics.record_cache(hit=fresh)
+        if fresh:
+            pool = entry[0]
+        else:
+            pool = cls(city_id)
+            with _lock:
+                _pools[city_id] = (pool, time.monotonic())
+        missing = [user_id for user_id in user_ids if user_id not in pool.features]
+        if missing:
+            pool.fetch(missing)
+        return pool
+
+    def fetch(self, user_ids):
+        from apps.accounts.models import User
+
+        rows = User.objects.filter(pk__in=user_ids).values_list(
+            'id', 'username', 'neighborhood_id', 'rating_sum', 'rating_count',
+            'last_login', 'date_joined',
+        )
+        features = dict.fromkeys(user_ids)
+        for user_id, username, neighborhood_id, rating_sum, rating_count, last_login, joined in rows:
+            active = last_login or joined
+            features[user_id] = (
+                username,
+                neighborhood_id,
+                smoothed_rating(rating_sum, rating_count),
+                active.timestamp() if active else 0.0,
+            )
+        with _lock:
+            self.features.update(features)
+
+
+def smoothed_rating(rating_sum, rating_count) -> float:
+    """Bayesian average rating scaled to [0, 1]; unrated users sit at the prior."""
+    average = (rating_sum + RATING_PRIOR_MEAN * RATING_PRIOR_WEIGHT) / (rating_count + RATING_PRIOR_WEIGHT)
+    return (average - 1) / 4
+
+
+def score_candidates(user, user_mask, members, pool, now=None):
+    """
+    Score every candidate in `members` ({user_id: mask}) that shares at
+    least one interest with `user_mask`. Returns
+    [(score, username, user_id, shared_count)] sorted best-first, ties
+    broken by username. Candidates without features in `pool` (deleted
+    users the index still lists) are skipped.
+    """
+    now = now or time.time()
+    w_interest = WEIGHTS['interests'] / max(user_mask.bit_count(), 1)
+    w_near, w_far = WEIGHTS['proximity'], WEIGHTS['proximity'] * PROXIMITY_SAME_CITY
+    w_rating = WEIGHTS['rating']
+    w_recency = WEIGHTS['recency']
+    decay = 0.5 ** (1 / (RECENCY_HALF_LIFE_DAYS * 86400))
+    features = pool.features
+
+    scored = []
+    for candidate_id, mask in members.items():
+        shared = (mask & user_mask).bit_count()
+        if not shared or candidate_id == user.id:
+            continue
+        row = features.get(candidate_id)
+        if row is None:
+            continue
+        username, neighborhood_id, rating, active = row
+        score = (
+            w_interest * shared
+            + (w_near if neighborhood_id == user.neighborhood_id and neighborhood_id is not None else w_far)
+            + w_rating * rating
+            + w_recency * decay ** max(now - active, 0)
+        )
+        scored.append((round(score, 6), username, candidate_id, shared))
+    scored.sort(key=lambda entry: (-entry[0], entry[1]))
+    return scored
+
+
+def top_matches(user):
+    """
+    Return (entries, total) for `user`'s city: the best TOP_K
+    (score, username, user_id, shared_count) entries and how many
+    candidates were scored in all.
+    """
+    data = cache.get(_scores_key(user.id))
+    metrics.record_cache(hit=data is not None)
+    if data is not None and data['city_id'] == user.city_id:
+        return data['entries'], data['total']
+
+    index = MatchIndex.load('city', user.city_id)
+    user_mask = index.members.get(user.id, 0)
+    entries, total = [], 0
+    if user_mask:
+        pool = FeaturePool.load(user.city_id, index.members)
+        scored = score_candidates(user, user_mask, index.members, pool)
+        entries, total = scored[:TOP_K], len(scored)
+
+    cache.set(
+        _scores_key(user.id),
+        {'city_id': user.city_id, 'entries': entries, 'total': total},
+        SCORES_TIMEOUT,
+    )
+    return entries, total
+
+
+def seek(entries, key):
+    """Position just after the (score, username) `key` in best-first `entries`."""
+    return bisect_right(entries, (-key[0], key[1]), key=lambda entry: (-entry[0], entry[1]))
+
+
+def evict(user_id):
+    """Drop a user's cached top-K after their interests or location change."""
+    cache.delete(_scores_key(user_id))
+
+
+def forget_user(user_id, city_id):
+    """Drop a user's row from this worker's pool for their city so it is refetched."""
+    entry = _pools.get(city_id)
+    if entry is not None:
+        with _lock:
+            entry[0].features.pop(user_id, None)
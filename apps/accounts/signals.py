@@ -0,0 +1,168 @@
+"""
+Signal receivers that keep User.interest_mask and the cached match index
+(match_index.py) in step with UserInterest rows and each user's city/neighborhood (evicting
+the composite top-K scores in scoring.py alongside), and the
+denormalized rating totals on User (ratings.py) in step with UserRating.
+Users' SearchDocuments (apps/core/search.py) are rewritten here too, and
+their identity snapshots (identity.py) forgotten. New avatar uploads are
+queued for thumbnail rendering (avatars.py).
+"""
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.accounts import avatars, identity, match_index, scoring
+from apps.accounts.ratings import adjust_rating_totals, change_deltas
+from apps.core import search
+
+from .models import User, UserInterest, UserRating
+
+
+MATCH_SCOPE_FIELDS = {'username', 'city', 'neighborhood'}
+
+
+@receiver(pre_save, sender=User)
+def remember_match_scope(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (update_fields is not None and not MATCH_SCOPE_FIELDS.intersection(update_fields)):
+        instance._match_scope_before = None
+        return
+    # Instances loaded from the database (User.from_db) already know their
+    # scope; only hand-built ones with a pk need the extra SELECT.
+    before = getattr(instance, '_loaded_match_scope', None)
+    if before is None:
+        before = (
+            User.objects.filter(pk=instance.pk)
+            .values_list('username', 'city_id', 'neighborhood_id')
+            .first()
+        )
+    instance._match_scope_before = before
+
+
+@receiver(post_save, sender=User)
+def reindex_user_scope(sender, instance, created, **kwargs):
+    before = getattr(instance, '_match_scope_before', None)
+    if not created and before is None:
+        return
+    after = (instance.username, instance.city_id, instance.neighborhood_id)
+    instance._loaded_match_scope = after
+    if created or before == after:
+        return
+    username, city_id, neighborhood_id = before
+
+    match_index.remove_user(instance.pk, 'city', city_id)
+    match_index.remove_user(instance.pk, 'neighborhood', neighborhood_id)
+    match_index.update_user(instance, instance.interest_mask)
+    scoring.evict(instance.pk)
+    scoring.forget_user(instance.pk, city_id)
+
+
+# Saves limited to other fields (e.g. last_login on every login) skip reindexing.
+SEARCH_FIELDS = {'username', 'bio', 'city', 'neighborhood', 'interest_mask'}
+
+
+@receiver(post_save, sender=User)
+def update_search_document(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is None or SEARCH_FIELDS.intersection(update_fields):
+        search.index_user(instance, created=created)
+
+
+@receiver(pre_save, sender=User)
+def note_avatar_upload(sender, instance, **kwargs):
+    # The FieldFile commits the upload during save(), after pre_save. A
+    # deferred avatar (identity snapshots) can't have changed.
+    if 'avatar' not in instance.__dict__:
+        instance._avatar_uploaded = False
+        return
+    instance._avatar_uploaded = bool(instance.avatar) and not instance.avatar._committed
+
+
+@receiver(post_save, sender=User)
+def queue_avatar_thumbnails(sender, instance, **kwargs):
+    if instance.__dict__.pop('_avatar_uploaded', False):
+        avatars.schedule(instance.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_identity(sender, instance, update_fields=None, **kwargs):
+    # The snapshot's session auth hash is derived from the password.
+    if update_fields is None or {*identity.SNAPSHOT_FIELDS, 'password'}.intersection(update_fields):
+        identity.forget(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def unindex_user(sender, instance, **kwargs):
+    match_index.remove_user(instance.pk, 'city', instance.city_id)
+    match_index.remove_user(instance.pk, 'neighborhood', instance.neighborhood_id)
+    scoring.evict(instance.pk)
+    search.invalidate()  # the SearchDocument row goes with the user
+
+
+@receiver(post_save, sender=UserInterest)
+@receiver(post_delete, sender=UserInterest)
+def reindex_user_interests(sender, instance, **kwargs):
+    try:
+        user = User.objects.get(pk=instance.user_id)
+    except User.DoesNotExist:
+        return  # cascade delete of the user — unindex_user handles it
+    sync_interest_mask(user)
+
+
+@receiver(m2m_changed, sender=User.interests.through)
+def reindex_user_interests_m2m(sender, instance, action, reverse, pk_set, **kwargs):
+    # user.interests.add()/remove()/set()/clear() bypass UserInterest.save().
+    if reverse and action == 'pre_clear':
+        # interest.user_set.clear() reports no pk_set afterwards, so note
+        # who held the interest before the rows disappear.
+        instance._match_cleared_user_ids = set(
+            UserInterest.objects.filter(interest=instance).values_list('user_id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        if action == 'post_clear':
+            pk_set = instance.__dict__.pop('_match_cleared_user_ids', set())
+        users = User.objects.filter(pk__in=pk_set)
+    else:
+        users = [instance]
+    for user in users:
+        sync_interest_mask(user)
+
+
+def sync_interest_mask(user):
+    """Recompute User.interest_mask from UserInterest and push it to every cache."""
+    mask = match_index.user_mask_from_db(user.pk)
+    User.objects.filter(pk=user.pk).update(interest_mask=mask)
+    user.interest_mask = mask
+    identity.forget(user.pk)
+    match_index.update_user(user, mask)
+    scoring.evict(user.pk)
+    search.index_user(user)
+
+
+@receiver(pre_save, sender=UserRating)
+def remember_rating(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._rating_before = None
+        return
+    # UserRating.save() runs in a transaction, so the row stays locked
+    # until the totals have been adjusted.
+    instance._rating_before = (
+        UserRating.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('ratee_id', 'rating')
+        .first()
+    )
+
+
+@receiver(post_save, sender=UserRating)
+def count_saved_rating(sender, instance, **kwargs):
+    before = instance.__dict__.pop('_rating_before', None)
+    adjust_rating_totals(change_deltas(before, (instance.ratee_id, instance.rating)))
+
+
+@receiver(post_delete, sender=UserRating)
+def uncount_deleted_rating(sender, instance, **kwargs):
+    adjust_rating_totals(change_deltas((instance.ratee_id, instance.rating), None))
@@ -0,0 +1,54 @@
+"""
+{% avatar user 48 %} renders a user's precomputed thumbnails (avatars.py)
+as a <picture> with WebP and JPEG srcsets, so the browser downloads the
+smallest variant that fills `size` CSS pixels at its pixel density.
+Until the thumbnails exist it renders an initial-letter placeholder,
+never the original upload.
+
+{% avatar_srcset user 'jpg' %} returns just the srcset string for custom
+markup. Querysets feeding either tag should load avatars.AVATAR_FIELDS.
+"""
+
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+from apps.accounts.avatars import FORMATS, SIZES, thumbnail_name
+
+register = template.Library()
+
+
+def _ready(user):
+    return bool(user.avatar_thumbnails) and user.avatar_thumbnails == user.avatar.name
+
+
+def _srcset(avatar_name, ext):
+    return ', '.join(
+        f'{default_storage.url(thumbnail_name(avatar_name, size, ext))} {size}w' for size in SIZES
+    )
+
+
+@register.simple_tag
+def avatar_srcset(user, ext=FORMATS[0][0]):
+    return _srcset(user.avatar.name, ext) if _ready(user) else ''
+
+
+@register.simple_tag
+def avatar(user, size=48):
+    size = int(size)
+    if not _ready(user):
+        return format_html(
+            '<span class="avatar avatar-placeholder" style="width:{}px;height:{}px" aria-hidden="true">{}</span>',
+            size, size, user.username[:1].upper(),
+        )
+    name = user.avatar.name
+    webp, jpg = (ext for ext, _, _ in FORMATS)
+    fallback = min((s for s in SIZES if s >= size), default=max(SIZES))
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}px">'
+        '<img class="avatar" src="{}" srcset="{}" sizes="{}px" width="{}" height="{}" alt="{}" '
+        'loading="lazy" decoding="async"></picture>',
+        _srcset(name, webp), size,
+        default_storage.url(thumbnail_name(name, fallback, jpg)), _srcset(name, jpg), size,
+        size, size, user.username,
+    )
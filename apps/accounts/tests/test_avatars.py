@@ -0,0 +1,101 @@
+import struct
+import tempfile
+import zlib
+from io import BytesIO
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+from PIL import Image
+
+from apps.accounts import avatars
+from apps.accounts.avatars import render_thumbnails, thumbnail_name, validate_avatar
+
+
+def _image(color, image_format):
+    buffer = BytesIO()
+    Image.new('RGB', (300, 300), color).save(buffer, image_format)
+    return ContentFile(buffer.getvalue())
+
+
+def _upload(content):
+    """An uncommitted file, as validate_avatar sees a new upload."""
+    upload = ContentFile(content, name='avatar')
+    upload._committed = False
+    return upload
+
+
+def _png_header(width, height):
+    """A PNG that declares `width` x `height` but holds no pixel data."""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        + chunk(b'IDAT', b'')
+        + chunk(b'IEND', b'')
+    )
+
+
+class ThumbnailNameTests(SimpleTestCase):
+    def test_same_stem_different_extension(self):
+        self.assertNotEqual(
+            thumbnail_name('avatars/photo.png', 48, 'webp'),
+            thumbnail_name('avatars/photo.jpg', 48, 'webp'),
+        )
+
+    def test_uploads_sharing_a_stem_keep_their_own_thumbnails(self):
+        with tempfile.TemporaryDirectory() as root:
+            storage = FileSystemStorage(location=root)
+            red = storage.save('avatars/photo.png', _image('red', 'PNG'))
+            blue = storage.save('avatars/photo.jpg', _image('blue', 'JPEG'))
+            render_thumbnails(red, storage)
+            render_thumbnails(blue, storage)
+
+            with storage.open(thumbnail_name(red, 48, 'jpg')) as f, Image.open(f) as thumb:
+                r, g, b = thumb.convert('RGB').getpixel((24, 24))
+            self.assertGreater(r, 200)
+            self.assertLess(b, 60)
+
+
+class ValidateAvatarTests(SimpleTestCase):
+    def assertRejected(self, upload, message):
+        with self.assertRaisesMessage(ValidationError, message):
+            validate_avatar(upload)
+        self.assertEqual(upload.tell(), 0)
+
+    def test_accepts_allowed_formats(self):
+        for image_format in ('JPEG', 'PNG', 'WEBP', 'GIF'):
+            with self.subTest(image_format):
+                upload = _upload(_image('red', image_format).read())
+                validate_avatar(upload)
+                self.assertEqual(upload.tell(), 0)
+
+    def test_skips_stored_files(self):
+        validate_avatar(ContentFile(b'not an image'))
+
+    def test_rejects_oversized_upload(self):
+        upload = _upload(_image('red', 'PNG').read())
+        with mock.patch.object(avatars, 'MAX_UPLOAD_BYTES', upload.size - 1):
+            with self.assertRaisesMessage(ValidationError, 'at most'):
+                validate_avatar(upload)
+
+    def test_rejects_non_image(self):
+        self.assertRejected(_upload(b'not an image'), 'Upload a valid')
+
+    def test_rejects_disallowed_format(self):
+        buffer = BytesIO()
+        Image.new('RGB', (10, 10)).save(buffer, 'BMP')
+        self.assertRejected(_upload(buffer.getvalue()), 'Upload a valid')
+
+    def test_rejects_too_many_pixels(self):
+        upload = _upload(_image('red', 'PNG').read())
+        with mock.patch.object(avatars, 'MAX_PIXELS', 300 * 300 - 1):
+            self.assertRejected(upload, 'too large')
+
+    def test_rejects_decompression_bomb(self):
+        # Over twice Image.MAX_IMAGE_PIXELS, so Image.open() itself refuses it.
+        self.assertRejected(_upload(_png_header(20000, 20000)), 'too large')
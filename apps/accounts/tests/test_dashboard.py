@@ -0,0 +1,28 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.core.models import City
+from apps.core.testing import QueryBudgetMixin
+
+
+class DashboardShellTests(QueryBudgetMixin, TestCase):
+    fixtures = ['initial_data']
+
+    def setUp(self):
+        cache.clear()
+        self.city_a, self.city_b = City.objects.order_by('pk')[:2]
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw-123456xx', city=self.city_a)
+        self.client.force_login(self.user)
+
+    def test_dashboard_shell_cached(self):
+        self.assertServedFromCache(reverse('accounts:dashboard'))
+
+    def test_profile_change_made_elsewhere_renders_new_shell(self):
+        url = reverse('accounts:dashboard')
+        self.assertContains(self.client.get(url), self.city_a.city_name)
+        # An UPDATE that no signal sees, as from another worker process.
+        User.objects.filter(pk=self.user.pk).update(city=self.city_b)
+        cache.delete(f'identity:{self.user.pk}')
+        self.assertContains(self.client.get(url), self.city_b.city_name)
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.accounts.backends import CachedUserBackend
+from apps.accounts.checks import check_shared_cache
+from apps.accounts.models import User
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+SHARED = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379'}}
+
+
+class CachedUserBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw-123456xx')
+
+    def test_queries_the_user_by_default(self):
+        CachedUserBackend().get_user(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertNumQueries(1):
+            self.assertIsNone(CachedUserBackend().get_user(self.user.pk))
+
+    @override_settings(IDENTITY_CACHE=True)
+    def test_answers_from_snapshot_when_enabled(self):
+        CachedUserBackend().get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedUserBackend().get_user(self.user.pk).username, 'alice')
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def error_ids(self):
+        return [error.id for error in check_shared_cache(None)]
+
+    @override_settings(CACHES=LOCMEM, SESSION_ENGINE='django.contrib.sessions.backends.db', IDENTITY_CACHE=False)
+    def test_defaults_pass_on_locmem(self):
+        self.assertEqual(self.error_ids(), [])
+
+    @override_settings(CACHES=LOCMEM, SESSION_ENGINE='django.contrib.sessions.backends.cached_db', IDENTITY_CACHE=True)
+    def test_cache_backed_features_fail_on_locmem(self):
+        self.assertEqual(self.error_ids(), ['accounts.E001', 'accounts.E002'])
+
+    @override_settings(CACHES=SHARED, SESSION_ENGINE='django.contrib.sessions.backends.cached_db', IDENTITY_CACHE=True)
+    def test_cache_backed_features_pass_on_shared_cache(self):
+        self.assertEqual(self.error_ids(), [])
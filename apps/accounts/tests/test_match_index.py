@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.db import connection
+from django.forms import modelform_factory
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts import match_index
+from apps.accounts.match_index import MatchIndex
+from apps.accounts.models import User, UserInterest
+from apps.core.models import City, Interest
+
+
+class MatchIndexTests(TestCase):
+    fixtures = ['initial_data']
+
+    def setUp(self):
+        match_index._indexes.clear()
+        self.city_a, self.city_b = City.objects.order_by('pk')[:2]
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw-123456xx', city=self.city_a)
+        UserInterest.objects.create(user=self.user, interest_id=1)
+
+    def test_interest_change_patches_warm_index(self):
+        index = MatchIndex.load('city', self.city_a.pk)
+        self.assertEqual(index.members[self.user.pk], 1 << 1)
+
+        UserInterest.objects.create(user=self.user, interest_id=3)
+
+        self.assertIs(MatchIndex.load('city', self.city_a.pk), index)
+        self.assertEqual(index.members[self.user.pk], (1 << 1) | (1 << 3))
+
+    def test_moving_city_updates_both_indexes(self):
+        MatchIndex.load('city', self.city_a.pk)
+        MatchIndex.load('city', self.city_b.pk)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.city = self.city_b
+        user.save()
+
+        self.assertNotIn(user.pk, MatchIndex.load('city', self.city_a.pk).members)
+        self.assertIn(user.pk, MatchIndex.load('city', self.city_b.pk).members)
+
+    def test_index_expires_after_ttl(self):
+        index = MatchIndex.load('city', self.city_a.pk)
+        later = match_index.time.monotonic() + match_index.MATCH_INDEX_TTL + 1
+        with mock.patch.object(match_index.time, 'monotonic', return_value=later):
+            self.assertIsNot(MatchIndex.load('city', self.city_a.pk), index)
+
+    def test_saving_loaded_user_does_not_reselect_scope(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.bio = 'hello'
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        scope_selects = [
+            q['sql'] for q in queries.captured_queries
+            if q['sql'].startswith('SELECT "accounts_user"."username", "accounts_user"."city_id"')
+        ]
+        self.assertEqual(scope_selects, [])
+
+
+class InterestLimitTests(TestCase):
+    fixtures = ['initial_data']
+
+    def test_interest_past_mask_width_is_rejected_by_forms(self):
+        user = User.objects.create_user('alice', 'alice@example.com', 'pw-123456xx')
+        interest = Interest.objects.create(pk=match_index.MAX_INTEREST_ID + 8, interest_name='Late', category='x')
+        form = modelform_factory(UserInterest, fields=['user', 'interest'])(
+            data={'user': user.pk, 'interest': interest.pk},
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn('interest', form.errors)
+        self.assertNotIn(interest, form.fields['interest'].queryset)
+
+
+class InterestMaskTests(SimpleTestCase):
+    def test_highest_id_fits(self):
+        self.assertEqual(match_index.interest_mask([match_index.MAX_INTEREST_ID]), 1 << 62)
+
+    def test_id_past_mask_width_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            match_index.interest_mask([match_index.MAX_INTEREST_ID + 1])
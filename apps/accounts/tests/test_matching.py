@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from apps.accounts import match_index
+from apps.accounts.matching import MatchingContext
+from apps.accounts.models import User, UserInterest
+from apps.core.models import City
+
+
+class MatchingWithoutFriendshipsTests(TestCase):
+    """The social app's Friendship model is optional; matching must not need it."""
+
+    fixtures = ['initial_data']
+
+    def setUp(self):
+        match_index._indexes.clear()
+        city = City.objects.order_by('pk').first()
+        self.alice, self.bob, self.carol = (
+            User.objects.create_user(name, f'{name}@example.com', 'pw-123456xx', city=city)
+            for name in ('alice', 'bob', 'carol')
+        )
+        for user, interests in ((self.alice, [1, 2]), (self.bob, [1, 2]), (self.carol, [2])):
+            for interest_id in interests:
+                UserInterest.objects.create(user=user, interest_id=interest_id)
+        self.alice.refresh_from_db()
+
+    def test_get_matches(self):
+        for scope in ('city', 'recommended'):
+            matches, total = MatchingContext(scope).get_matches(self.alice)
+            self.assertEqual([u.username for u in matches], ['bob', 'carol'], scope)
+            self.assertEqual(total, 2)
+
+    def test_get_matches_page(self):
+        page = MatchingContext('city').get_matches_page(self.alice, per_page=1)
+        self.assertEqual([u.username for u in page.object_list], ['bob'])
+        page = MatchingContext('city').get_matches_page(self.alice, cursor=page.next_cursor, per_page=1)
+        self.assertEqual([u.username for u in page.object_list], ['carol'])
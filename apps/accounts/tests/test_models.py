@@ -0,0 +1,35 @@
+from django.test import TestCase
+
+from apps.accounts.models import User, UserInterest, UserRating
+from apps.core.notifications import adjust_unread_counts
+
+
+class DenormalizedFieldsSurviveStaleSaveTests(TestCase):
+    fixtures = ['initial_data']
+
+    def setUp(self):
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pw-123456xx')
+        self.rater = User.objects.create_user('bob', 'bob@example.com', 'pw-123456xx')
+        # Loaded before any of the counters move, then saved afterwards.
+        self.stale = User.objects.get(pk=self.user.pk)
+        self.stale.bio = 'hello'
+
+    def test_unread_notification_count(self):
+        adjust_unread_counts({self.user.pk: 3})
+        self.stale.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).unread_notification_count, 3)
+
+    def test_rating_totals(self):
+        UserRating.objects.create(rater=self.rater, ratee=self.user, rating=4)
+        self.stale.save()
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual((user.rating_sum, user.rating_count), (4, 1))
+
+    def test_interest_mask(self):
+        UserInterest.objects.create(user=self.user, interest_id=2)
+        self.stale.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).interest_mask, 1 << 2)
+
+    def test_other_fields_still_saved(self):
+        self.stale.save()
+        self.assertEqual(User.objects.get(pk=self.user.pk).bio, 'hello')
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.accounts import scoring
+from apps.accounts.scoring import FeaturePool, score_candidates
+
+
+class ScoreCandidatesTests(SimpleTestCase):
+    def test_candidate_without_features_is_skipped(self):
+        user = SimpleNamespace(id=1, neighborhood_id=10)
+        members = {1: 0b110, 2: 0b010, 3: 0b100}
+        # User 3 was deleted after the index was built.
+        pool = FeaturePool(5, {2: ('bob', 10, 0.5, 0.0), 3: None})
+
+        scored = score_candidates(user, 0b110, members, pool, now=0.0)
+
+        self.assertEqual([(username, user_id, shared) for _, username, user_id, shared in scored], [('bob', 2, 1)])
+
+    def test_candidate_missing_from_pool_is_skipped(self):
+        user = SimpleNamespace(id=1, neighborhood_id=None)
+        pool = FeaturePool(5, {})
+        self.assertEqual(score_candidates(user, 0b10, {1: 0b10, 2: 0b10}, pool, now=0.0), [])
+
+
+class FeaturePoolCacheTests(SimpleTestCase):
+    def setUp(self):
+        scoring._pools.clear()
+        self.addCleanup(scoring._pools.clear)
+
+    def load(self, user_ids, now):
+        self.fetched = []
+
+        def fetch(pool, ids):
+            pool.features.update(dict.fromkeys(ids, ('u', None, 0.5, 0.0)))
+            self.fetched.append(sorted(ids))
+
+        with mock.patch.object(scoring.time, 'monotonic', return_value=now), \
+                mock.patch.object(FeaturePool, 'fetch', fetch):
+            return FeaturePool.load(5, user_ids)
+
+    def test_pool_is_reused_within_ttl(self):
+        first = self.load([1, 2], now=100.0)
+        second = self.load([1, 2], now=100.0 + scoring.POOL_TTL - 1)
+        self.assertIs(first, second)
+        self.assertEqual(self.fetched, [])
+
+    def test_pool_is_rebuilt_after_ttl(self):
+        first = self.load([1, 2], now=100.0)
+        second = self.load([1, 2], now=100.0 + scoring.POOL_TTL)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.fetched, [[1, 2]])
+
+    def test_forget_user_refetches_only_that_user(self):
+        self.load([1, 2], now=100.0)
+        scoring.forget_user(2, 5)
+        pool = self.load([1, 2], now=101.0)
+        self.assertEqual(self.fetched, [[2]])
+        self.assertEqual(set(pool.features), {1, 2})
+
+    def test_forget_user_without_pool_is_noop(self):
+        scoring.forget_user(2, 5)
+        scoring.forget_user(2, None)
+        self.assertEqual(scoring._pools, {})
@@ -1,8 +1,8 @@
 from django.contrib import messages
 from django.contrib.auth import login, logout
-from django.core.cache import cache
 from django.shortcuts import redirect, render
 
+from apps.core import reference
 from apps.core.decorators import login_required_custom, rate_limited
 from apps.core.services import services
 
@@ -42,7 +42,6 @@ def login_view(request):
 
     if request.method == 'POST':
         form = LoginForm(request, data=request.POST)
-        attempts_key = f"login_attempts:{request.POST.get('username', '')}"
 
         if form.is_valid():
             user = form.get_user()
@@ -51,12 +50,12 @@ def login_view(request):
                 messages.error(request, 'Your account has been restricted. Please contact support.')
                 return render(request, 'accounts/login.html', {'form': form})
 
-            cache.delete(attempts_key)
+            request.rate_limit.reset(['username'])
             login(request, user)
             messages.success(request, f'Welcome back, {user.username}!')
             return redirect('accounts:dashboard')
         else:
-            cache.set(attempts_key, cache.get(attempts_key, 0) + 1, LOGIN_ATTEMPT_WINDOW_SECONDS)
+            request.rate_limit.hit()
     else:
         form = LoginForm()
 
@@ -71,4 +70,7 @@ def logout_view(request):
 
 @login_required_custom
 def dashboard_view(request):
+    # The city name comes from the reference snapshot, so even a
+    # {% shellcache %} miss renders without a City query.
+    reference.attach([request.user])
     return render(request, 'accounts/dashboard.html', {'user': request.user})
\ No newline at end of file
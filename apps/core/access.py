@@ -0,0 +1,120 @@
+"""
+Memoized membership and friendship lookups for the access-control
+decorators in decorators.py.
+
+Results are kept on the request, so stacked decorators and the view itself
+share one query per (group, user) or (user, user) pair. Views can reuse the
+resolved object directly:
+
+    @group_member_required
+    def group_detail_view(request, group_id):
+        membership = request.group_membership   # no second query
+
+When settings.ACCESS_CACHE_TTL is set (seconds), results are also cached
+across requests; signals connected in CoreConfig.ready() drop the cached
+entry whenever a GroupMembership or Friendship row is saved or deleted.
+That only reaches other workers through a shared cache, so checks.py
+fails `manage.py check` for a nonzero TTL on LocMemCache.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core import metrics
+
+_MISSING = object()
+
+
+def _ttl():
+    return getattr(settings, 'ACCESS_CACHE_TTL', 0)
+
+
+def _request_cache(request) -> dict:
+    memo = getattr(request, '_access_cache', None)
+    if memo is None:
+        memo = request._access_cache = {}
+    return memo
+
+
+def _membership_key(user_id, group_id):
+    return f'access:member:{user_id}:{group_id}'
+
+
+def _friendship_key(user_a_id, user_b_id):
+    low, high = sorted((int(user_a_id), int(user_b_id)))
+    return f'access:friends:{low}:{high}'
+
+
+def _memoized(request, key, load):
+    memo = _request_cache(request)
+    value = memo.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    ttl = _ttl()
+    if ttl:
+        value = cache.get(key, _MISSING)
+        metrics.record_cache(hit=value is not _MISSING)
+    if value is _MISSING:
+        value = load()
+        if ttl:
+            cache.set(key, value, ttl)
+    memo[key] = value
+    return value
+
+
+def get_membership(request, group_id):
+    """Return request.user's GroupMembership for `group_id`, or None."""
+    from apps.groups.models import GroupMembership
+
+    if group_id is None:
+        return None
+    return _memoized(
+        request,
+        _membership_key(request.user.id, group_id),
+        lambda: GroupMembership.objects.filter(user=request.user, group_id=group_id).first(),
+    )
+
+
+def are_friends(request, other_user_id) -> bool:
+    from apps.social.models import Friendship
+
+    if other_user_id is None:
+        return False
+    return _memoized(
+        request,
+        _friendship_key(request.user.id, other_user_id),
+        lambda: Friendship.objects.are_friends(request.user.id, other_user_id),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Invalidation hooks
+# ---------------------------------------------------------------------------
+
+def invalidate_membership(user_id, group_id):
+    cache.delete(_membership_key(user_id, group_id))
+
+
+def invalidate_friendship(user_a_id, user_b_id):
+    cache.delete(_friendship_key(user_a_id, user_b_id))
+
+
+def membership_changed(sender, instance, **kwargs):
+    invalidate_membership(instance.user_id, instance.group_id)
+
+
+def friendship_changed(sender, instance, **kwargs):
+    from django.contrib.auth import get_user_model
+
+    # Whatever the Friendship columns are called, the pair is the user FKs.
+    user_model = get_user_model()
+    user_ids = [
+        getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.is_relation and field.related_model is user_model
+    ]
+    for i, user_a_id in enumerate(user_ids):
+        for user_b_id in user_ids[i + 1:]:
+            if user_a_id is not None and user_b_id is not None:
+                invalidate_friendship(user_a_id, user_b_id)
@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from .models import City, Neighborhood, Interest, NotificationRecord
+from .models import (
+    City, Neighborhood, Interest, NotificationArchive, NotificationRecord, OutboxMessage, RateLimitCounter,
+    SearchDocument,
+)
 
 
 @admin.register(City)
@@ -13,6 +16,7 @@ class CityAdmin(admin.ModelAdmin):
 class NeighborhoodAdmin(admin.ModelAdmin):
     list_display = ('postal_code', 'area_name', 'city')
     list_filter = ('city',)
+    list_select_related = ('city',)
     search_fields = ('area_name',)
 
 
@@ -28,4 +32,32 @@ class NotificationRecordAdmin(admin.ModelAdmin):
     list_display = ('recipient', 'notif_type', 'is_read', 'created_at')
     list_filter = ('notif_type', 'is_read')
     search_fields = ('recipient__username', 'message')
-    readonly_fields = ('created_at',)
\ No newline at end of file
+    readonly_fields = ('created_at',)
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'notif_type', 'created_at', 'archived_at')
+    list_filter = ('notif_type',)
+    readonly_fields = ('archived_at',)
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'status', 'attempts', 'available_at', 'created_at')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('created_at',)
+
+
+@admin.register(RateLimitCounter)
+class RateLimitCounterAdmin(admin.ModelAdmin):
+    list_display = ('key', 'count', 'expires_at')
+    search_fields = ('key',)
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ('name', 'city', 'updated_at')
+    list_filter = ('city',)
+    readonly_fields = ('user', 'city', 'name', 'document', 'updated_at')
+    search_fields = ('^name',)
@@ -1,6 +1,23 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.core'
\ No newline at end of file
+    name = 'apps.core'
+
+    def ready(self):
+        from . import access, checks, signals  # noqa: F401
+
+        # groups/social models may not exist yet — only hook up the access
+        # cache invalidation for the ones that do.
+        for label, receiver in (
+            ('groups.GroupMembership', access.membership_changed),
+            ('social.Friendship', access.friendship_changed),
+        ):
+            try:
+                model = apps.get_model(label)
+            except LookupError:
+                continue
+            post_save.connect(receiver, sender=model, dispatch_uid=f'access:{label}:save')
+            post_delete.connect(receiver, sender=model, dispatch_uid=f'access:{label}:delete')
@@ -0,0 +1,206 @@
+"""
+Static build stage for `manage.py build_assets`.
+
+    static/css/*.css ──► static/build/app.min.css       every page's CSS, minified
+                     └─► static/build/critical.min.css  first-paint rules from base.css
+    Google Fonts     ──► static/fonts/*.woff2           Space Grotesk, latin subset only
+                         static/build/assets.json        what the {% asset_head %} tag reads
+
+The font is vendored once (downloaded only when static/fonts/ doesn't
+have it yet) so pages never wait on fonts.googleapis.com. Google already
+splits the family by unicode-range, so keeping the latin block is the
+subset; the variable font covers every weight in one file.
+
+Critical CSS is base.css — the shell every page renders — without
+interaction-only rules (:hover, :active, :focus) and keyframes, which
+can't affect first paint. apps/core/templatetags/assets.py inlines it,
+then loads the full bundle without blocking rendering.
+
+collectstatic then hashes everything and writes the .gz/.br variants
+(WhiteNoise's CompressedManifestStaticFilesStorage; .br needs Brotli
+installed in the build environment). Pages only link the hashed names
+with STATIC_MANIFEST on, in a deployment that ships this build's
+STATIC_ROOT and static/build/ — see config/settings.py.
+"""
+
+import json
+import re
+import urllib.request
+
+from django.conf import settings
+
+BUILD_DIR = 'build'
+BUNDLE = f'{BUILD_DIR}/app.min.css'
+CRITICAL = f'{BUILD_DIR}/critical.min.css'
+MANIFEST = f'{BUILD_DIR}/assets.json'
+
+# Bundle order matters: page styles override the shell.
+SOURCES = ['css/base.css', 'css/dashboard.css', 'css/auth.css']
+CRITICAL_SOURCES = ['css/base.css']
+NON_CRITICAL_PSEUDO = re.compile(r':(hover|active|focus|focus-visible|focus-within|visited)\b')
+
+FONT_FAMILY = 'Space Grotesk'
+FONT_CSS_URL = 'https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&display=swap'
+FONT_SUBSET = 'latin'
+FONT_DIR = 'fonts'
+# Google serves woff2 (and the unicode-range split) only to browsers that
+# say they support it.
+FONT_USER_AGENT = (
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+)
+FETCH_TIMEOUT = 20  # seconds
+
+
+def source_root():
+    return settings.STATICFILES_DIRS[0]
+
+
+# ---------------------------------------------------------------------------
+# CSS
+# ---------------------------------------------------------------------------
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace. Selectors are left as written."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    css = css.replace(';}', '}')
+    return css.strip()
+
+
+def split_rules(css):
+    """
+    Split minified CSS into top-level (prelude, body) pairs; an at-rule
+    block like @media keeps its nested rules inside `body`.
+    """
+    rules, depth, start, brace = [], 0, 0, None
+    for i, char in enumerate(css):
+        if char == '{':
+            if depth == 0:
+                brace = i
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                rules.append((css[start:brace].strip(), css[brace + 1:i]))
+                start = i + 1
+    return rules
+
+
+def _is_critical(prelude):
+    if prelude.startswith('@keyframes') or prelude.startswith('@-webkit-keyframes'):
+        return False
+    return not all(NON_CRITICAL_PSEUDO.search(selector) for selector in prelude.split(','))
+
+
+def critical_css(css):
+    """Keep the rules of minified `css` that can affect first paint."""
+    kept = []
+    for prelude, body in split_rules(css):
+        if prelude.startswith('@media') or prelude.startswith('@supports'):
+            inner = critical_css(body)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif _is_critical(prelude):
+            kept.append(f'{prelude}{{{body}}}')
+    return ''.join(kept)
+
+
+def _read(paths):
+    return '\n'.join((source_root() / path).read_text(encoding='utf-8') for path in paths)
+
+
+# ---------------------------------------------------------------------------
+# Fonts
+# ---------------------------------------------------------------------------
+
+def _font_faces(css):
+    """Yield (subset, properties) for every @font-face in a Google Fonts stylesheet."""
+    for subset, body in re.findall(r'/\*\s*([\w-]+)\s*\*/\s*@font-face\s*{([^}]*)}', css):
+        props = dict(
+            (key.strip(), value.strip())
+            for key, _, value in (decl.partition(':') for decl in body.split(';'))
+            if value
+        )
+        yield subset, props
+
+
+def _fetch(url):
+    request = urllib.request.Request(url, headers={'User-Agent': FONT_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+        return response.read()
+
+
+def vendor_fonts(refresh=False, log=None):
+    """
+    Download the FONT_SUBSET woff2 files for FONT_FAMILY into
+    static/fonts/ unless they're already there. Returns the font entries
+    for the manifest.
+    """
+    index_path = source_root() / FONT_DIR / 'fonts.json'
+    if index_path.exists() and not refresh:
+        fonts = json.loads(index_path.read_text())
+        if all((source_root() / font['path']).exists() for font in fonts):
+            return fonts
+
+    css = _fetch(FONT_CSS_URL).decode()
+    by_url = {}
+    for subset, props in _font_faces(css):
+        if subset != FONT_SUBSET:
+            continue
+        url = re.search(r'url\(([^)]+)\)', props['src']).group(1)
+        font = by_url.setdefault(url, {
+            'family': FONT_FAMILY,
+            'style': props.get('font-style', 'normal'),
+            'weights': [],
+            'unicode_range': props.get('unicode-range', ''),
+        })
+        font['weights'].append(int(props.get('font-weight', 400)))
+    if not by_url:
+        raise ValueError(f"No {FONT_SUBSET} @font-face found at {FONT_CSS_URL}")
+
+    (source_root() / FONT_DIR).mkdir(parents=True, exist_ok=True)
+    slug = FONT_FAMILY.lower().replace(' ', '-')
+    fonts = []
+    for url, font in by_url.items():
+        weights = font.pop('weights')
+        low, high = min(weights), max(weights)
+        # A variable font is one URL for every weight.
+        suffix = '' if len(by_url) == 1 else f'-{low}'
+        path = f'{FONT_DIR}/{slug}-{FONT_SUBSET}{suffix}.woff2'
+        (source_root() / path).write_bytes(_fetch(url))
+        font.update(path=path, weight=f'{low} {high}' if low != high else str(low))
+        fonts.append(font)
+        if log:
+            log(f"Vendored {path}")
+    index_path.write_text(json.dumps(fonts, indent=2))
+    return fonts
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def build(fonts=True, refresh_fonts=False, log=None):
+    """Write the bundle, critical CSS and manifest under static/build/. Returns the manifest."""
+    out = source_root() / BUILD_DIR
+    out.mkdir(parents=True, exist_ok=True)
+
+    bundle = minify_css(_read(SOURCES))
+    critical = critical_css(minify_css(_read(CRITICAL_SOURCES)))
+    (source_root() / BUNDLE).write_text(bundle, encoding='utf-8')
+    (source_root() / CRITICAL).write_text(critical, encoding='utf-8')
+
+    manifest = {
+        'bundle': BUNDLE,
+        'critical': CRITICAL,
+        'sources': SOURCES,
+        'fonts': vendor_fonts(refresh=refresh_fonts, log=log) if fonts else [],
+    }
+    (source_root() / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    if log:
+        raw = sum((source_root() / path).stat().st_size for path in SOURCES)
+        log(f"{BUNDLE}: {raw} -> {len(bundle)} bytes; {CRITICAL}: {len(critical)} bytes")
+    return manifest
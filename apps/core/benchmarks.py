@@ -0,0 +1,351 @@
+"""
+Benchmark cases for `manage.py benchmark`.
+
+Each case is registered with @case(name) and receives a BenchmarkEnv for
+the current dataset size. It returns a zero-argument callable; the runner
+times repeated calls to it and records wall time and query count. Cases
+that write data either roll back or register cleanup with env.defer().
+
+Adding a case means adding one function here — the command, its JSON
+output and any comparison tooling pick it up automatically.
+"""
+
+import statistics
+import time
+from types import SimpleNamespace
+
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.core import datagen
+
+CASES = {}
+
+
+def case(name):
+    def decorator(func):
+        CASES[name] = func
+        return func
+    return decorator
+
+
+class BenchmarkEnv:
+    """Shared fixtures for one dataset size: a dense city and sample users in it."""
+
+    def __init__(self, size):
+        from django.db.models import Count
+
+        from apps.accounts.models import User
+
+        self.size = size
+        generated = User.objects.filter(username__startswith=datagen.USERNAME_PREFIX)
+        self.city_id = (
+            generated.values('city_id').annotate(n=Count('id')).order_by('-n')
+            .values_list('city_id', flat=True).first()
+        )
+        self.users = list(
+            generated.filter(city_id=self.city_id, neighborhood__isnull=False, interests__isnull=False)
+            .distinct().order_by('pk')[:20]
+        )
+        if not self.users:
+            raise RuntimeError("No generated users with interests — run generate_city_data first.")
+        self._cleanups = []
+        self._turn = 0
+
+    def next_user(self):
+        """Rotate through the sample users so one user's caches don't skew a case."""
+        user = self.users[self._turn % len(self.users)]
+        self._turn += 1
+        return user
+
+    def defer(self, func):
+        self._cleanups.append(func)
+
+    def cleanup(self):
+        for func in reversed(self._cleanups):
+            func()
+        self._cleanups.clear()
+
+
+def run_case(func, env, repeat):
+    run = func(env)
+    run()  # warm-up, not recorded
+    timings, queries = [], []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+    timings.sort()
+    return {
+        'runs': repeat,
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'queries': int(statistics.median(queries)),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Matching
+# ---------------------------------------------------------------------------
+
+@case('match_city_warm')
+def match_city_warm(env):
+    from apps.accounts.matching import MatchingContext
+    context = MatchingContext('city')
+    return lambda: list(context.get_matches(env.next_user(), page=1)[0])
+
+
+@case('match_city_cold')
+def match_city_cold(env):
+    from apps.accounts import match_index
+    from apps.accounts.matching import MatchingContext
+    context = MatchingContext('city')
+
+    def run():
+        match_index.invalidate('city', env.city_id)
+        list(context.get_matches(env.next_user(), page=1)[0])
+    return run
+
+
+@case('match_city_queryset')
+def match_city_queryset(env):
+    from apps.accounts.matching import CityMatchingStrategy
+    strategy = CityMatchingStrategy()
+    return lambda: list(strategy._get_queryset_matches(env.next_user(), 1, 10)[0])
+
+
+@case('match_city_deep_page')
+def match_city_deep_page(env):
+    from apps.accounts.matching import MatchingContext
+    context = MatchingContext('city')
+    return lambda: list(context.get_matches(env.next_user(), page=50)[0])
+
+
+@case('match_neighborhood_warm')
+def match_neighborhood_warm(env):
+    from apps.accounts.matching import MatchingContext
+    context = MatchingContext('neighborhood')
+    return lambda: list(context.get_matches(env.next_user(), page=1)[0])
+
+
+@case('match_recommended_warm')
+def match_recommended_warm(env):
+    from apps.accounts.matching import MatchingContext
+    context = MatchingContext('recommended')
+    return lambda: list(context.get_matches(env.next_user(), page=1)[0])
+
+
+@case('match_recommended_cold')
+def match_recommended_cold(env):
+    from apps.accounts import scoring
+    from apps.accounts.matching import MatchingContext
+    context = MatchingContext('recommended')
+
+    def run():
+        user = env.next_user()
+        scoring.evict(user.pk)
+        list(context.get_matches(user, page=1)[0])
+    return run
+
+
+@case('match_city_keyset')
+def match_city_keyset(env):
+    from apps.accounts.matching import MatchingContext
+    context = MatchingContext('city')
+    return lambda: list(context.get_matches_page(env.next_user()))
+
+
+# ---------------------------------------------------------------------------
+# Pagination
+# ---------------------------------------------------------------------------
+
+def _paginated_users(env, counter):
+    from django.core.paginator import Paginator
+
+    from apps.accounts.models import User
+    from apps.core.pagination import get_page_range
+
+    def run():
+        paginator = Paginator(User.objects.filter(city_id=env.city_id).order_by('pk'), 20)
+        page_obj, _ = get_page_range(paginator, 50, counter=counter, scope=env.city_id)
+        list(page_obj)
+    return run
+
+
+@case('page_range_exact')
+def page_range_exact(env):
+    return _paginated_users(env, None)
+
+
+@case('page_range_cached')
+def page_range_cached(env):
+    from apps.core.counting import CachedCount, EstimatedCount
+    return _paginated_users(env, CachedCount(EstimatedCount()))
+
+
+# ---------------------------------------------------------------------------
+# Notifications
+# ---------------------------------------------------------------------------
+
+@case('notification_fanout_1000')
+def notification_fanout(env):
+    from apps.accounts.models import User
+    from apps.core.notifications import NotificationFactory, NotificationType
+
+    recipients = list(User.objects.filter(city_id=env.city_id).order_by('pk')[:1000])
+    group = SimpleNamespace(id=0, name='Benchmark Group')
+    event = SimpleNamespace(name='Benchmark Event')
+
+    def run():
+        with override_settings(OUTBOX_ENABLED=False), transaction.atomic():
+            NotificationFactory.create_many(NotificationType.EVENT_CREATED, [
+                {'recipient': r, 'event': event, 'group': group} for r in recipients
+            ]).save()
+            transaction.set_rollback(True)
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Search — each case searches for the sample users' neighborhoods in turn,
+# so the indexed backends and the icontains baseline see identical queries.
+# ---------------------------------------------------------------------------
+
+def _search_terms(env):
+    from apps.core import reference
+    return [reference.neighborhood(u.neighborhood_id).area_name.split()[0][:5] for u in env.users]
+
+
+@case('search_fulltext')
+def search_fulltext(env):
+    from apps.core import search
+    terms, backend = _search_terms(env), search.get_backend()
+    return lambda: list(backend.search(terms[env._turn % len(terms)], city_code=env.next_user().city_id))
+
+
+@case('search_autocomplete')
+def search_autocomplete(env):
+    from apps.core import search
+    backend = search.get_backend()
+    return lambda: backend.autocomplete(env.next_user().username[:6], city_code=env.city_id)
+
+
+@case('search_icontains_baseline')
+def search_icontains_baseline(env):
+    from django.db.models import Q
+
+    from apps.accounts.models import User
+    terms = _search_terms(env)
+
+    def run():
+        term = terms[env._turn % len(terms)]
+        list(
+            User.objects.filter(city_id=env.next_user().city_id)
+            .filter(
+                Q(username__icontains=term) | Q(bio__icontains=term)
+                | Q(neighborhood__area_name__icontains=term)
+                | Q(interests__interest_name__icontains=term)
+            )
+            .distinct().order_by('pk')[:20]
+        )
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Cold start — a fresh interpreter per run, launch to first response.
+# Independent of dataset size, but kept here so regressions show up in the
+# same report.
+# ---------------------------------------------------------------------------
+
+@case('cold_start')
+def cold_start(env):
+    from config.startup import measure_cold_start
+    return lambda: measure_cold_start('/login/', fast_start=False)
+
+
+@case('cold_start_fast')
+def cold_start_fast(env):
+    from config.startup import measure_cold_start
+    return lambda: measure_cold_start('/login/', fast_start=True)
+
+
+# ---------------------------------------------------------------------------
+# Page shell — dashboard with its {% shellcache %} fragments warm or retired
+# ---------------------------------------------------------------------------
+
+def _dashboard(env, retire):
+    from django.core.cache import cache
+
+    from apps.core import fragments
+
+    # Log every sample user in before timing starts, so runs measure the
+    # page rather than Client() and force_login().
+    clients = {}
+    for user in env.users:
+        client = clients[user.pk] = Client()
+        client.force_login(user)
+        env.defer(client.logout)
+
+    def run():
+        user = env.next_user()
+        if retire:
+            cache.delete_many([
+                fragments.fragment_key(name, user, 'accounts:dashboard') for name in ('sidebar', 'dashboard')
+            ])
+        with override_settings(ALLOWED_HOSTS=['*']):
+            clients[user.pk].get('/dashboard/')
+    return run
+
+
+@case('dashboard_shell_warm')
+def dashboard_shell_warm(env):
+    return _dashboard(env, retire=False)
+
+
+@case('dashboard_shell_cold')
+def dashboard_shell_cold(env):
+    return _dashboard(env, retire=True)
+
+
+# ---------------------------------------------------------------------------
+# Auth flows (through the full middleware stack)
+# ---------------------------------------------------------------------------
+
+@case('signup')
+def signup(env):
+    from apps.accounts.models import User
+    from apps.core.models import OutboxMessage
+
+    counter = iter(range(10 ** 9))
+    prefix = f'bench_signup_{int(time.time())}_'
+    env.defer(lambda: User.objects.filter(username__startswith=prefix).delete())
+    # The welcome email is queued (outbox on) or sent to the dummy backend.
+    env.defer(lambda: OutboxMessage.objects.filter(kind='email', payload__to__startswith=prefix).delete())
+    user = env.users[0]
+
+    def run():
+        n = next(counter)
+        with override_settings(ALLOWED_HOSTS=['*'], EMAIL_BACKEND='django.core.mail.backends.dummy.EmailBackend'):
+            Client().post('/signup/', {
+                'username': f'{prefix}{n}',
+                'email': f'{prefix}{n}@example.com',
+                'city': user.city_id,
+                'neighborhood': user.neighborhood_id,
+                'password1': 'bench-pass-123',
+                'password2': 'bench-pass-123',
+            })
+    return run
+
+
+@case('login')
+def login(env):
+    def run():
+        with override_settings(ALLOWED_HOSTS=['*']):
+            Client().post('/login/', {
+                'username': env.next_user().username,
+                'password': datagen.GENERATED_PASSWORD,
+            })
+    return run
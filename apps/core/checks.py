@@ -0,0 +1,27 @@
+"""
+System checks for settings that are only safe on a cache every process
+shares. Invalidation from one worker never reaches another worker's
+per-process LocMemCache, so a cached grant stays live there until it
+expires.
+"""
+
+from django.conf import settings
+from django.core import checks
+
+PER_PROCESS_CACHES = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def is_per_process(alias):
+    return settings.CACHES.get(alias, {}).get('BACKEND') in PER_PROCESS_CACHES
+
+
+@checks.register(checks.Tags.security, checks.Tags.caches)
+def check_access_cache(app_configs, **kwargs):
+    if getattr(settings, 'ACCESS_CACHE_TTL', 0) and is_per_process('default'):
+        return [checks.Error(
+            "ACCESS_CACHE_TTL needs a shared cache, but the 'default' cache is per-process: "
+            "a revoked membership or friendship would stay cached in other workers.",
+            hint="Configure Redis or Memcached in CACHES, or set ACCESS_CACHE_TTL=0.",
+            id='core.E001',
+        )]
+    return []
@@ -0,0 +1,10 @@
+def notifications(request):
+    """
+    Exposes the unread-notification badge count to every template. The
+    count is a column on the already-loaded request.user, so this adds no
+    queries.
+    """
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {'unread_notification_count': 0}
+    return {'unread_notification_count': user.unread_notification_count}
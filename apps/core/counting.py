@@ -0,0 +1,119 @@
+"""
+Counting strategies for paginated querysets.
+
+Django's Paginator gets num_pages from an exact COUNT(*), which costs as
+much as the page query itself on large tables. get_page_range() and
+get_keyset_page() accept one of these strategies instead, so each call
+site picks its own cheap/exact tradeoff:
+
+    ExactCount()                       plain COUNT(*) — the default
+    CachedCount(ttl=30)                COUNT(*) cached per query + scope
+    EstimatedCount(threshold=10_000)   planner estimate on Postgres once
+                                       the table is too big to count
+    CachedCount(EstimatedCount())      both
+
+Estimates are only ever used on PostgreSQL; other backends always count.
+"""
+
+import hashlib
+import json
+import logging
+from abc import ABC, abstractmethod
+
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+from apps.core import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COUNT_TTL = 30  # seconds
+DEFAULT_ESTIMATE_THRESHOLD = 10_000  # rows
+
+
+def query_signature(queryset) -> str:
+    """Stable hash of the SQL and parameters a queryset would run."""
+    sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+    raw = f'{queryset.db}|{sql}|{params!r}'
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class CountStrategy(ABC):
+    @abstractmethod
+    def count(self, queryset, scope=None) -> int:
+        """
+        Return the number of rows in `queryset`. `scope` identifies whose
+        view of the data this is (e.g. a user id) for strategies that cache.
+        """
+        pass
+
+
+class ExactCount(CountStrategy):
+    def count(self, queryset, scope=None) -> int:
+        return queryset.count()
+
+
+class CachedCount(CountStrategy):
+    """Caches another strategy's result per (query signature, scope) for `ttl` seconds."""
+
+    def __init__(self, inner: CountStrategy = None, ttl: int = DEFAULT_COUNT_TTL):
+        self._inner = inner or ExactCount()
+        self._ttl = ttl
+
+    def count(self, queryset, scope=None) -> int:
+        key = f'count:{query_signature(queryset)}:{scope or "-"}'
+        total = cache.get(key)
+        metrics.record_cache(hit=total is not None)
+        if total is None:
+            total = self._inner.count(queryset, scope)
+            cache.set(key, total, self._ttl)
+        return total
+
+
+class EstimatedCount(CountStrategy):
+    """
+    Uses the Postgres planner's row estimate when it says the result has
+    at least `threshold` rows, and an exact COUNT below that — so small
+    result sets stay exact and only huge ones are approximated.
+
+    Unfiltered querysets read pg_class.reltuples; anything else reads the
+    top-level "Plan Rows" from EXPLAIN.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_ESTIMATE_THRESHOLD):
+        self._threshold = threshold
+
+    def count(self, queryset, scope=None) -> int:
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+
+        try:
+            estimate = self._estimate(queryset, connection)
+        except DatabaseError as e:
+            logger.warning(f"Row estimate failed, falling back to COUNT: {e}")
+            estimate = None
+
+        if estimate is None or estimate < self._threshold:
+            return queryset.count()
+        return estimate
+
+    def _estimate(self, queryset, connection):
+        query = queryset.query
+        with connection.cursor() as cursor:
+            if not query.where and not query.distinct and not query.annotations:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                # reltuples is -1 until the table has been ANALYZEd.
+                if row and row[0] >= 0:
+                    return row[0]
+
+            sql, params = query.get_compiler(queryset.db).as_sql()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
@@ -0,0 +1,148 @@
+"""
+Synthetic city-scale data for load testing (`manage.py generate_city_data`
+and `manage.py benchmark`).
+
+Users are spread over the fixture cities with a Zipf-like skew by city
+size (one or two dense cities, a long tail), get 0-4 interests drawn by popularity, and
+come with friendships, ratings and notifications. Everything is written
+with chunked bulk_create, so generating a million users is bounded by
+insert throughput rather than per-row round-trips.
+
+Generated users are named `gen_<n>` and share one password,
+GENERATED_PASSWORD, so benchmarks can log in as them.
+"""
+
+import io
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.accounts import recommendations
+from apps.accounts.match_index import interest_mask
+from apps.core import reference
+
+USERNAME_PREFIX = 'gen_'
+GENERATED_PASSWORD = 'benchmark-pass-1'
+DEFAULT_BATCH_SIZE = 2000
+
+INTEREST_COUNT_WEIGHTS = [10, 30, 30, 20, 10]  # P(user has 0, 1, 2, 3, 4 interests)
+AVG_FRIENDS = 5
+RATER_SHARE = 0.3
+AVG_NOTIFICATIONS = 3
+READ_SHARE = 0.6
+
+
+def _zipf_weights(n):
+    return [1 / (rank + 1) for rank in range(n)]
+
+
+def generated_user_count():
+    return get_user_model().objects.filter(username__startswith=USERNAME_PREFIX).count()
+
+
+def generate(users, seed=0, batch_size=DEFAULT_BATCH_SIZE, log=None):
+    """
+    Add `users` generated users (continuing any previous numbering) plus
+    their interests, friendships, ratings and notifications.
+    """
+    from apps.accounts.models import UserInterest, UserRating
+    from apps.core.models import NotificationRecord
+    from apps.core.notifications import NotificationType
+
+    User = get_user_model()
+    rng = random.Random(seed + generated_user_count())
+    password = make_password(GENERATED_PASSWORD)
+
+    # Bigger cities (more neighborhoods) get more people: Dhaka first.
+    cities = sorted(reference.cities(), key=lambda c: -len(reference.neighborhoods(c.pk)))
+    city_weights = _zipf_weights(len(cities))
+    interest_ids = [i.pk for i in reference.interests()]
+    interest_weights = _zipf_weights(len(interest_ids))
+    notif_types = [t.value for t in NotificationType]
+    friendship_model, friendship_fields = recommendations.friendship_fields()
+
+    start = generated_user_count()
+    # Friends and ratees are drawn from every generated user so far.
+    pool = list(User.objects.filter(username__startswith=USERNAME_PREFIX).values_list('pk', flat=True))
+    created = 0
+    while created < users:
+        size = min(batch_size, users - created)
+        with transaction.atomic():
+            chunk, picks = [], []
+            for n in range(start + created, start + created + size):
+                city = rng.choices(cities, city_weights)[0]
+                hoods = reference.neighborhoods(city.pk)
+                hood = rng.choice(hoods) if hoods and rng.random() > 0.1 else None
+                k = rng.choices(range(len(INTEREST_COUNT_WEIGHTS)), INTEREST_COUNT_WEIGHTS)[0]
+                picked = set()
+                while len(picked) < min(k, len(interest_ids)):
+                    picked.add(rng.choices(interest_ids, interest_weights)[0])
+                picks.append(picked)
+                chunk.append(User(
+                    username=f'{USERNAME_PREFIX}{n}',
+                    email=f'{USERNAME_PREFIX}{n}@example.com',
+                    password=password,
+                    city_id=city.pk,
+                    neighborhood_id=hood.pk if hood else None,
+                    interest_mask=interest_mask(picked),
+                ))
+            chunk = User.objects.bulk_create(chunk, batch_size=batch_size)
+            ids = [u.pk for u in chunk]
+            pool.extend(ids)
+
+            UserInterest.objects.bulk_create(
+                [UserInterest(user_id=user_id, interest_id=i) for user_id, picked in zip(ids, picks) for i in picked],
+                batch_size=batch_size,
+            )
+
+            if friendship_model is not None:
+                first, second = friendship_fields
+                pairs = set()
+                for user_id in ids:
+                    for _ in range(rng.randint(0, 2 * AVG_FRIENDS)):
+                        other = rng.choice(pool)
+                        if other != user_id:
+                            pairs.add((min(user_id, other), max(user_id, other)))
+                friendship_model.objects.bulk_create(
+                    [friendship_model(**{first: a, second: b}) for a, b in pairs],
+                    batch_size=batch_size, ignore_conflicts=True,
+                )
+
+            ratings = {}
+            for user_id in rng.sample(ids, int(len(ids) * RATER_SHARE)):
+                for _ in range(rng.randint(1, 3)):
+                    ratee = rng.choice(pool)
+                    if ratee != user_id:
+                        ratings[(user_id, ratee)] = rng.choices([1, 2, 3, 4, 5], [5, 5, 15, 35, 40])[0]
+            UserRating.objects.bulk_create(
+                [UserRating(rater_id=a, ratee_id=b, rating=r) for (a, b), r in ratings.items()],
+                batch_size=batch_size, ignore_conflicts=True,
+            )
+
+            notifications = []
+            for user_id in ids:
+                for _ in range(rng.randint(0, 2 * AVG_NOTIFICATIONS)):
+                    notifications.append(NotificationRecord(
+                        recipient_id=user_id,
+                        notif_type=rng.choice(notif_types),
+                        message='Generated notification.',
+                        is_read=rng.random() < READ_SHARE,
+                    ))
+            NotificationRecord.objects.bulk_create(notifications, batch_size=batch_size)
+
+        created += size
+        if log:
+            log(f"Generated {created}/{users} users")
+
+    _refresh_denormalized()
+    return created
+
+
+def _refresh_denormalized():
+    """bulk_create skips the counters that signals normally maintain."""
+    from django.core.management import call_command
+    call_command('rebuild_unread_counts', stdout=io.StringIO())
+    call_command('rebuild_rating_totals', stdout=io.StringIO())
+    call_command('rebuild_search_index', stdout=io.StringIO())
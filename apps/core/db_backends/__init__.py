@@ -0,0 +1,18 @@
+"""
+Thin subclasses of Django's database backends that time connect() and
+report it to the current RequestMetrics. config/database.py selects them
+in place of the stock ENGINEs; behavior is otherwise unchanged.
+"""
+
+import time
+
+from apps.core import metrics
+
+
+class ConnectTimingMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            metrics.record_connection(time.perf_counter() - start)
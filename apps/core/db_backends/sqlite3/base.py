@@ -0,0 +1,7 @@
+from django.db.backends.sqlite3 import base
+
+from apps.core.db_backends import ConnectTimingMixin
+
+
+class DatabaseWrapper(ConnectTimingMixin, base.DatabaseWrapper):
+    pass
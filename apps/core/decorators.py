@@ -5,6 +5,9 @@ Applied to: view-level access control.
 Each decorator wraps a view function and enforces one access rule before
 letting the request through. They compose (see usage in view files), so a
 view can stack e.g. @login_required_custom + @group_member_required.
+
+Membership and friendship checks go through apps/core/access.py, which
+memoizes them per request (and optionally across requests).
 """
 
 from functools import wraps
@@ -38,9 +41,9 @@ def friendship_required(view_func):
     """Ensures a mutual friendship exists between request.user and the target."""
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        from apps.social.models import Friendship
+        from apps.core import access
         friend_id = kwargs.get('friend_id') or kwargs.get('user_id')
-        if not Friendship.objects.are_friends(request.user.id, friend_id):
+        if not access.are_friends(request, friend_id):
             messages.error(request, "You must be friends to access this.")
             return redirect('social:friends')
         return view_func(request, *args, **kwargs)
@@ -48,35 +51,47 @@ def friendship_required(view_func):
 
 
 def group_member_required(view_func):
-    """Ensures the current user is a member of the target group."""
+    """
+    Ensures the current user is a member of the target group, and exposes
+    the membership to the view as `request.group_membership`.
+    """
     @wraps(view_func)
     def wrapper(request, *args, **kwargs):
-        from apps.groups.models import GroupMembership
-        group_id = kwargs.get('group_id')
-        if not GroupMembership.objects.filter(user=request.user, group_id=group_id).exists():
+        from apps.core import access
+        membership = access.get_membership(request, kwargs.get('group_id'))
+        if membership is None:
             return redirect('groups:list')
+        request.group_membership = membership
         return view_func(request, *args, **kwargs)
     return wrapper
 
 
-def rate_limited(max_attempts=5, window_seconds=900):
+def rate_limited(max_attempts=5, window_seconds=900, name='login', per_ip_attempts=None):
     """
-    Blocks further POST attempts once `max_attempts` failures occur within
-    `window_seconds`, using Django's cache framework as the counter store.
+    Blocks further POST attempts once `max_attempts` failures for the
+    submitted username, or `per_ip_attempts` (default 4x max_attempts)
+    failures from the client IP, occur within a sliding `window_seconds`.
 
-    The view itself is responsible for incrementing/clearing the cache key
-    (`login_attempts:<username>`) on failed/successful attempts — this
-    decorator only checks the current count before letting the request in.
+    Counters live in the shared store from settings.RATE_LIMIT_STORE (see
+    apps/core/ratelimit.py), so the limit holds across every instance. The
+    view records outcomes through `request.rate_limit`: `.hit()` after a
+    failed attempt, `.reset(['username'])` after a successful one.
     """
+    from apps.core.ratelimit import RateLimiter, RequestRateLimit
+
+    limiters = {
+        'username': RateLimiter(f'{name}:username', max_attempts, window_seconds),
+        'ip': RateLimiter(f'{name}:ip', per_ip_attempts or max_attempts * 4, window_seconds),
+    }
+
     def decorator(view_func):
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
-            from django.core.cache import cache
-            if request.method == 'POST':
-                key = f"login_attempts:{request.POST.get('username', '')}"
-                if cache.get(key, 0) >= max_attempts:
-                    messages.error(request, "Too many failed login attempts. Please try again in 15 minutes.")
-                    return redirect('accounts:login')
+            request.rate_limit = RequestRateLimit(limiters, request)
+            if request.method == 'POST' and request.rate_limit.is_limited():
+                minutes = max(window_seconds // 60, 1)
+                messages.error(request, f"Too many failed attempts. Please try again in {minutes} minutes.")
+                return redirect(request.path)
             return view_func(request, *args, **kwargs)
         return wrapper
     return decorator
\ No newline at end of file
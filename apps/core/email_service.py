@@ -6,17 +6,36 @@ EmailAdapter is the stable interface. DjangoEmailAdapter is today's
 concrete implementation (Django SMTP backend). Swapping to SendGrid or SES
 later means adding one new adapter class here — EmailService and every
 call site stay untouched.
+
+QueuedEmailAdapter is the adapter request handlers get by default: it
+only writes the message to the outbox (apps/core/outbox.py), and the
+`run_outbox` worker hands it to the real transport adapter later, so slow
+SMTP never adds to request latency.
+
+PooledDjangoEmailAdapter keeps one backend connection open across sends
+and adds send_many(), so the worker delivers a burst of queued emails in
+batched send_messages() calls over a single SMTP session instead of one
+handshake per message. EmailService uses send_many() whenever its adapter
+provides it, and close() to release the connection.
 """
 
 import logging
+import time
 from abc import ABC, abstractmethod
+from typing import NamedTuple
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
 
 logger = logging.getLogger(__name__)
 
 
+class OutgoingEmail(NamedTuple):
+    to: str
+    subject: str
+    body: str
+
+
 class EmailAdapter(ABC):
     @abstractmethod
     def send(self, to: str, subject: str, body: str) -> bool:
@@ -39,10 +58,124 @@ class DjangoEmailAdapter(EmailAdapter):
             return False
 
 
+class PooledDjangoEmailAdapter(EmailAdapter):
+    """
+    Sends through one long-lived Django email backend connection.
+
+    send_many() hands the backend up to `batch_size` messages per
+    send_messages() call, and the connection is recycled every
+    `batch_size` messages (most SMTP servers cap messages per session).
+    A connection left unused for `idle_timeout` seconds is replaced
+    before the next send rather than trusted; the worker calls close()
+    when the queue runs dry and on shutdown.
+
+    If a batch fails, the connection is torn down and that batch is sent
+    again one message at a time on a fresh one, each retried once before
+    it is reported as failed. Messages the backend accepted before the
+    failure may go out twice — delivery is at-least-once, like the outbox.
+    """
+
+    def __init__(self, batch_size: int = 100, backend: str = None, idle_timeout: float = 30):
+        self._batch_size = batch_size
+        self._backend = backend
+        self._idle_timeout = idle_timeout
+        self._connection = None
+        self._sent_on_connection = 0
+        self._last_used = 0.0
+
+    def _open(self):
+        if (
+            self._connection is None
+            or self._sent_on_connection >= self._batch_size
+            or time.monotonic() - self._last_used > self._idle_timeout
+        ):
+            self.close()
+            self._connection = get_connection(self._backend, fail_silently=False)
+            self._connection.open()
+            self._last_used = time.monotonic()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception as e:
+                logger.warning(f"Closing email connection failed: {e}")
+        self._connection = None
+        self._sent_on_connection = 0
+
+    def _send_batch(self, connection, emails):
+        connection.send_messages([
+            EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[email.to],
+                connection=connection,
+            )
+            for email in emails
+        ])
+        self._sent_on_connection += len(emails)
+        self._last_used = time.monotonic()
+
+    def _send_one(self, email: OutgoingEmail) -> bool:
+        for attempt in range(2):
+            try:
+                self._send_batch(self._open(), [email])
+                return True
+            except Exception as e:
+                self.close()
+                if attempt:
+                    logger.error(f"Email send failed to {email.to}: {e}")
+                else:
+                    logger.warning(f"Email send failed to {email.to}, reconnecting: {e}")
+        return False
+
+    def send(self, to: str, subject: str, body: str) -> bool:
+        return self.send_many([OutgoingEmail(to, subject, body)])[0]
+
+    def send_many(self, messages) -> list:
+        messages = list(messages)
+        results = []
+        while len(results) < len(messages):
+            connection = self._open()
+            room = self._batch_size - self._sent_on_connection
+            batch = messages[len(results):len(results) + room]
+            try:
+                self._send_batch(connection, batch)
+            except Exception as e:
+                logger.warning(f"Email batch of {len(batch)} failed, sending one by one: {e}")
+                self.close()
+                results.extend(self._send_one(email) for email in batch)
+            else:
+                results.extend([True] * len(batch))
+        return results
+
+
+class QueuedEmailAdapter(EmailAdapter):
+    def send(self, to: str, subject: str, body: str) -> bool:
+        from apps.core import outbox
+        outbox.enqueue('email', {'to': to, 'subject': subject, 'body': body})
+        return True
+
+
 class EmailService:
     def __init__(self, adapter: EmailAdapter = None):
         self._adapter = adapter or DjangoEmailAdapter()
 
+    def send_many(self, messages) -> list:
+        """Send OutgoingEmails, batched when the adapter supports it; one bool per message."""
+        send_many = getattr(self._adapter, 'send_many', None)
+        if send_many is not None:
+            return send_many(messages)
+        return [self._adapter.send(to=m.to, subject=m.subject, body=m.body) for m in messages]
+
+    def close(self):
+        """Release any connection the adapter is holding open."""
+        close = getattr(self._adapter, 'close', None)
+        if close is not None:
+            close()
+
     def send_welcome(self, user) -> bool:
         return self._adapter.send(
             to=user.email,
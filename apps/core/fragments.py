@@ -0,0 +1,61 @@
+"""
+Fragment cache for the page shell (base.html sidebar, dashboard cards).
+
+The shell is the same on every page a user visits apart from the active
+nav item and the unread badge, yet rendering it reverses a dozen URLs
+and walks request.resolver_match each time. {% shellcache %}
+(apps/core/templatetags/shell.py) stores the rendered HTML under a key
+built from:
+
+    shell:<name>:<user id>:<profile digest>:<unread count>:<reference version>:<view name>
+
+The profile digest hashes the SHELL_FIELDS of the already-loaded
+request.user, so a profile edit moves the key in every process at once —
+no invalidation message has to reach other workers' caches, which with
+the default per-process LocMemCache it never would. City renames move the
+reference data version instead, and the unread count is part of the key,
+so the badge is always the count on request.user.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+from apps.core import metrics, reference
+
+FRAGMENT_TIMEOUT = 60 * 60  # 1 hour — a safety net, the key tracks changes
+# User fields rendered inside {% shellcache %} fragments. request.user
+# always has them loaded (they are in the identity snapshot too, see
+# apps/accounts/identity.py), so keying on them costs no query.
+SHELL_FIELDS = ('username', 'city_id', 'neighborhood_id', 'is_staff')
+
+
+def profile_digest(user) -> str:
+    values = '\x1f'.join(str(getattr(user, attname)) for attname in SHELL_FIELDS)
+    return hashlib.sha1(values.encode()).hexdigest()[:12]
+
+
+def fragment_key(name, user, view_name) -> str:
+    if user is None or not user.is_authenticated:
+        owner = 'anon'
+    else:
+        owner = f'{user.pk}:{profile_digest(user)}:{user.unread_notification_count}'
+    return f'shell:{name}:{owner}:{reference.get().version}:{view_name}'
+
+
+def request_key(name, request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return fragment_key(name, getattr(request, 'user', None), match.view_name if match else '-')
+
+
+def get_or_render(name, request, render):
+    """Return the cached fragment `name` for this request, rendering it on a miss."""
+    if request is None:
+        return render()  # rendered outside a request (e.g. render_to_string)
+    key = request_key(name, request)
+    html = cache.get(key)
+    metrics.record_cache(hit=html is not None)
+    if html is None:
+        html = render()
+        cache.set(key, html, FRAGMENT_TIMEOUT)
+    return html
@@ -0,0 +1,69 @@
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core import benchmarks, datagen
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the benchmark suite at one or more dataset sizes, generating "
+        "synthetic users as needed, and write comparable JSON results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--cases', nargs='+', choices=sorted(benchmarks.CASES),
+                            help="Subset of cases to run (default: all).")
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='benchmark-results.json')
+
+    def handle(self, *args, **options):
+        names = options['cases'] or list(benchmarks.CASES)
+        results = []
+
+        for size in sorted(options['sizes']):
+            existing = datagen.generated_user_count()
+            if existing > size:
+                raise CommandError(
+                    f"Database already has {existing} generated users, more than size {size}. "
+                    f"Use a fresh database or larger sizes."
+                )
+            if existing < size:
+                self.stdout.write(f"Generating {size - existing} users to reach {size}...")
+                datagen.generate(size - existing, seed=options['seed'])
+
+            env = benchmarks.BenchmarkEnv(size)
+            try:
+                for name in names:
+                    result = benchmarks.run_case(benchmarks.CASES[name], env, options['repeat'])
+                    result.update(case=name, size=size)
+                    results.append(result)
+                    self.stdout.write(
+                        f"{size:>9}  {name:<28} median {result['median_ms']:>9.2f} ms  "
+                        f"p95 {result['p95_ms']:>9.2f} ms  {result['queries']:>3} queries"
+                    )
+            finally:
+                env.cleanup()
+
+        report = {
+            'meta': {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'database': connection.vendor,
+                'python': sys.version.split()[0],
+                'django': django.get_version(),
+                'platform': platform.platform(),
+                'repeat': options['repeat'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
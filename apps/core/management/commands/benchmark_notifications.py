@@ -0,0 +1,53 @@
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from apps.core.notifications import NotificationFactory, NotificationType
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-row Notification.save() against the batched "
+        "NotificationFactory.create_many() path for an EVENT_CREATED fan-out. "
+        "The outbox is bypassed so both paths measure the database writes. "
+        "Everything runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=5000)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        from apps.accounts.models import User
+
+        count = options['recipients']
+        group = SimpleNamespace(id=0, name='Benchmark Group')
+        event = SimpleNamespace(name='Benchmark Event')
+
+        with override_settings(OUTBOX_ENABLED=False), transaction.atomic():
+            recipients = User.objects.bulk_create(
+                [User(username=f'__bench_notif_{i}') for i in range(count)],
+                batch_size=options['batch_size'],
+            )
+            contexts = [{'recipient': r, 'event': event, 'group': group} for r in recipients]
+
+            start = time.perf_counter()
+            for ctx in contexts:
+                NotificationFactory.create(NotificationType.EVENT_CREATED, ctx).save()
+            per_row = time.perf_counter() - start
+
+            start = time.perf_counter()
+            NotificationFactory.create_many(NotificationType.EVENT_CREATED, contexts).save(
+                batch_size=options['batch_size'],
+            )
+            batched = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"recipients: {count}")
+        self.stdout.write(f"per-row save():       {per_row:.3f}s")
+        self.stdout.write(f"create_many().save(): {batched:.3f}s")
+        self.stdout.write(self.style.SUCCESS(f"speedup: {per_row / batched:.1f}x"))
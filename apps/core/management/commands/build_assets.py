@@ -0,0 +1,51 @@
+from urllib.error import URLError
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from apps.core import assets
+
+
+class Command(BaseCommand):
+    help = (
+        "Vendor the Space Grotesk font, bundle and minify the CSS, extract "
+        "critical CSS, then run collectstatic for hashed, precompressed files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refresh-fonts', action='store_true',
+                            help="Download the font again even if static/fonts/ already has it.")
+        parser.add_argument('--skip-fonts', action='store_true',
+                            help="Build without web fonts (the CSS falls back to system-ui).")
+        parser.add_argument('--no-collectstatic', action='store_true')
+
+    def handle(self, *args, **options):
+        try:
+            assets.build(
+                fonts=not options['skip_fonts'],
+                refresh_fonts=options['refresh_fonts'],
+                log=self.stdout.write,
+            )
+        except (URLError, ValueError) as e:
+            raise CommandError(f"Could not vendor {assets.FONT_FAMILY}: {e}. Retry with network access or --skip-fonts.")
+
+        if options['no_collectstatic']:
+            return
+        # Hashed and compressed whatever the serving storage is, so turning
+        # on STATIC_MANIFEST only needs this build's STATIC_ROOT shipped.
+        storages = {**settings.STORAGES, 'staticfiles': {'BACKEND': settings.MANIFEST_STATIC_STORAGE}}
+        with override_settings(STORAGES=storages):
+            call_command('collectstatic', interactive=False, verbosity=0)
+        try:
+            import brotli  # noqa: F401
+        except ImportError:
+            self.stdout.write(self.style.WARNING(
+                "Brotli is not installed, so only .gz variants were written."
+            ))
+        if not settings.STATIC_MANIFEST:
+            self.stdout.write(self.style.WARNING(
+                "STATIC_MANIFEST is off, so pages still link the unhashed files."
+            ))
+        self.stdout.write(self.style.SUCCESS("Static assets built."))
@@ -0,0 +1,89 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.utils import ConnectionHandler
+
+from config.database import MODES, database_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Connect to DATABASE_URL under one or more DB_CONNECTION_MODEs and "
+        "report the resulting settings plus connection setup and health "
+        "check (SELECT 1) timings, so modes can be compared before switching."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=[settings.DB_CONNECTION_MODE])
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--url', help="Database URL (default: the DATABASE_URL setting).")
+
+    def handle(self, *args, **options):
+        from decouple import config
+
+        url = options['url'] or config('DATABASE_URL')
+        for mode in options['modes']:
+            db = database_settings(
+                url,
+                mode=mode,
+                ssl_require=config('DB_SSL_REQUIRE', cast=bool),
+                conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+                pool_min_size=config('DB_POOL_MIN_SIZE', default=0, cast=int),
+                pool_max_size=config('DB_POOL_MAX_SIZE', default=4, cast=int),
+                pool_timeout=config('DB_POOL_TIMEOUT', default=10, cast=int),
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{mode}"))
+            self.stdout.write(
+                f"  engine={db['ENGINE']} conn_max_age={db['CONN_MAX_AGE']} "
+                f"health_checks={db.get('CONN_HEALTH_CHECKS', False)} "
+                f"server_side_cursors={not db.get('DISABLE_SERVER_SIDE_CURSORS', False)} "
+                f"pool={self._describe_pool(db)}"
+            )
+            try:
+                connect_ms, query_ms = self._measure(mode, db, options['iterations'])
+            except Exception as e:
+                raise CommandError(f"{mode}: {e}") from e
+            self.stdout.write(
+                f"  connect: median {statistics.median(connect_ms):.2f} ms, max {max(connect_ms):.2f} ms | "
+                f"SELECT 1: median {statistics.median(query_ms):.2f} ms"
+            )
+        self.stdout.write(self.style.SUCCESS("Database check passed."))
+
+    def _describe_pool(self, db):
+        pool = db.get('OPTIONS', {}).get('pool')
+        if not pool:
+            return None
+        return {k: v for k, v in pool.items() if k != 'check'}
+
+    def _measure(self, mode, db, iterations):
+        # A private handler under its own alias, so pools are not shared
+        # with the app's real 'default' connection (ConnectionHandler
+        # insists on a 'default' entry, which is never opened).
+        alias = f'check_{mode}'
+        handler = ConnectionHandler({'default': db, alias: db})
+        connection = handler[alias]
+        connect_ms, query_ms = [], []
+        try:
+            for _ in range(iterations):
+                # Each iteration is one request's worth, bracketed the way
+                # Django's request_started/request_finished handlers do it:
+                # a persistent connection is reused (after a health check),
+                # a pooled one is checked out and returned, others reopen.
+                connection.close_if_unusable_or_obsolete()
+                start = time.perf_counter()
+                connection.ensure_connection()
+                connect_ms.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+                query_ms.append((time.perf_counter() - start) * 1000)
+                connection.close_if_unusable_or_obsolete()
+        finally:
+            connection.close()
+            if getattr(connection, 'pool', None):
+                connection.close_pool()
+        return connect_ms, query_ms
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.core import datagen
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create synthetic users with interests, friendships, ratings and "
+        "notifications for load testing."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=datagen.DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        created = datagen.generate(
+            options['users'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} users ({datagen.generated_user_count()} generated in total). "
+            f"Password: {datagen.GENERATED_PASSWORD}"
+        ))
@@ -0,0 +1,85 @@
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config.startup import DEFERRED_MODULES, measure_cold_start
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot config.wsgi in a fresh interpreter under `python -X importtime`, "
+        "report the slowest imports, check that DEFERRED_MODULES stayed out "
+        "of startup, and time launch-to-first-response with and without FAST_START."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25)
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative')
+        parser.add_argument('--by-package', action='store_true',
+                            help="Aggregate self time by top-level package instead of listing modules.")
+        parser.add_argument('--path', default='/login/', help="Path requested for the first-response timing.")
+        parser.add_argument('--runs', type=int, default=3, help="Cold starts per mode (median is reported).")
+
+    def handle(self, *args, **options):
+        modules = self._import_times()
+        total_ms = sum(self_us for self_us, _ in modules.values()) / 1000
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Imports: {len(modules)} modules, {total_ms:.0f} ms"))
+
+        if options['by_package']:
+            packages = {}
+            for name, (self_us, _) in modules.items():
+                top = name.split('.')[0]
+                packages[top] = packages.get(top, 0) + self_us
+            rows = sorted(packages.items(), key=lambda item: -item[1])[:options['top']]
+            for name, self_us in rows:
+                self.stdout.write(f"  {self_us / 1000:8.1f} ms  {name}")
+        else:
+            column = 0 if options['sort'] == 'self' else 1
+            rows = sorted(modules.items(), key=lambda item: -item[1][column])[:options['top']]
+            self.stdout.write("      self  cumulative  module")
+            for name, (self_us, cumulative_us) in rows:
+                self.stdout.write(f"  {self_us / 1000:8.1f} {cumulative_us / 1000:11.1f}  {name}")
+
+        leaked = sorted(
+            name for name in modules
+            if any(name == d or name.startswith(f'{d}.') for d in DEFERRED_MODULES)
+        )
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Time to first response"))
+        for fast_start in (False, True):
+            runs = sorted(
+                (measure_cold_start(options['path'], fast_start) for _ in range(options['runs'])),
+                key=lambda r: r['total_ms'],
+            )
+            median = runs[len(runs) // 2]
+            self.stdout.write(
+                f"  FAST_START={fast_start!s:<5}  total {median['total_ms']:7.1f} ms  "
+                f"(boot {median['boot_ms']:.1f} ms + first request {median['first_request_ms']:.1f} ms, "
+                f"{median['status']})"
+            )
+
+        if leaked:
+            raise CommandError(f"Deferred modules imported at startup: {', '.join(leaked)}")
+        self.stdout.write(self.style.SUCCESS("No deferred modules imported at startup."))
+
+    def _import_times(self):
+        env = dict(os.environ)
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import config.wsgi'],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+        )
+        if result.returncode:
+            raise CommandError(f"config.wsgi failed to import:\n{result.stderr[-2000:]}")
+        modules = {}
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_RE.match(line)
+            if match:
+                modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+        return modules
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core import retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Collapse repeated unread notifications and archive read ones older "
+        "than --days into NotificationArchive."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90)
+        parser.add_argument('--chunk-size', type=int, default=retention.ARCHIVE_CHUNK_SIZE)
+        parser.add_argument('--skip-collapse', action='store_true')
+        parser.add_argument('--skip-archive', action='store_true')
+
+    def handle(self, *args, **options):
+        if not options['skip_collapse']:
+            removed = retention.collapse_repeated()
+            self.stdout.write(f"Collapsed {removed} repeated notifications.")
+
+        if not options['skip_archive']:
+            cutoff = timezone.now() - timedelta(days=options['days'])
+            moved = retention.archive_read(cutoff, options['chunk_size'])
+            self.stdout.write(f"Archived {moved} read notifications older than {options['days']} days.")
+
+        self.stdout.write(self.style.SUCCESS("Notification retention complete."))
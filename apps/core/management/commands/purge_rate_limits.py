@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.ratelimit import DatabaseStore
+
+
+class Command(BaseCommand):
+    help = "Delete expired RateLimitCounter rows left behind by DatabaseStore."
+
+    def handle(self, *args, **options):
+        deleted = DatabaseStore.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired rate limit counters."))
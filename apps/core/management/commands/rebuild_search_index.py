@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.core import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild every user's SearchDocument. On PostgreSQL this also creates "
+        "the pg_trgm extension and the full-text / trigram GIN indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if search.setup_postgres():
+            self.stdout.write("PostgreSQL search indexes are in place.")
+        written = search.rebuild_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} search documents."))
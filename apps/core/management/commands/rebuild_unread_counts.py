@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+class Command(BaseCommand):
+    help = "Recompute User.unread_notification_count from NotificationRecord."
+
+    def handle(self, *args, **options):
+        from apps.accounts.models import User
+        from apps.core.models import NotificationRecord
+
+        unread = (
+            NotificationRecord.objects
+            .filter(recipient=OuterRef('pk'), is_read=False)
+            .order_by()
+            .values('recipient')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        updated = User.objects.update(
+            unread_notification_count=Coalesce(
+                Subquery(unread, output_field=IntegerField()), Value(0),
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt unread counts for {updated} users."))
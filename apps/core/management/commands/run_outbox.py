@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core import outbox
+from apps.core.services import services
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails and notifications and render avatar thumbnails from the outbox table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--idle-sleep', type=float, default=2.0,
+                            help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain what is currently due, then exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        try:
+            while True:
+                delivered, retried, failed = outbox.process_batch(batch_size)
+                if delivered or retried or failed:
+                    self.stdout.write(f"delivered={delivered} retried={retried} failed={failed}")
+                if delivered + retried + failed < batch_size:
+                    # Don't hold an SMTP session open while there's nothing to send.
+                    services.email_delivery.close()
+                    if options['once']:
+                        break
+                    time.sleep(options['idle_sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping outbox worker.")
+        finally:
+            services.email_delivery.close()
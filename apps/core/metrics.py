@@ -0,0 +1,90 @@
+"""
+Per-request performance counters collected by RequestMetricsMiddleware.
+
+The middleware activates a RequestMetrics for the duration of a request;
+SQL is counted through a connection execute_wrapper, new database
+connections (or pool checkouts) are timed by apps/core/db_backends, and
+the app-level caches (reference data, match index, counts, access
+checks) report hits and misses with record_cache(). Outside a request
+every call is a no-op.
+"""
+
+import time
+from contextvars import ContextVar
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.started_at = time.perf_counter()
+        self.wall_seconds = None
+        self.view_name = None
+
+    def activate(self):
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current.reset(token)
+
+    def finish(self, view_name=None):
+        self.wall_seconds = time.perf_counter() - self.started_at
+        self.view_name = view_name
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - start
+
+    def as_dict(self) -> dict:
+        return {
+            'view': self.view_name,
+            'queries': self.queries,
+            'sql_ms': round(self.sql_seconds * 1000, 2),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'connects': self.connects,
+            'connect_ms': round(self.connect_seconds * 1000, 2),
+            'wall_ms': round((self.wall_seconds or 0) * 1000, 2),
+        }
+
+    def server_timing(self) -> str:
+        """Render as a Server-Timing header value (visible in browser devtools)."""
+        return ', '.join([
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.queries} queries"',
+            f'cache;desc="{self.cache_hits} hits, {self.cache_misses} misses"',
+            f'conn;dur={self.connect_seconds * 1000:.1f};desc="{self.connects} new"',
+            f'total;dur={(self.wall_seconds or 0) * 1000:.1f}',
+        ])
+
+
+def current():
+    return _current.get()
+
+
+def record_cache(hit: bool):
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+def record_connection(seconds: float):
+    metrics = _current.get()
+    if metrics is None:
+        return
+    metrics.connects += 1
+    metrics.connect_seconds += seconds
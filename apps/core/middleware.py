@@ -0,0 +1,58 @@
+import json
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from apps.core.metrics import RequestMetrics
+
+logger = logging.getLogger(__name__)
+
+
+def query_budget(method, view_name):
+    """Look up settings.QUERY_BUDGETS, preferring a 'METHOD view' entry over 'view'."""
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return budgets.get(f'{method} {view_name}', budgets.get(view_name))
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, SQL time, app-cache hits/misses and wall time for
+    every request, tagged with the resolved URL name (e.g.
+    'accounts:dashboard'). Each request emits one JSON log line and a
+    Server-Timing header, and is checked against settings.QUERY_BUDGETS.
+
+    Keep this first in MIDDLEWARE so session/auth queries are counted too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = metrics.activate()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.sql_wrapper))
+                response = self.get_response(request)
+        finally:
+            RequestMetrics.deactivate(token)
+
+        match = getattr(request, 'resolver_match', None)
+        metrics.finish(match.view_name if match else None)
+
+        response['Server-Timing'] = metrics.server_timing()
+        # Exposed for apps.core.testing.QueryBudgetMixin.
+        response.request_metrics = metrics
+        response.request_method = request.method
+
+        data = metrics.as_dict()
+        data.update(method=request.method, path=request.path, status=response.status_code)
+        logger.info(json.dumps(data))
+
+        budget = query_budget(request.method, metrics.view_name)
+        if budget is not None and metrics.queries > budget:
+            logger.warning(f"{metrics.view_name} ran {metrics.queries} queries (budget {budget})")
+        return response
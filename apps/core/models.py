@@ -1,5 +1,6 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 
 class City(models.Model):
@@ -23,7 +24,11 @@ class Neighborhood(models.Model):
         ordering = ['area_name']
 
     def __str__(self):
-        return f'{self.area_name} ({self.city.city_name})'
+        # Resolve the city through the reference cache so listing every
+        # neighborhood (form selects, admin) isn't one query per row.
+        from apps.core import reference
+        city = reference.city(self.city_id) or self.city
+        return f'{self.area_name} ({city.city_name})'
 
 
 class Interest(models.Model):
@@ -37,6 +42,27 @@ class Interest(models.Model):
         return self.interest_name
 
 
+class NotificationRecordManager(models.Manager):
+    """
+    Read-state changes go through here so each recipient's
+    unread_notification_count moves in the same transaction as the rows.
+    """
+
+    def mark_read(self, recipient, ids) -> int:
+        from apps.core.notifications import adjust_unread_counts
+        with transaction.atomic():
+            changed = self.filter(recipient=recipient, id__in=ids, is_read=False).update(is_read=True)
+            adjust_unread_counts({recipient.pk: -changed})
+        return changed
+
+    def mark_all_read(self, recipient) -> int:
+        from apps.core.notifications import adjust_unread_counts
+        with transaction.atomic():
+            changed = self.filter(recipient=recipient, is_read=False).update(is_read=True)
+            adjust_unread_counts({recipient.pk: -changed})
+        return changed
+
+
 class NotificationRecord(models.Model):
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -48,12 +74,129 @@ class NotificationRecord(models.Model):
     url = models.CharField(max_length=255, blank=True)
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Who triggered it (sender, acceptor, ...), used to collapse repeats.
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+    # How many original notifications this row stands for after collapsing.
+    group_count = models.PositiveIntegerField(default=1)
+
+    objects = NotificationRecordManager()
 
     class Meta:
-        ordering = ['-created_at']
+        # `id` breaks created_at ties so the ordering is a unique keyset
+        # key for get_keyset_page().
+        ordering = ['-created_at', '-id']
         indexes = [
             models.Index(fields=['recipient', 'is_read']),
+            # Serves the per-recipient newest-first list and keyset paging
+            # without a sort step.
+            models.Index(fields=['recipient', '-created_at'], name='core_notif_recipient_recent'),
+        ]
+
+    def __str__(self):
+        return f'{self.notif_type} -> {self.recipient}'
+
+
+class NotificationArchive(models.Model):
+    """
+    Cold storage for read notifications moved out of NotificationRecord by
+    `manage.py prune_notifications`. Rows are written in created_at order,
+    so the table can later be range-partitioned by created_at without
+    changing the archiver.
+    """
+    original_id = models.BigIntegerField()
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_notifications',
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+    )
+    notif_type = models.CharField(max_length=50)
+    message = models.TextField()
+    url = models.CharField(max_length=255, blank=True)
+    group_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'{self.notif_type} -> {self.recipient} (archived)'
+
+
+class RateLimitCounter(models.Model):
+    """Shared counter row for apps.core.ratelimit.DatabaseStore."""
+    key = models.CharField(max_length=200, unique=True)
+    count = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f'{self.key} = {self.count}'
+
+
+class OutboxMessage(models.Model):
+    """
+    Durable queue of side effects (emails, notification writes) that request
+    handlers enqueue and `manage.py run_outbox` delivers. Delivered rows are
+    deleted; rows that exhaust their retries stay behind as 'failed'.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [(STATUS_PENDING, 'Pending'), (STATUS_FAILED, 'Failed')]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['available_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk} ({self.status})'
+
+
+class SearchDocument(models.Model):
+    """
+    One user's searchable text, denormalized by apps/core/search.py from
+    their username, bio, neighborhood and interests. `name` is the
+    lowercased username for prefix autocomplete. On PostgreSQL,
+    `manage.py rebuild_search_index` adds the full-text and trigram GIN
+    indexes the search backend relies on.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+    )
+    city = models.ForeignKey(City, null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    name = models.TextField()
+    document = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['city', 'name']),
         ]
 
     def __str__(self):
-        return f'{self.notif_type} -> {self.recipient}'
\ No newline at end of file
+        return f'Search document for {self.name}'
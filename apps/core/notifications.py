@@ -6,9 +6,17 @@ Views never build NotificationRecord objects directly — they declare
 intent via NotificationFactory.create(type, context) and call .save() on
 the result. Adding a new notification type means adding one enum member
 and one builder method here; no call sites change.
+
+Fan-out to many recipients (e.g. EVENT_CREATED for every group member)
+goes through NotificationFactory.create_many(type, contexts), whose batch
+.save() writes chunked bulk INSERTs instead of one INSERT per recipient.
 """
 
+from collections import Counter
 from enum import Enum
+from itertools import islice
+
+NOTIFICATION_BATCH_SIZE = 500
 
 
 class NotificationType(Enum):
@@ -19,25 +27,125 @@ class NotificationType(Enum):
 
 
 class Notification:
-    def __init__(self, recipient, notif_type: NotificationType, message: str, url: str = ""):
+    def __init__(self, recipient, notif_type: NotificationType, message: str, url: str = "", actor=None):
         self.recipient = recipient
         self.notif_type = notif_type
         self.message = message
         self.url = url
+        self.actor = actor
 
     def save(self):
-        from apps.core.models import NotificationRecord
-        NotificationRecord.objects.create(
-            recipient=self.recipient,
-            notif_type=self.notif_type.value,
-            message=self.message,
-            url=self.url,
+        from apps.core import outbox
+        if outbox.is_enabled():
+            outbox.enqueue('notifications', {'records': [self.to_dict()]})
+            return
+        write_notification_records([self.to_dict()])
+
+    def to_dict(self) -> dict:
+        return {
+            'recipient_id': self.recipient.pk,
+            'notif_type': self.notif_type.value,
+            'message': self.message,
+            'url': self.url,
+            'actor_id': self.actor.pk if self.actor is not None else None,
+        }
+
+
+def write_notification_records(records, batch_size=NOTIFICATION_BATCH_SIZE):
+    """
+    Bulk-insert NotificationRecords from Notification.to_dict() rows and
+    bump each recipient's unread counter in the same transaction.
+    """
+    from django.db import transaction
+
+    from apps.core.models import NotificationRecord
+    with transaction.atomic():
+        NotificationRecord.objects.bulk_create(
+            [NotificationRecord(**record) for record in records],
+            batch_size=batch_size,
         )
+        adjust_unread_counts(Counter(record['recipient_id'] for record in records))
+
+
+def adjust_unread_counts(deltas):
+    """
+    Apply {user_id: delta} to User.unread_notification_count with one
+    UPDATE per distinct delta (a fan-out is usually +1 for everyone).
+    Counts are clamped at zero; `rebuild_unread_counts` fixes any drift.
+    The recipients' identity snapshots are dropped so their badges move.
+    """
+    from django.db.models import F, Value
+    from django.db.models.functions import Greatest
+
+    from apps.accounts import identity
+    from apps.accounts.models import User
+
+    by_delta = {}
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(user_id)
+    for delta, user_ids in by_delta.items():
+        User.objects.filter(pk__in=user_ids).update(
+            unread_notification_count=Greatest(F('unread_notification_count') + delta, Value(0)),
+        )
+        identity.forget(*user_ids)
+
+
+class NotificationBatch:
+    """A group of Notifications saved together with chunked bulk_create."""
+
+    def __init__(self, notifications):
+        self.notifications = notifications
+
+    def __len__(self):
+        return len(self.notifications)
+
+    def __iter__(self):
+        return iter(self.notifications)
+
+    def save(self, batch_size=NOTIFICATION_BATCH_SIZE) -> int:
+        from apps.core import outbox
+
+        saved = 0
+        remaining = iter(self.notifications)
+        while chunk := [n.to_dict() for n in islice(remaining, batch_size)]:
+            if outbox.is_enabled():
+                outbox.enqueue('notifications', {'records': chunk})
+            else:
+                write_notification_records(chunk, batch_size)
+            saved += len(chunk)
+        return saved
+
+
+def _render_key(value):
+    """Identify a context value by what it is, not where it lives in memory."""
+    from django.db.models import Model
+
+    if isinstance(value, Model) and value.pk is not None:
+        return (value._meta.label_lower, value.pk)
+    try:
+        hash(value)
+    except TypeError:  # includes unsaved model instances
+        return ('object', id(value))
+    return ('value', value)
 
 
 class NotificationFactory:
     """Creates the correct Notification for a given type and context dict."""
 
+    # Types whose repeated unread notifications from one actor are folded
+    # into a single summary by `manage.py prune_notifications`.
+    COLLAPSED_MESSAGES = {
+        NotificationType.NEW_MESSAGE: "{count} new messages from {actor}.",
+    }
+
+    @staticmethod
+    def collapsed_message(notif_type: NotificationType, count: int, actor_name: str) -> str:
+        template = NotificationFactory.COLLAPSED_MESSAGES.get(notif_type)
+        if not template:
+            raise ValueError(f"Notification type is not collapsible: {notif_type}")
+        return template.format(count=count, actor=actor_name)
+
     @staticmethod
     def create(notif_type: NotificationType, context: dict) -> Notification:
         builders = {
@@ -51,6 +159,33 @@ class NotificationFactory:
             raise ValueError(f"No builder registered for: {notif_type}")
         return builder(context)
 
+    @staticmethod
+    def create_many(notif_type: NotificationType, contexts) -> NotificationBatch:
+        """
+        Build one Notification per context. Builders only interpolate the
+        non-recipient parts of the context, so contexts that share those
+        objects (every member of one group for one event) reuse a single
+        rendered message and url instead of formatting it per recipient.
+        """
+        rendered = {}
+        notifications = []
+        for ctx in contexts:
+            key = tuple(sorted((k, _render_key(v)) for k, v in ctx.items() if k != 'recipient'))
+            entry = rendered.get(key)
+            if entry is None:
+                # The context is kept alive with its rendering, so an
+                # id()-based key can't be reused by a later object.
+                entry = rendered[key] = (NotificationFactory.create(notif_type, ctx), ctx)
+            template = entry[0]
+            notifications.append(Notification(
+                recipient=ctx['recipient'],
+                notif_type=template.notif_type,
+                message=template.message,
+                url=template.url,
+                actor=template.actor,
+            ))
+        return NotificationBatch(notifications)
+
     @staticmethod
     def _friend_request(ctx) -> Notification:
         return Notification(
@@ -58,6 +193,7 @@ class NotificationFactory:
             notif_type=NotificationType.FRIEND_REQUEST,
             message=f"{ctx['sender'].username} sent you a friend request.",
             url="/social/requests/",
+            actor=ctx['sender'],
         )
 
     @staticmethod
@@ -67,6 +203,7 @@ class NotificationFactory:
             notif_type=NotificationType.REQUEST_ACCEPTED,
             message=f"{ctx['acceptor'].username} accepted your friend request.",
             url="/social/friends/",
+            actor=ctx['acceptor'],
         )
 
     @staticmethod
@@ -76,6 +213,7 @@ class NotificationFactory:
             notif_type=NotificationType.NEW_MESSAGE,
             message=f"New message from {ctx['sender'].username}.",
             url=f"/messaging/{ctx['sender'].id}/",
+            actor=ctx['sender'],
         )
 
     @staticmethod
@@ -93,4 +231,10 @@ class NotificationFactory:
 #       'recipient': receiver,
 #       'sender': request.user,
 #   })
-#   notif.save()
\ No newline at end of file
+#   notif.save()
+#
+#   batch = NotificationFactory.create_many(NotificationType.EVENT_CREATED, [
+#       {'recipient': member, 'event': event, 'group': group}
+#       for member in group_members
+#   ])
+#   batch.save()
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+Transactional outbox for work that should not run inside a request.
+
+Request handlers call enqueue(kind, payload), which is a single INSERT into
+OutboxMessage (and so commits or rolls back with the rest of the request).
+`manage.py run_outbox` drains the table in batches: each kind has a handler
+registered below that receives a list of payloads and returns one result
+per payload — None for success, or an error string to retry with backoff.
+A handler that partly succeeded may trim a payload in place to what is
+left; the trimmed payload is what gets retried.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+# How long a claimed row stays invisible to other workers while it is
+# being processed. A worker that dies mid-batch releases its rows after this.
+CLAIM_LEASE_SECONDS = 5 * 60
+
+_HANDLERS = {}
+
+
+def is_enabled() -> bool:
+    return getattr(settings, 'OUTBOX_ENABLED', False)
+
+
+def register(kind):
+    """Register `func(payloads) -> list[str | None]` as the handler for `kind`."""
+    def decorator(func):
+        _HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind: str, payload: dict, delay_seconds: int = 0):
+    from apps.core.models import OutboxMessage
+    return OutboxMessage.objects.create(
+        kind=kind,
+        payload=payload,
+        available_at=timezone.now() + timedelta(seconds=delay_seconds),
+    )
+
+
+def backoff_seconds(attempts: int) -> int:
+    return min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+
+
+def _claim(batch_size):
+    from apps.core.models import OutboxMessage
+
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=OutboxMessage.STATUS_PENDING, available_at__lte=now)
+            .order_by('available_at', 'id')[:batch_size]
+        )
+        if messages:
+            OutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(
+                attempts=F('attempts') + 1,
+                available_at=now + timedelta(seconds=CLAIM_LEASE_SECONDS),
+            )
+            for message in messages:
+                message.attempts += 1
+    return messages
+
+
+def process_batch(batch_size=50):
+    """
+    Claim up to `batch_size` due messages, run their handlers grouped by
+    kind, and return (delivered, retried, failed) counts.
+    """
+    from apps.core.models import OutboxMessage
+
+    messages = _claim(batch_size)
+    by_kind = {}
+    for message in messages:
+        by_kind.setdefault(message.kind, []).append(message)
+
+    delivered, retried, failed = [], [], []
+    for kind, group in by_kind.items():
+        handler = _HANDLERS.get(kind)
+        if handler is None:
+            results = [f"No handler registered for: {kind}"] * len(group)
+        else:
+            try:
+                results = handler([m.payload for m in group])
+            except Exception as e:
+                logger.exception(f"Outbox handler for {kind} crashed")
+                results = [str(e)] * len(group)
+
+        for message, error in zip(group, results):
+            if error is None:
+                delivered.append(message.pk)
+                continue
+            message.last_error = error
+            if message.attempts >= MAX_ATTEMPTS:
+                message.status = OutboxMessage.STATUS_FAILED
+                failed.append(message)
+                logger.error(f"Outbox {message} gave up after {message.attempts} attempts: {error}")
+            else:
+                message.available_at = timezone.now() + timedelta(seconds=backoff_seconds(message.attempts))
+                retried.append(message)
+
+    OutboxMessage.objects.filter(pk__in=delivered).delete()
+    if retried or failed:
+        # payload too: a handler may have trimmed it to the part still to retry.
+        OutboxMessage.objects.bulk_update(retried + failed, ['status', 'last_error', 'available_at', 'payload'])
+    return len(delivered), len(retried), len(failed)
+
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+
+@register('email')
+def deliver_emails(payloads):
+    from apps.core.email_service import OutgoingEmail
+    from apps.core.services import services
+
+    messages = [OutgoingEmail(p['to'], p['subject'], p['body']) for p in payloads]
+    return [
+        None if ok else f"Email send failed to {m.to}"
+        for m, ok in zip(messages, services.email_delivery.send_many(messages))
+    ]
+
+
+@register('notifications')
+def deliver_notifications(payloads):
+    results = []
+    for p in payloads:
+        try:
+            with transaction.atomic():
+                _write_notifications(p['records'])
+        except Exception:
+            # One bad record (e.g. a recipient deleted since it was queued)
+            # must not hold back the rest of its chunk: write them one by
+            # one and keep only the failures in the message for the retry.
+            failed = _write_notifications_individually(p['records'])
+            p['records'] = [record for record, _ in failed]
+            results.append(
+                f"{len(failed)} notification record(s) failed: {failed[0][1]}" if failed else None
+            )
+        else:
+            results.append(None)
+    return results
+
+
+def _write_notifications(records):
+    from apps.core.notifications import write_notification_records
+    write_notification_records(records)
+
+
+def _write_notifications_individually(records):
+    failed = []
+    for record in records:
+        try:
+            with transaction.atomic():
+                _write_notifications([record])
+        except Exception as e:
+            failed.append((record, str(e)))
+    return failed
+
+
+@register('avatar_thumbnails')
+def render_avatar_thumbnails(payloads):
+    from apps.accounts import avatars
+
+    results = []
+    for p in payloads:
+        try:
+            avatars.generate(p['user_id'])
+        except Exception as e:
+            results.append(str(e))
+        else:
+            results.append(None)
+    return results
@@ -1,4 +1,9 @@
-def get_page_range(paginator, page, window=2):
+from datetime import datetime
+
+from django.db.models import QuerySet
+
+
+def get_page_range(paginator, page, window=2, counter=None, scope=None):
     """
     Safely resolve a page number against `paginator` and return
     (page_obj, page_range).
@@ -14,9 +19,30 @@ def get_page_range(paginator, page, window=2):
     `None` is used as an ellipsis marker for gaps, e.g.:
         [1, None, 4, 5, 6, None, 10]
 
+    `counter` optionally swaps Paginator's exact COUNT for a strategy
+    from apps.core.counting (cached and/or estimated); `scope` is passed
+    through to it, typically request.user.id. It only applies to
+    querysets: a list is already in memory, so len() is used as usual.
+
+    A cached or estimated count can be wrong in either direction. An
+    overestimate makes the last pages come back short or empty. An
+    underestimate is worse: num_pages is too small, so real rows past it
+    are unreachable (later page numbers clamp to the last counted page)
+    until the cache expires or the planner's statistics catch up. Only
+    use a non-exact counter where that is acceptable, e.g. very large
+    lists whose tail nobody pages to.
+
     Usage in a view:
         page_obj, page_range = get_page_range(paginator, request.GET.get('page', 1))
+        page_obj, page_range = get_page_range(
+            paginator, request.GET.get('page', 1),
+            counter=CachedCount(EstimatedCount()), scope=request.user.id,
+        )
     """
+    if counter is not None and isinstance(paginator.object_list, QuerySet):
+        # Paginator.count is a cached_property — seeding it skips the COUNT.
+        paginator.__dict__['count'] = counter.count(paginator.object_list, scope)
+
     try:
         page_number = int(page)
     except (TypeError, ValueError):
@@ -39,4 +65,165 @@ def get_page_range(paginator, page, window=2):
     if end < total:
         page_range = page_range + ([None, total] if end < total - 1 else [total])
 
-    return page_obj, page_range
\ No newline at end of file
+    return page_obj, page_range
+
+# ---------------------------------------------------------------------------
+# Keyset (seek) pagination
+#
+# OFFSET paging gets linearly slower on deep pages and needs a full COUNT
+# for num_pages. Keyset paging instead remembers the sort key of the last
+# row shown and asks for rows strictly after it, so every page costs the
+# same and counting is optional.
+# ---------------------------------------------------------------------------
+
+_CURSOR_SALT = 'apps.core.pagination.keyset'
+
+
+class KeysetPage:
+    """One page of keyset results plus opaque cursors to its neighbours."""
+
+    def __init__(self, object_list, next_cursor=None, prev_cursor=None, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.count = count  # None unless the caller asked for a count
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def encode_cursor(values, direction='next'):
+    """Pack a sort key into a signed, URL-safe cursor string."""
+    from django.core import signing
+
+    packed = [{'dt': v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return signing.dumps({'d': direction, 'k': packed}, salt=_CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor):
+    """
+    Return (direction, values) for a cursor from encode_cursor(), or
+    (None, None) for a missing, tampered or malformed one — like
+    get_page_range, a bad cursor falls back to the first page.
+    """
+    from django.core import signing
+    from django.utils.dateparse import parse_datetime
+
+    if not cursor:
+        return None, None
+    try:
+        data = signing.loads(cursor, salt=_CURSOR_SALT)
+        direction, packed = data['d'], data['k']
+    except (signing.BadSignature, KeyError, TypeError):
+        return None, None
+    if direction not in ('next', 'prev') or not isinstance(packed, list):
+        return None, None
+    values = [parse_datetime(v['dt']) if isinstance(v, dict) else v for v in packed]
+    return direction, values
+
+
+def _seek_filter(ordering, values, reverse=False):
+    """
+    Build the lexicographic "row comes after `values`" filter for `ordering`,
+    e.g. for ('-created_at', '-id'):
+        created_at < v0 OR (created_at = v0 AND id < v1)
+    """
+    from django.db.models import Q
+
+    condition = Q()
+    equal_so_far = Q()
+    for field, value in zip(ordering, values):
+        descending = field.startswith('-')
+        name = field.lstrip('-')
+        lookup = 'lt' if descending != reverse else 'gt'
+        condition |= equal_so_far & Q(**{f'{name}__{lookup}': value})
+        equal_so_far &= Q(**{name: value})
+    return condition
+
+
+def _reverse_ordering(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def _key_of(obj, ordering):
+    return [getattr(obj, field.lstrip('-')) for field in ordering]
+
+
+def _count(queryset, with_count, scope=None):
+    if not with_count:
+        return None
+    if with_count is True:
+        return queryset.count()
+    return with_count.count(queryset, scope)
+
+
+def build_keyset_page(rows, per_page, direction, key, had_cursor, count=None):
+    """
+    Shared tail of every keyset query. `rows` holds up to per_page + 1 items
+    fetched in *travel* order (reversed for 'prev'); `key(row)` returns the
+    row's sort key.
+    """
+    has_more = len(rows) > per_page
+    rows = list(rows[:per_page])
+    if direction == 'prev':
+        rows.reverse()
+
+    if direction == 'prev':
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, had_cursor
+
+    next_cursor = encode_cursor(key(rows[-1]), 'next') if rows and has_next else None
+    prev_cursor = encode_cursor(key(rows[0]), 'prev') if rows and has_prev else None
+    return KeysetPage(rows, next_cursor, prev_cursor, count)
+
+
+def get_keyset_page(queryset, cursor=None, per_page=10, ordering=None, with_count=False, scope=None):
+    """
+    Return a KeysetPage of `queryset` starting at `cursor`.
+
+    `ordering` is the unique sort key to seek on (e.g. ['-created_at', '-id'])
+    and defaults to the queryset's own ordering. The last field must make
+    the key unique or rows sharing a key across a page boundary are
+    skipped. `cursor` is the raw value from request.GET.get('cursor') —
+    next_cursor / prev_cursor on the returned page are what templates link
+    to. No COUNT query runs unless `with_count` is set: True means an
+    exact COUNT, or pass a strategy from apps.core.counting (with `scope`)
+    for a cached or estimated one.
+
+    Usage in a view:
+        page = get_keyset_page(request.user.notifications.all(), request.GET.get('cursor'))
+    """
+    ordering = list(ordering or queryset.query.order_by or queryset.model._meta.ordering)
+    direction, values = decode_cursor(cursor)
+    if values is not None and len(values) != len(ordering):
+        direction, values = None, None
+
+    count = _count(queryset, with_count, scope)
+
+    if direction == 'prev':
+        queryset = queryset.filter(_seek_filter(ordering, values, reverse=True))
+        queryset = queryset.order_by(*_reverse_ordering(ordering))
+    else:
+        if values is not None:
+            queryset = queryset.filter(_seek_filter(ordering, values))
+        queryset = queryset.order_by(*ordering)
+
+    rows = list(queryset[:per_page + 1])
+    return build_keyset_page(
+        rows, per_page, direction or 'next',
+        key=lambda obj: _key_of(obj, ordering),
+        had_cursor=values is not None,
+        count=count,
+    )
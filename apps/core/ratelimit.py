@@ -0,0 +1,220 @@
+"""
+Rate limiting shared by every serverless instance.
+
+A RateLimiter counts hits per key with an approximate sliding window: it
+keeps one counter per fixed window and weights the previous window by how
+much of it still overlaps "the last `window_seconds`". Counters live in a
+pluggable store whose increment is atomic:
+
+  CacheStore     Django cache add() + incr(). Atomic on Redis/Memcached;
+                 per-process with the default LocMemCache.
+  DatabaseStore  RateLimitCounter rows updated with F() expressions, so
+                 every instance sees the same counts without Redis.
+
+The store is chosen by settings.RATE_LIMIT_STORE (a dotted path) unless a
+limiter is given one explicitly.
+"""
+
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+DEFAULT_STORE = 'apps.core.ratelimit.DatabaseStore'
+
+
+class RateLimitStore(ABC):
+    @abstractmethod
+    def incr(self, key: str, ttl: int) -> int:
+        """Atomically add one to `key` (created with `ttl` seconds to live) and return the new value."""
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> int:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+
+class CacheStore(RateLimitStore):
+    def __init__(self, alias='default'):
+        self._alias = alias
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+        return caches[self._alias]
+
+    def incr(self, key, ttl):
+        cache = self._cache
+        cache.add(key, 0, ttl)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr().
+            cache.add(key, 1, ttl)
+            return 1
+
+    def get(self, key):
+        return self._cache.get(key, 0)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+
+class DatabaseStore(RateLimitStore):
+    def incr(self, key, ttl):
+        from apps.core.models import RateLimitCounter
+
+        now = timezone.now()
+        live = RateLimitCounter.objects.filter(key=key, expires_at__gt=now)
+        for _ in range(2):
+            with transaction.atomic():
+                if live.update(count=F('count') + 1):
+                    return live.values_list('count', flat=True).first() or 1
+                RateLimitCounter.objects.filter(key=key, expires_at__lte=now).delete()
+                try:
+                    with transaction.atomic():
+                        RateLimitCounter.objects.create(
+                            key=key, count=1, expires_at=now + timedelta(seconds=ttl),
+                        )
+                    return 1
+                except IntegrityError:
+                    pass  # another request created it first — increment that row
+        return self.get(key)
+
+    def get(self, key):
+        from apps.core.models import RateLimitCounter
+        count = (
+            RateLimitCounter.objects
+            .filter(key=key, expires_at__gt=timezone.now())
+            .values_list('count', flat=True)
+            .first()
+        )
+        return count or 0
+
+    def delete(self, key):
+        from apps.core.models import RateLimitCounter
+        RateLimitCounter.objects.filter(key=key).delete()
+
+    @staticmethod
+    def purge_expired() -> int:
+        from apps.core.models import RateLimitCounter
+        deleted, _ = RateLimitCounter.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+
+def get_default_store() -> RateLimitStore:
+    return import_string(getattr(settings, 'RATE_LIMIT_STORE', DEFAULT_STORE))()
+
+
+class RateLimiter:
+    """Approximate sliding-window limiter: at most `limit` hits per `window_seconds`."""
+
+    def __init__(self, name: str, limit: int, window_seconds: int, store: RateLimitStore = None):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._store = store
+
+    @property
+    def store(self) -> RateLimitStore:
+        if self._store is None:
+            self._store = get_default_store()
+        return self._store
+
+    def _window_key(self, key, window_index):
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return f'rl:{self.name}:{digest}:{window_index}'
+
+    def _windows(self, now=None):
+        now = time.time() if now is None else now
+        index = int(now // self.window_seconds)
+        elapsed = (now % self.window_seconds) / self.window_seconds
+        return index, elapsed
+
+    def _estimate(self, key, current):
+        index, elapsed = self._windows()
+        previous = self.store.get(self._window_key(key, index - 1))
+        return previous * (1 - elapsed) + current
+
+    def count(self, key: str) -> float:
+        index, _ = self._windows()
+        return self._estimate(key, self.store.get(self._window_key(key, index)))
+
+    def record(self, key: str) -> int:
+        """Count a hit without estimating the total; returns the current window's count."""
+        index, _ = self._windows()
+        # Each window's counter must outlive the following window, where
+        # it is still read as "previous".
+        return self.store.incr(self._window_key(key, index), 2 * self.window_seconds)
+
+    def hit(self, key: str) -> float:
+        return self._estimate(key, self.record(key))
+
+    def is_limited(self, key: str) -> bool:
+        return self.count(key) >= self.limit
+
+    def reset(self, key: str):
+        index, _ = self._windows()
+        self.store.delete(self._window_key(key, index))
+        self.store.delete(self._window_key(key, index - 1))
+
+
+def client_ip(request) -> str:
+    """
+    The client address as seen by the outermost of our own proxies.
+
+    Each proxy appends the address it received the request from to
+    X-Forwarded-For, so everything left of the last
+    RATE_LIMIT_TRUSTED_PROXIES entries was written by the client and can
+    be spoofed to dodge the limit. 0 ignores the header (no proxy in front).
+    """
+    trusted = getattr(settings, 'RATE_LIMIT_TRUSTED_PROXIES', 1)
+    hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+    if trusted <= 0 or not hops:
+        return request.META.get('REMOTE_ADDR', '')
+    return hops[-min(trusted, len(hops))]
+
+
+KEY_FUNCTIONS = {
+    'ip': client_ip,
+    'username': lambda request: request.POST.get('username', '').strip().lower(),
+}
+
+
+class RequestRateLimit:
+    """
+    Per-request view over one RateLimiter per key dimension ('ip',
+    'username', ...). rate_limited() attaches it to the request as
+    `request.rate_limit` so the view can record failures and successes.
+    """
+
+    def __init__(self, limiters, request):
+        self._entries = []
+        for dimension, limiter in limiters.items():
+            value = KEY_FUNCTIONS[dimension](request)
+            if value:
+                self._entries.append((dimension, limiter, value))
+
+    def is_limited(self) -> bool:
+        return any(limiter.is_limited(key) for _, limiter, key in self._entries)
+
+    def hit(self):
+        # The view already checked is_limited(), so skip re-reading the
+        # previous windows for an estimate nobody uses.
+        for _, limiter, key in self._entries:
+            limiter.record(key)
+
+    def reset(self, dimensions=None):
+        for dimension, limiter, key in self._entries:
+            if dimensions is None or dimension in dimensions:
+                limiter.reset(key)
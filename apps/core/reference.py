@@ -0,0 +1,168 @@
+"""
+In-process cache of the static reference tables: City, Neighborhood and
+Interest.
+
+These tables are fixture-loaded and almost never change, so each worker
+loads them once (three queries) and then answers lookups by primary key —
+city_code, postal_code, interest id — from memory. Every Neighborhood in
+the snapshot already has its City attached, so rendering one never
+touches the database.
+
+Freshness: admin edits fire signals (apps/core/signals.py) that call
+invalidate(), which drops this worker's snapshot and bumps a shared
+version number in the cache. Other workers compare that version at most
+every VERSION_CHECK_SECONDS, and reload unconditionally after
+MAX_AGE_SECONDS in case the cache isn't shared between them.
+"""
+
+import hashlib
+import json
+import threading
+import time
+
+from django.core.cache import cache
+
+from apps.core import metrics
+
+VERSION_KEY = 'refdata:version'
+VERSION_CHECK_SECONDS = 30
+MAX_AGE_SECONDS = 10 * 60
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+class ReferenceData:
+    """One immutable, fully-loaded copy of the reference tables."""
+
+    def __init__(self, version):
+        from apps.core.models import City, Interest, Neighborhood
+
+        self.version = version
+        self.loaded_at = self.checked_at = time.monotonic()
+
+        self.cities = {c.pk: c for c in City.objects.all()}
+        self.interests = {i.pk: i for i in Interest.objects.all()}
+        self.neighborhoods = {}
+        self.neighborhoods_by_city = {code: [] for code in self.cities}
+        for n in Neighborhood.objects.all():
+            n.city = self.cities[n.city_id]
+            self.neighborhoods[n.pk] = n
+            self.neighborhoods_by_city[n.city_id].append(n)
+
+        # Querysets come back in Meta.ordering; keep lists in that order too.
+        self.city_list = list(self.cities.values())
+        self.neighborhood_list = list(self.neighborhoods.values())
+        self.interest_list = list(self.interests.values())
+
+        # Serialized per-city neighborhood lists for the JSON endpoint,
+        # built on first request and dropped with the snapshot.
+        self._neighborhood_payloads = {}
+
+    def neighborhood_payload(self, city_code):
+        """Return (json_bytes, etag) for one city's neighborhoods, or None for an unknown city."""
+        if city_code not in self.cities:
+            return None
+        payload = self._neighborhood_payloads.get(city_code)
+        if payload is None:
+            body = json.dumps({
+                'city': city_code,
+                'neighborhoods': [
+                    {'postal_code': n.pk, 'area_name': n.area_name}
+                    for n in self.neighborhoods_by_city[city_code]
+                ],
+            }, separators=(',', ':')).encode()
+            payload = self._neighborhood_payloads[city_code] = (body, hashlib.sha1(body).hexdigest())
+        return payload
+
+
+def _current_version():
+    return cache.get(VERSION_KEY, 0)
+
+
+def _is_stale(snapshot):
+    now = time.monotonic()
+    if now - snapshot.loaded_at > MAX_AGE_SECONDS:
+        return True
+    if now - snapshot.checked_at > VERSION_CHECK_SECONDS:
+        snapshot.checked_at = now
+        return _current_version() != snapshot.version
+    return False
+
+
+def get() -> ReferenceData:
+    """Return this worker's snapshot, (re)loading it when stale."""
+    global _snapshot
+    snapshot = _snapshot
+    stale = snapshot is None or _is_stale(snapshot)
+    metrics.record_cache(hit=not stale)
+    if stale:
+        with _lock:
+            # Another thread may have reloaded while we waited.
+            if _snapshot is None or _snapshot is snapshot:
+                _snapshot = ReferenceData(_current_version())
+            snapshot = _snapshot
+    return snapshot
+
+
+def invalidate():
+    """Drop this worker's snapshot and tell the others to reload theirs."""
+    global _snapshot
+    _snapshot = None
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+# ---------------------------------------------------------------------------
+# Lookups
+# ---------------------------------------------------------------------------
+
+def cities():
+    return get().city_list
+
+
+def city(city_code):
+    return get().cities.get(_as_int(city_code))
+
+
+def neighborhoods(city_code=None):
+    data = get()
+    if city_code is None:
+        return data.neighborhood_list
+    return data.neighborhoods_by_city.get(_as_int(city_code), [])
+
+
+def neighborhood(postal_code):
+    return get().neighborhoods.get(_as_int(postal_code))
+
+
+def neighborhood_payload(city_code):
+    return get().neighborhood_payload(_as_int(city_code))
+
+
+def interests():
+    return get().interest_list
+
+
+def interest(interest_id):
+    return get().interests.get(_as_int(interest_id))
+
+
+def attach(users):
+    """Fill each user's city/neighborhood from the snapshot instead of lazy FK queries."""
+    data = get()
+    for user in users:
+        if user.city_id is not None and user.city_id in data.cities:
+            user.city = data.cities[user.city_id]
+        if user.neighborhood_id is not None and user.neighborhood_id in data.neighborhoods:
+            user.neighborhood = data.neighborhoods[user.neighborhood_id]
+    return users
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,91 @@
+"""
+Retention for NotificationRecord, driven by `manage.py prune_notifications`.
+
+Two passes keep the hot table small:
+
+  collapse_repeated()  folds runs of unread, same-type notifications from
+                       one actor into the newest row ("5 new messages
+                       from X"), for the types in
+                       NotificationFactory.COLLAPSED_MESSAGES.
+  archive_read()       moves read notifications older than a cutoff into
+                       NotificationArchive, oldest first, one chunk per
+                       transaction so locks and memory stay bounded.
+"""
+
+from django.db import transaction
+from django.db.models import Count
+
+from apps.core.models import NotificationArchive, NotificationRecord
+from apps.core.notifications import NotificationFactory, NotificationType
+
+ARCHIVE_CHUNK_SIZE = 1000
+
+
+def collapse_repeated() -> int:
+    """Collapse repeated unread notifications; return how many rows were removed."""
+    collapsible = [t.value for t in NotificationFactory.COLLAPSED_MESSAGES]
+    groups = (
+        NotificationRecord.objects
+        .filter(is_read=False, notif_type__in=collapsible, actor__isnull=False)
+        .order_by()
+        .values('recipient_id', 'notif_type', 'actor_id', 'actor__username')
+        .annotate(rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    return sum(
+        collapse_group(g['recipient_id'], g['notif_type'], g['actor_id'], g['actor__username'])
+        for g in list(groups)
+    )
+
+
+def collapse_group(recipient_id, notif_type, actor_id, actor_username) -> int:
+    """
+    Fold one recipient's unread `notif_type` rows from one actor into the
+    newest; return how many rows were removed. The rows are locked and
+    re-read here, since the recipient may have read some (or a new one
+    arrived) after collapse_repeated() grouped them.
+    """
+    with transaction.atomic():
+        rows = list(
+            NotificationRecord.objects
+            .select_for_update()
+            .filter(is_read=False, recipient_id=recipient_id, notif_type=notif_type, actor_id=actor_id)
+            .order_by('-created_at', '-id')
+            .values_list('id', 'group_count')
+        )
+        if len(rows) < 2:
+            return 0
+        total = sum(group_count for _, group_count in rows)
+        keep, rest = rows[0][0], [pk for pk, _ in rows[1:]]
+        NotificationRecord.objects.filter(pk=keep).update(
+            group_count=total,
+            message=NotificationFactory.collapsed_message(NotificationType(notif_type), total, actor_username),
+        )
+        # Deleted rows are unread, so the post_delete signal drops them
+        # from the recipient's unread counter.
+        NotificationRecord.objects.filter(pk__in=rest).delete()
+    return len(rest)
+
+
+def archive_read(older_than, chunk_size=ARCHIVE_CHUNK_SIZE) -> int:
+    """Move read notifications created before `older_than` into NotificationArchive."""
+    fields = ('id', 'recipient_id', 'actor_id', 'notif_type', 'message', 'url', 'group_count', 'created_at')
+    candidates = (
+        NotificationRecord.objects
+        .filter(is_read=True, created_at__lt=older_than)
+        .order_by('created_at', 'id')
+    )
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(candidates.values(*fields)[:chunk_size])
+            if not rows:
+                break
+            ids = [row.pop('id') for row in rows]
+            NotificationArchive.objects.bulk_create([
+                NotificationArchive(original_id=pk, **row) for pk, row in zip(ids, rows)
+            ])
+            NotificationRecord.objects.filter(pk__in=ids).delete()
+        moved += len(rows)
+    return moved
@@ -0,0 +1,378 @@
+"""
+Design Pattern — Strategy Pattern
+Applied to: user search.
+
+Search runs over SearchDocument, one row per user holding their
+username, bio, neighborhood and interest names as normalized text. Two
+interchangeable backends answer the same two questions, full-text
+search and username autocomplete, so views don't care which database
+is underneath:
+
+    PostgresSearchBackend   to_tsvector/to_tsquery over GIN indexes, with
+                            pg_trgm similarity on the username as a
+                            ranking boost
+    PythonSearchBackend     an in-process inverted index built from
+                            SearchDocument — the SQLite / local fallback
+
+Every query token is matched as a prefix ("mus" finds "music"), results
+can be scoped to one city, and search() returns a KeysetPage ordered by
+(-rank, user_id) so paging is cursor-based like the rest of the app.
+
+SearchDocument rows are kept current by apps/accounts/signals.py through
+index_user(); `manage.py rebuild_search_index` rebuilds all of them and
+creates the PostgreSQL indexes. The Python index follows the same
+version-check scheme as reference.py, so it can lag writes made by other
+workers by up to VERSION_CHECK_SECONDS.
+"""
+
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from apps.core import metrics, reference
+from apps.core.pagination import KeysetPage, build_keyset_page, decode_cursor, get_keyset_page
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+MAX_QUERY_TOKENS = 8
+DEFAULT_PER_PAGE = 20
+AUTOCOMPLETE_LIMIT = 10
+
+VERSION_KEY = 'search:version'
+VERSION_CHECK_SECONDS = 30
+MAX_AGE_SECONDS = 10 * 60
+
+# Created by `manage.py rebuild_search_index` on PostgreSQL. The full-text
+# expression must match _TSVECTOR below exactly for the planner to use it.
+POSTGRES_SETUP_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX IF NOT EXISTS core_search_document_fts ON core_searchdocument "
+    "USING gin (to_tsvector('simple', document))",
+    'CREATE INDEX IF NOT EXISTS core_search_name_trgm ON core_searchdocument '
+    'USING gin (name gin_trgm_ops)',
+]
+_TSVECTOR = "to_tsvector('simple', document)"
+_TSQUERY = "to_tsquery('simple', %s)"
+
+
+def tokenize(text) -> list:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+# ---------------------------------------------------------------------------
+# Documents
+# ---------------------------------------------------------------------------
+
+def build_document(user):
+    """Return an unsaved SearchDocument for `user`."""
+    from apps.accounts.match_index import interest_ids
+    from apps.core.models import SearchDocument
+
+    parts = [user.username, user.bio]
+    neighborhood = reference.neighborhood(user.neighborhood_id)
+    if neighborhood is not None:
+        parts.append(neighborhood.area_name)
+    for interest_id in interest_ids(user.interest_mask):
+        interest = reference.interest(interest_id)
+        if interest is not None:
+            parts.append(interest.interest_name)
+
+    return SearchDocument(
+        user_id=user.pk,
+        city_id=user.city_id,
+        name=user.username.lower(),
+        document=' '.join(tokenize(' '.join(parts))),
+    )
+
+
+def _upsert(documents):
+    from apps.core.models import SearchDocument
+
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['city', 'name', 'document', 'updated_at'],
+    )
+
+
+def index_user(user, created=False):
+    """Write `user`'s SearchDocument and tell every worker's Python index to reload."""
+    # A plain save() is one statement (UPDATE, or INSERT for a new user);
+    # the bulk upsert would wrap it in its own transaction.
+    build_document(user).save(force_insert=created)
+    invalidate()
+
+
+def rebuild_all(batch_size=2000) -> int:
+    from django.contrib.auth import get_user_model
+
+    users = get_user_model().objects.only(
+        'id', 'username', 'bio', 'city_id', 'neighborhood_id', 'interest_mask',
+    ).order_by('pk')
+    written, batch = 0, []
+    for user in users.iterator(chunk_size=batch_size):
+        batch.append(build_document(user))
+        if len(batch) >= batch_size:
+            _upsert(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        _upsert(batch)
+        written += len(batch)
+    invalidate()
+    return written
+
+
+def setup_postgres():
+    """Create the pg_trgm extension and GIN indexes. No-op on other databases."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        for statement in POSTGRES_SETUP_SQL:
+            cursor.execute(statement)
+    return True
+
+
+def _hydrate(ranked):
+    """Turn (rank, user_id) pairs into User objects with `search_rank` set."""
+    from django.contrib.auth import get_user_model
+
+    users = get_user_model().objects.in_bulk([user_id for _, user_id in ranked])
+    reference.attach(users.values())
+    results = []
+    for rank, user_id in ranked:
+        user = users.get(user_id)
+        if user is not None:
+            user.search_rank = rank
+            results.append(user)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class SearchBackend(ABC):
+    """Abstract base for search backends."""
+
+    @abstractmethod
+    def search(self, query, city_code=None, cursor=None, per_page=DEFAULT_PER_PAGE) -> KeysetPage:
+        """Return a KeysetPage of Users matching every token of `query`."""
+        pass
+
+    @abstractmethod
+    def autocomplete(self, prefix, city_code=None, limit=AUTOCOMPLETE_LIMIT) -> list:
+        """Return up to `limit` (user_id, username) pairs whose username starts with `prefix`."""
+        pass
+
+
+class PostgresSearchBackend(SearchBackend):
+    def search(self, query, city_code=None, cursor=None, per_page=DEFAULT_PER_PAGE):
+        from apps.core.models import SearchDocument
+
+        tokens = tokenize(query)[:MAX_QUERY_TOKENS]
+        if not tokens:
+            return KeysetPage([])
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+
+        queryset = SearchDocument.objects.filter(
+            RawSQL(f'{_TSVECTOR} @@ {_TSQUERY}', [tsquery], output_field=BooleanField()),
+        )
+        if city_code is not None:
+            queryset = queryset.filter(city_id=city_code)
+        queryset = queryset.annotate(rank=RawSQL(
+            f'(ts_rank({_TSVECTOR}, {_TSQUERY}) + similarity(name, %s))::float8',
+            [tsquery, ' '.join(tokens)],
+            output_field=FloatField(),
+        )).only('user')
+
+        page = get_keyset_page(queryset, cursor, per_page, ordering=['-rank', 'user_id'])
+        page.object_list = _hydrate([(doc.rank, doc.user_id) for doc in page.object_list])
+        return page
+
+    def autocomplete(self, prefix, city_code=None, limit=AUTOCOMPLETE_LIMIT):
+        from apps.core.models import SearchDocument
+
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        queryset = SearchDocument.objects.filter(name__startswith=prefix)
+        if city_code is not None:
+            queryset = queryset.filter(city_id=city_code)
+        return list(queryset.order_by('name').values_list('user_id', 'user__username')[:limit])
+
+
+class InvertedIndex:
+    """In-process term -> user id postings built from every SearchDocument."""
+
+    def __init__(self, version):
+        from apps.core.models import SearchDocument
+
+        self.version = version
+        self.loaded_at = self.checked_at = time.monotonic()
+
+        self.postings = {}
+        self.city_of = {}
+        self.name_of = {}
+        names = []
+        rows = SearchDocument.objects.values_list(
+            'user_id', 'city_id', 'name', 'document', 'user__username',
+        ).iterator(chunk_size=5000)
+        for user_id, city_id, name, document, username in rows:
+            self.city_of[user_id] = city_id
+            self.name_of[user_id] = name
+            names.append((name, user_id, username))
+            for term in set(document.split()):
+                self.postings.setdefault(term, set()).add(user_id)
+        self.terms = sorted(self.postings)
+        self.names = sorted(names)
+        self.name_keys = [name for name, _, _ in self.names]
+
+    def _prefixed(self, sorted_keys, prefix):
+        start = bisect_left(sorted_keys, prefix)
+        end = bisect_left(sorted_keys, prefix + '\U0010ffff', lo=start)
+        return start, end
+
+    def matching(self, token):
+        """Users holding any term that starts with `token`."""
+        start, end = self._prefixed(self.terms, token)
+        if end - start == 1:
+            return self.postings[self.terms[start]]
+        found = set()
+        for term in self.terms[start:end]:
+            found |= self.postings[term]
+        return found
+
+    def ranked(self, tokens, city_code=None):
+        """Return [(rank, user_id)] for users matching every token, best first."""
+        candidates = None
+        for token in sorted(tokens, key=lambda t: -len(t)):  # most selective first
+            users = self.matching(token)
+            candidates = set(users) if candidates is None else candidates & users
+            if not candidates:
+                return []
+        if city_code is not None:
+            candidates = {u for u in candidates if self.city_of.get(u) == city_code}
+
+        # An exact term outranks a prefix hit, and a username starting with
+        # the first token gets a further boost.
+        exact = [self.postings.get(token, ()) for token in tokens]
+        first = tokens[0]
+        ranked = sorted(
+            (-(sum(1.0 if user_id in hits else 0.5 for hits in exact)
+               + (1.0 if self.name_of[user_id].startswith(first) else 0.0)), user_id)
+            for user_id in candidates
+        )
+        return [(-rank, user_id) for rank, user_id in ranked]
+
+    def autocomplete(self, prefix, city_code=None, limit=AUTOCOMPLETE_LIMIT):
+        start, end = self._prefixed(self.name_keys, prefix)
+        results = []
+        for name, user_id, username in self.names[start:end]:
+            if city_code is None or self.city_of.get(user_id) == city_code:
+                results.append((name, user_id, username))
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+
+_lock = threading.Lock()
+_index = None
+
+
+def _current_version():
+    return cache.get(VERSION_KEY, 0)
+
+
+def _is_stale(index):
+    now = time.monotonic()
+    if now - index.loaded_at > MAX_AGE_SECONDS:
+        return True
+    if now - index.checked_at > VERSION_CHECK_SECONDS:
+        index.checked_at = now
+        return _current_version() != index.version
+    return False
+
+
+def get_index() -> InvertedIndex:
+    """Return this worker's inverted index, (re)building it when stale."""
+    global _index
+    index = _index
+    stale = index is None or _is_stale(index)
+    metrics.record_cache(hit=not stale)
+    if stale:
+        with _lock:
+            if _index is None or _index is index:
+                _index = InvertedIndex(_current_version())
+            index = _index
+    return index
+
+
+def invalidate():
+    """Drop this worker's inverted index and tell the others to rebuild theirs."""
+    global _index
+    _index = None
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+class PythonSearchBackend(SearchBackend):
+    def search(self, query, city_code=None, cursor=None, per_page=DEFAULT_PER_PAGE):
+        tokens = tokenize(query)[:MAX_QUERY_TOKENS]
+        if not tokens:
+            return KeysetPage([])
+        ranked = get_index().ranked(tokens, city_code)
+
+        direction, key = decode_cursor(cursor)
+        if key is not None and len(key) != 2:
+            direction, key = None, None
+        sort_key = lambda entry: (-entry[0], entry[1])  # noqa: E731
+        if key is None:
+            rows = ranked[:per_page + 1]
+        elif direction == 'prev':
+            end = bisect_left(ranked, (-key[0], key[1]), key=sort_key)
+            rows = ranked[max(end - per_page - 1, 0):end][::-1]
+        else:
+            start = bisect_right(ranked, (-key[0], key[1]), key=sort_key)
+            rows = ranked[start:start + per_page + 1]
+
+        page = build_keyset_page(
+            rows, per_page, direction or 'next',
+            key=lambda entry: list(entry),
+            had_cursor=key is not None,
+        )
+        page.object_list = _hydrate(page.object_list)
+        return page
+
+    def autocomplete(self, prefix, city_code=None, limit=AUTOCOMPLETE_LIMIT):
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        return [(user_id, username) for _, user_id, username in get_index().autocomplete(prefix, city_code, limit)]
+
+
+BACKENDS = {
+    'postgres': PostgresSearchBackend,
+    'python': PythonSearchBackend,
+}
+
+
+def get_backend() -> SearchBackend:
+    """SEARCH_BACKEND picks one explicitly; 'auto' uses PostgreSQL when that's the database."""
+    name = getattr(settings, 'SEARCH_BACKEND', 'auto')
+    if name == 'auto':
+        name = 'postgres' if connection.vendor == 'postgresql' else 'python'
+    backend_class = BACKENDS.get(name)
+    if not backend_class:
+        raise ValueError(f"Unknown search backend: {name}")
+    return backend_class()
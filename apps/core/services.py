@@ -6,9 +6,18 @@ Shared services like EmailService should be instantiated once per
 process. Python's module import system naturally enforces singleton
 semantics: `services` below is created once at module load time and
 reused on every subsequent `from apps.core.services import services`.
+
+`email` is what request code uses; with the outbox enabled it only
+enqueues, otherwise it sends inline over a connection per message.
+`email_delivery` is the EmailService the outbox worker uses: it talks to
+the mail server over a pooled connection, which the worker closes when the
+queue is idle. Web processes never hold that connection open.
 """
 
-from apps.core.email_service import DjangoEmailAdapter, EmailService
+from apps.core import outbox
+from apps.core.email_service import (
+    DjangoEmailAdapter, EmailService, PooledDjangoEmailAdapter, QueuedEmailAdapter,
+)
 
 
 class _ServiceRegistry:
@@ -21,13 +30,21 @@ class _ServiceRegistry:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._email = EmailService(DjangoEmailAdapter())
+            cls._instance._email_delivery = EmailService(PooledDjangoEmailAdapter())
+            cls._instance._email = (
+                EmailService(QueuedEmailAdapter()) if outbox.is_enabled()
+                else EmailService(DjangoEmailAdapter())
+            )
         return cls._instance
 
     @property
     def email(self) -> EmailService:
         return self._email
 
+    @property
+    def email_delivery(self) -> EmailService:
+        return self._email_delivery
+
 
 # Module-level singleton
 services = _ServiceRegistry()
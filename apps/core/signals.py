@@ -0,0 +1,40 @@
+"""
+Keeps User.unread_notification_count right when NotificationRecords are
+created or deleted one at a time through the ORM (admin, shell). The bulk
+paths in notifications.py and NotificationRecordManager adjust the
+counter themselves, since bulk_create() and update() send no signals.
+
+Also invalidates the in-process reference-data cache (reference.py) when
+a City, Neighborhood or Interest changes.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core import reference
+from apps.core.notifications import adjust_unread_counts
+
+from .models import City, Interest, Neighborhood, NotificationRecord
+
+
+@receiver(post_save, sender=NotificationRecord)
+def count_created_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        adjust_unread_counts({instance.recipient_id: 1})
+
+
+@receiver(post_delete, sender=NotificationRecord)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_counts({instance.recipient_id: -1})
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=Neighborhood)
+@receiver(post_delete, sender=Neighborhood)
+@receiver(post_save, sender=Interest)
+@receiver(post_delete, sender=Interest)
+def invalidate_reference_data(sender, **kwargs):
+    transaction.on_commit(reference.invalidate)
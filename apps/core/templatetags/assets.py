@@ -0,0 +1,97 @@
+"""
+Stylesheet and font tags for base.html, driven by `manage.py build_assets`.
+
+    {% load assets %}
+    <head>
+      {% asset_head %}                     fonts, critical CSS, the bundle
+      {% stylesheet 'css/auth.css' %}      a page's own CSS
+    </head>
+
+After a build (static/build/assets.json exists) {% asset_head %} emits
+preload hints for the vendored fonts and the bundle, the @font-face
+rules and critical CSS inline, and loads the bundle without blocking
+first paint; {% stylesheet %} renders nothing for files the bundle
+already contains. Without a build both fall back to the plain <link>s,
+so a fresh checkout works with no build step.
+
+The manifest and critical CSS are read once per process, so restart
+after rebuilding.
+"""
+
+import json
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+# Mirrors apps.core.assets, which stays out of the request path
+# (config/startup.py DEFERRED_MODULES).
+MANIFEST = 'build/assets.json'
+FALLBACK_FONTS_URL = 'https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&display=swap'
+FALLBACK_STYLESHEET = 'css/base.css'
+
+_build = None
+
+
+def _read(path):
+    found = finders.find(path)
+    if not found:
+        return None
+    with open(found, encoding='utf-8') as f:
+        return f.read()
+
+
+def build():
+    """Return (manifest, critical_css) for the current build, or (None, '') without one."""
+    global _build
+    if _build is None:
+        raw = _read(MANIFEST)
+        manifest = json.loads(raw) if raw else None
+        critical = (_read(manifest['critical']) or '') if manifest else ''
+        _build = (manifest, critical)
+    return _build
+
+
+def _font_faces(fonts):
+    return ''.join(
+        f"@font-face{{font-family:'{font['family']}';font-style:{font['style']};"
+        f"font-weight:{font['weight']};font-display:swap;"
+        f"src:url({static(font['path'])}) format('woff2');unicode-range:{font['unicode_range']}}}"
+        for font in fonts
+    )
+
+
+@register.simple_tag
+def asset_head():
+    manifest, critical = build()
+    if manifest is None:
+        return format_html(
+            '<link href="{}" rel="stylesheet">\n<link rel="stylesheet" href="{}">',
+            FALLBACK_FONTS_URL, static(FALLBACK_STYLESHEET),
+        )
+
+    bundle = static(manifest['bundle'])
+    preloads = format_html_join(
+        '\n', '<link rel="preload" href="{}" as="font" type="font/woff2" crossorigin>',
+        ((static(font['path']),) for font in manifest['fonts']),
+    )
+    # Build output is our own CSS, so it's inlined as-is.
+    inline = mark_safe(f'<style>{_font_faces(manifest["fonts"])}{critical}</style>')
+    return format_html(
+        '{}\n<link rel="preload" href="{}" as="style">\n{}\n'
+        '<link rel="stylesheet" href="{}" media="print" onload="this.media=\'all\'">\n'
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        preloads, bundle, inline, bundle, bundle,
+    )
+
+
+@register.simple_tag
+def stylesheet(path):
+    manifest, _ = build()
+    if manifest is not None and path in manifest['sources']:
+        return ''
+    return format_html('<link rel="stylesheet" href="{}">', static(path))
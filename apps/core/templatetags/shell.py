@@ -0,0 +1,40 @@
+"""
+{% shellcache %} — cache a piece of the page shell per user and view.
+
+    {% load shell %}
+    {% shellcache 'sidebar' %}
+      ...navigation...
+    {% endshellcache %}
+
+Keys and invalidation live in apps/core/fragments.py. Only wrap markup
+that depends on the user's profile, the current view and the unread
+badge — anything else (flash messages, CSRF tokens) must stay outside.
+"""
+
+from django import template
+
+from apps.core import fragments
+
+register = template.Library()
+
+
+class ShellCacheNode(template.Node):
+    def __init__(self, nodelist, name):
+        self.nodelist = nodelist
+        self.name = name
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        return fragments.get_or_render(
+            name, context.get('request'), lambda: self.nodelist.render(context),
+        )
+
+
+@register.tag
+def shellcache(parser, token):
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes exactly one argument, the fragment name")
+    nodelist = parser.parse(('endshellcache',))
+    parser.delete_first_token()
+    return ShellCacheNode(nodelist, parser.compile_filter(bits[1]))
@@ -0,0 +1,66 @@
+"""
+Test helpers for performance regressions.
+
+    from apps.core.testing import QueryBudgetMixin
+
+    class DashboardTests(QueryBudgetMixin, TestCase):
+        def test_dashboard_budget(self):
+            response = self.client.get(reverse('accounts:dashboard'))
+            self.assertWithinQueryBudget(response)   # settings.QUERY_BUDGETS
+
+        def test_listing_budget(self):
+            with self.assertMaxQueries(1):
+                str(Neighborhood.objects.first())
+
+        def test_dashboard_shell_cached(self):
+            self.client.force_login(self.user)
+            self.assertServedFromCache(reverse('accounts:dashboard'))
+
+Responses carry the RequestMetrics recorded by RequestMetricsMiddleware,
+so a view that grows an N+1 fails its budget instead of slipping through.
+"""
+
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.middleware import query_budget
+
+
+class QueryBudgetMixin:
+    def assertWithinQueryBudget(self, response, budget=None):
+        metrics = getattr(response, 'request_metrics', None)
+        if metrics is None:
+            self.fail("Response has no request_metrics — is RequestMetricsMiddleware installed?")
+        if budget is None:
+            budget = query_budget(response.request_method, metrics.view_name)
+        if budget is None:
+            self.fail(f"No query budget declared for {metrics.view_name!r} in settings.QUERY_BUDGETS")
+        if metrics.queries > budget:
+            self.fail(f"{metrics.view_name} ran {metrics.queries} queries, budget is {budget}")
+
+    def assertServedFromCache(self, path, client=None):
+        """
+        GET `path` twice: the first request may fill caches (the page shell's
+        {% shellcache %} fragments, reference data, ...), the second must
+        be answered with no cache misses at all.
+        """
+        client = client or self.client
+        client.get(path)
+        metrics = getattr(client.get(path), 'request_metrics', None)
+        if metrics is None:
+            self.fail("Response has no request_metrics — is RequestMetricsMiddleware installed?")
+        if metrics.cache_misses or not metrics.cache_hits:
+            self.fail(
+                f"Repeat GET {path} had {metrics.cache_hits} cache hits and "
+                f"{metrics.cache_misses} misses, expected only hits"
+            )
+
+    @contextmanager
+    def assertMaxQueries(self, budget, using=connection):
+        with CaptureQueriesContext(using) as captured:
+            yield captured
+        if len(captured) > budget:
+            statements = '\n'.join(q['sql'] for q in captured.captured_queries)
+            self.fail(f"Ran {len(captured)} queries, budget is {budget}:\n{statements}")
@@ -0,0 +1,78 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from apps.core import assets
+from apps.core.templatetags import assets as asset_tags
+
+FONT = {
+    'family': 'Space Grotesk',
+    'style': 'normal',
+    'weight': '400 700',
+    'unicode_range': 'U+0000-00FF',
+    'path': 'fonts/space-grotesk-latin.woff2',
+}
+
+
+def render(source):
+    return Template('{% load assets %}' + source).render(Context())
+
+
+class AssetTagTestCase(SimpleTestCase):
+    """Renders the tags against a scratch copy of static/, read afresh each test."""
+
+    def setUp(self):
+        asset_tags._build = None
+        self.addCleanup(setattr, asset_tags, '_build', None)
+        self.static_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.static_dir)
+        shutil.copytree(Path(settings.BASE_DIR) / 'static' / 'css', self.static_dir / 'css')
+        self.enterContext(override_settings(STATICFILES_DIRS=[self.static_dir]))
+
+
+class AssetTagsWithoutBuildTests(AssetTagTestCase):
+    def test_asset_head_links_google_fonts_and_base_css(self):
+        html = render('{% asset_head %}')
+        self.assertIn(f'<link href="{asset_tags.FALLBACK_FONTS_URL.replace("&", "&amp;")}" rel="stylesheet">', html)
+        self.assertIn('<link rel="stylesheet" href="/static/css/base.css">', html)
+        self.assertNotIn('<style>', html)
+
+    def test_stylesheet_links_the_file(self):
+        self.assertEqual(render("{% stylesheet 'css/auth.css' %}"), '<link rel="stylesheet" href="/static/css/auth.css">')
+
+
+class AssetTagsWithBuildTests(AssetTagTestCase):
+    def setUp(self):
+        super().setUp()
+        # A vendored font already on disk, so build() doesn't download it.
+        (self.static_dir / 'fonts').mkdir()
+        (self.static_dir / FONT['path']).write_bytes(b'wOF2')
+        (self.static_dir / 'fonts' / 'fonts.json').write_text(json.dumps([FONT]))
+        assets.build()
+
+    def test_asset_head_preloads_and_inlines_the_build(self):
+        html = render('{% asset_head %}')
+        critical = (self.static_dir / assets.CRITICAL).read_text()
+
+        self.assertIn(
+            '<link rel="preload" href="/static/fonts/space-grotesk-latin.woff2" as="font" type="font/woff2" crossorigin>',
+            html,
+        )
+        self.assertIn("@font-face{font-family:'Space Grotesk';font-style:normal;font-weight:400 700;", html)
+        self.assertIn(f'{critical}</style>', html)
+        self.assertIn('<link rel="stylesheet" href="/static/build/app.min.css" media="print"', html)
+        self.assertIn('<noscript><link rel="stylesheet" href="/static/build/app.min.css"></noscript>', html)
+        self.assertNotIn('fonts.googleapis.com', html)
+        self.assertNotIn('css/base.css', html)
+
+    def test_stylesheet_skips_bundled_files(self):
+        self.assertEqual(render("{% stylesheet 'css/auth.css' %}"), '')
+
+    def test_stylesheet_links_files_outside_the_bundle(self):
+        (self.static_dir / 'css' / 'extra.css').write_text('p{margin:0}')
+        self.assertEqual(render("{% stylesheet 'css/extra.css' %}"), '<link rel="stylesheet" href="/static/css/extra.css">')
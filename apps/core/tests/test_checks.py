@@ -0,0 +1,23 @@
+from django.test import SimpleTestCase, override_settings
+
+from apps.core.checks import check_access_cache
+
+LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+SHARED = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache:6379'}}
+
+
+class AccessCacheCheckTests(SimpleTestCase):
+    def error_ids(self):
+        return [error.id for error in check_access_cache(None)]
+
+    @override_settings(CACHES=LOCMEM, ACCESS_CACHE_TTL=0)
+    def test_request_scoped_passes_on_locmem(self):
+        self.assertEqual(self.error_ids(), [])
+
+    @override_settings(CACHES=LOCMEM, ACCESS_CACHE_TTL=60)
+    def test_ttl_fails_on_locmem(self):
+        self.assertEqual(self.error_ids(), ['core.E001'])
+
+    @override_settings(CACHES=SHARED, ACCESS_CACHE_TTL=60)
+    def test_ttl_passes_on_shared_cache(self):
+        self.assertEqual(self.error_ids(), [])
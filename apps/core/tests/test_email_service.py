@@ -0,0 +1,63 @@
+import time
+from unittest import mock
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase
+
+from apps.core import email_service
+from apps.core.email_service import OutgoingEmail, PooledDjangoEmailAdapter
+
+COUNTING_BACKEND = f'{__name__}.CountingBackend'
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend that counts the connections and send calls made on it."""
+    opened = 0
+    closed = 0
+    send_calls = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+    def close(self):
+        CountingBackend.closed += 1
+
+    def send_messages(self, messages):
+        CountingBackend.send_calls += 1
+        return super().send_messages(messages)
+
+
+class PooledDjangoEmailAdapterTests(SimpleTestCase):
+    def setUp(self):
+        CountingBackend.opened = CountingBackend.closed = CountingBackend.send_calls = 0
+        self.emails = [OutgoingEmail(f'user{i}@example.com', 'Hi', 'Body') for i in range(5)]
+
+    def test_batches_sends_over_one_connection(self):
+        adapter = PooledDjangoEmailAdapter(backend=COUNTING_BACKEND)
+        self.assertEqual(adapter.send_many(self.emails), [True] * 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual((CountingBackend.opened, CountingBackend.send_calls), (1, 1))
+
+    def test_recycles_connection_every_batch_size_messages(self):
+        adapter = PooledDjangoEmailAdapter(batch_size=2, backend=COUNTING_BACKEND)
+        adapter.send_many(self.emails)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual((CountingBackend.opened, CountingBackend.send_calls), (3, 3))
+
+    def test_close_releases_connection(self):
+        adapter = PooledDjangoEmailAdapter(backend=COUNTING_BACKEND)
+        adapter.send_many(self.emails)
+        adapter.close()
+        self.assertEqual(CountingBackend.closed, 1)
+        adapter.send_many(self.emails)
+        self.assertEqual(CountingBackend.opened, 2)
+
+    def test_idle_connection_is_replaced(self):
+        adapter = PooledDjangoEmailAdapter(backend=COUNTING_BACKEND, idle_timeout=30)
+        adapter.send_many(self.emails[:1])
+        later = time.monotonic() + 31
+        with mock.patch.object(email_service.time, 'monotonic', return_value=later):
+            adapter.send_many(self.emails[1:])
+        self.assertEqual((CountingBackend.opened, CountingBackend.closed), (2, 1))
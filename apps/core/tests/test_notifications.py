@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.core.notifications import NotificationFactory, NotificationType
+
+
+class CreateManyTests(TestCase):
+    def setUp(self):
+        self.recipient = User.objects.create_user('rec', 'rec@example.com', 'pw-123456xx')
+
+    def test_generator_contexts_never_share_a_rendering(self):
+        # Nothing else references each event/group once the next context is
+        # built, so an id()-keyed cache would see recycled ids and hand later
+        # recipients an earlier message.
+        contexts = (
+            {
+                'recipient': self.recipient,
+                'event': SimpleNamespace(name=f'event{i}'),
+                'group': SimpleNamespace(name=f'group{i}', id=i),
+            }
+            for i in range(50)
+        )
+        batch = NotificationFactory.create_many(NotificationType.EVENT_CREATED, contexts)
+        self.assertEqual(
+            [n.message for n in batch],
+            [f"New event 'event{i}' in group{i}." for i in range(50)],
+        )
+
+    def test_saved_instances_are_keyed_by_pk(self):
+        sender = User.objects.create_user('snd', 'snd@example.com', 'pw-123456xx')
+        contexts = [
+            {'recipient': self.recipient, 'sender': User.objects.get(pk=sender.pk)}
+            for _ in range(3)
+        ]
+        batch = NotificationFactory.create_many(NotificationType.FRIEND_REQUEST, contexts)
+        self.assertEqual({n.message for n in batch}, {"snd sent you a friend request."})
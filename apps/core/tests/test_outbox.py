@@ -0,0 +1,46 @@
+from django.test import TransactionTestCase
+
+from apps.accounts.models import User
+from apps.core import outbox
+from apps.core.models import NotificationRecord, OutboxMessage
+
+
+def _record(recipient_id, message):
+    return {
+        'recipient_id': recipient_id,
+        'notif_type': 'system',
+        'message': message,
+        'url': '',
+        'actor_id': None,
+    }
+
+
+# Transactional: foreign keys are only checked when the outermost
+# transaction commits, which a TestCase never does.
+class DeliverNotificationsTests(TransactionTestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', 'alice@example.com', 'pw-123456xx')
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'pw-123456xx')
+
+    def test_bad_record_does_not_hold_back_its_chunk(self):
+        missing = self.bob.pk + 100
+        message = outbox.enqueue('notifications', {'records': [
+            _record(self.alice.pk, 'one'),
+            _record(missing, 'two'),
+            _record(self.bob.pk, 'three'),
+        ]})
+
+        self.assertEqual(outbox.process_batch(), (0, 1, 0))
+
+        self.assertEqual(
+            sorted(NotificationRecord.objects.values_list('message', flat=True)),
+            ['one', 'three'],
+        )
+        message = OutboxMessage.objects.get(pk=message.pk)
+        self.assertEqual(message.payload['records'], [_record(missing, 'two')])
+        self.assertEqual(User.objects.get(pk=self.alice.pk).unread_notification_count, 1)
+
+    def test_clean_chunk_is_delivered(self):
+        outbox.enqueue('notifications', {'records': [_record(self.alice.pk, 'one')]})
+        self.assertEqual(outbox.process_batch(), (1, 0, 0))
+        self.assertFalse(OutboxMessage.objects.exists())
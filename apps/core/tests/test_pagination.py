@@ -0,0 +1,38 @@
+from django.core.paginator import Paginator
+from django.test import TestCase
+
+from apps.core.counting import CachedCount, CountStrategy
+from apps.core.models import City
+from apps.core.pagination import get_page_range
+
+
+class FixedCount(CountStrategy):
+    def __init__(self, total):
+        self.total = total
+
+    def count(self, queryset, scope=None):
+        return self.total
+
+
+class GetPageRangeTests(TestCase):
+    fixtures = ['initial_data']
+
+    def test_counter_is_ignored_for_lists(self):
+        paginator = Paginator(list(range(25)), 10)
+        page_obj, page_range = get_page_range(paginator, 3, counter=CachedCount())
+        self.assertEqual(page_obj.number, 3)
+        self.assertEqual(paginator.count, 25)
+        self.assertEqual(page_range, [1, 2, 3])
+
+    def test_counter_seeds_queryset_count(self):
+        paginator = Paginator(City.objects.order_by('pk'), 2)
+        with self.assertNumQueries(1):  # the page itself, no COUNT
+            page_obj, _ = get_page_range(paginator, 1, counter=FixedCount(8))
+            list(page_obj)
+        self.assertEqual(paginator.num_pages, 4)
+
+    def test_underestimated_count_hides_later_pages(self):
+        paginator = Paginator(City.objects.order_by('pk'), 2)
+        page_obj, page_range = get_page_range(paginator, 4, counter=FixedCount(4))
+        self.assertEqual(page_obj.number, 2)
+        self.assertEqual(page_range, [1, 2])
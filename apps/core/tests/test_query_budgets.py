@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.core.models import City
+from apps.core.testing import QueryBudgetMixin
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """One test per settings.QUERY_BUDGETS entry, measured with warm caches."""
+
+    fixtures = ['initial_data']
+
+    def setUp(self):
+        cache.clear()
+        self.city = City.objects.order_by('pk').first()
+        self.neighborhood = self.city.neighborhoods.order_by('pk').first()
+        self.user = User.objects.create_user(
+            'alice', 'alice@example.com', 'pw-123456xx', city=self.city, neighborhood=self.neighborhood,
+        )
+
+    def warm_get(self, path, **params):
+        self.client.get(path, params)
+        return self.client.get(path, params)
+
+    def test_every_budget_is_covered(self):
+        covered = {
+            'accounts:signup', 'POST accounts:signup', 'accounts:login', 'POST accounts:login',
+            'accounts:dashboard', 'core:neighborhoods', 'core:search', 'core:autocomplete',
+        }
+        self.assertEqual(set(settings.QUERY_BUDGETS), covered)
+
+    def test_signup_page(self):
+        self.assertWithinQueryBudget(self.warm_get(reverse('accounts:signup')))
+
+    def test_signup_post(self):
+        self.client.get(reverse('accounts:signup'))
+        response = self.client.post(reverse('accounts:signup'), {
+            'username': 'bob', 'email': 'bob@example.com',
+            'city': self.city.pk, 'neighborhood': self.neighborhood.pk,
+            'password1': 'bench-pass-123', 'password2': 'bench-pass-123',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertWithinQueryBudget(response)
+
+    def test_login_page(self):
+        self.assertWithinQueryBudget(self.warm_get(reverse('accounts:login')))
+
+    def test_login_post(self):
+        response = self.client.post(reverse('accounts:login'), {'username': 'alice', 'password': 'pw-123456xx'})
+        self.assertEqual(response.status_code, 302)
+        self.assertWithinQueryBudget(response)
+
+    def test_failed_login_post(self):
+        response = self.client.post(reverse('accounts:login'), {'username': 'alice', 'password': 'wrong-pass'})
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+
+    def test_dashboard(self):
+        self.client.force_login(self.user)
+        self.assertWithinQueryBudget(self.warm_get(reverse('accounts:dashboard')))
+
+    def test_neighborhoods(self):
+        self.assertWithinQueryBudget(self.warm_get(reverse('core:neighborhoods', args=[self.city.pk])))
+
+    def test_search(self):
+        self.client.force_login(self.user)
+        self.assertWithinQueryBudget(self.warm_get(reverse('core:search'), q='ali'))
+
+    def test_autocomplete(self):
+        self.client.force_login(self.user)
+        self.assertWithinQueryBudget(self.warm_get(reverse('core:autocomplete'), q='ali'))
@@ -0,0 +1,23 @@
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.core.ratelimit import client_ip
+
+
+class ClientIpTests(SimpleTestCase):
+    def request(self, forwarded=None):
+        extra = {'HTTP_X_FORWARDED_FOR': forwarded} if forwarded is not None else {}
+        return RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', **extra)
+
+    def test_spoofed_leading_entries_are_ignored(self):
+        self.assertEqual(client_ip(self.request('6.6.6.6, 203.0.113.7')), '203.0.113.7')
+
+    @override_settings(RATE_LIMIT_TRUSTED_PROXIES=2)
+    def test_counts_trusted_hops_from_the_right(self):
+        self.assertEqual(client_ip(self.request('6.6.6.6, 203.0.113.7, 10.1.1.1')), '203.0.113.7')
+
+    @override_settings(RATE_LIMIT_TRUSTED_PROXIES=0)
+    def test_no_trusted_proxies_uses_remote_addr(self):
+        self.assertEqual(client_ip(self.request('203.0.113.7')), '10.0.0.1')
+
+    def test_without_header_uses_remote_addr(self):
+        self.assertEqual(client_ip(self.request()), '10.0.0.1')
@@ -0,0 +1,48 @@
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.core import retention
+from apps.core.models import NotificationRecord
+from apps.core.notifications import NotificationType
+
+
+class CollapseRepeatedTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', 'alice@example.com', 'pw-123456xx')
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'pw-123456xx')
+
+    def notify(self, group_count=1):
+        return NotificationRecord.objects.create(
+            recipient=self.alice, actor=self.bob, notif_type=NotificationType.NEW_MESSAGE.value,
+            message='New message from bob.', group_count=group_count,
+        )
+
+    def collapse_group(self):
+        return retention.collapse_group(self.alice.pk, NotificationType.NEW_MESSAGE.value, self.bob.pk, 'bob')
+
+    def test_folds_into_newest_with_summed_count(self):
+        self.notify(group_count=2)
+        self.notify()
+        newest = self.notify()
+
+        self.assertEqual(retention.collapse_repeated(), 2)
+
+        row = NotificationRecord.objects.get()
+        self.assertEqual(row.pk, newest.pk)
+        self.assertEqual(row.group_count, 4)
+        self.assertEqual(row.message, '4 new messages from bob.')
+
+    def test_group_read_since_grouping_is_skipped(self):
+        first, second = self.notify(), self.notify()
+        NotificationRecord.objects.filter(pk=first.pk).update(is_read=True)
+
+        self.assertEqual(self.collapse_group(), 0)
+        self.assertEqual(NotificationRecord.objects.get(pk=second.pk).group_count, 1)
+
+    def test_total_counts_rows_that_arrived_since_grouping(self):
+        self.notify()
+        self.notify()
+        self.notify()  # arrives after collapse_repeated() counted two
+
+        self.assertEqual(self.collapse_group(), 2)
+        self.assertEqual(NotificationRecord.objects.get().group_count, 3)
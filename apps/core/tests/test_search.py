@@ -0,0 +1,171 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.core import search
+from apps.core.models import City, Interest, SearchDocument
+from apps.core.pagination import encode_cursor
+
+
+class SearchTestCase(TestCase):
+    fixtures = ['initial_data']
+
+    def setUp(self):
+        cache.clear()
+        search._index = None
+        self.addCleanup(setattr, search, '_index', None)
+        self.city, self.other_city = City.objects.order_by('pk')[:2]
+        self.neighborhood = self.city.neighborhoods.order_by('pk').first()
+
+    def make_user(self, username, city=None, **fields):
+        city = city or self.city
+        return User.objects.create_user(
+            username, f'{username}@example.com', 'pw-123456xx',
+            city=city, neighborhood=city.neighborhoods.order_by('pk').first(), **fields,
+        )
+
+    def usernames(self, page):
+        return [user.username for user in page]
+
+
+@override_settings(SEARCH_BACKEND='python')
+class PythonSearchBackendTests(SearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = search.PythonSearchBackend()
+
+    def test_tokens_match_as_prefixes(self):
+        self.make_user('alice', bio='Loves music and jazz')
+        self.make_user('bob', bio='Museum guide')
+        self.make_user('carol', bio='Gardening')
+
+        self.assertEqual(sorted(self.usernames(self.backend.search('mus'))), ['alice', 'bob'])
+        self.assertEqual(self.usernames(self.backend.search('mus jaz')), ['alice'])
+        self.assertEqual(self.usernames(self.backend.search('   ')), [])
+
+    def test_exact_term_and_username_outrank_prefix_hits(self):
+        self.make_user('zed', bio='music')
+        self.make_user('musicfan', bio='')
+        self.make_user('yan', bio='musical')
+
+        self.assertEqual(self.usernames(self.backend.search('music')), ['musicfan', 'zed', 'yan'])
+
+    def test_city_scoping(self):
+        self.make_user('alice', bio='music')
+        self.make_user('bob', city=self.other_city, bio='music')
+
+        self.assertEqual(self.usernames(self.backend.search('music', city_code=self.city.pk)), ['alice'])
+        self.assertEqual(self.usernames(self.backend.search('music', city_code=self.other_city.pk)), ['bob'])
+        self.assertEqual(len(self.backend.search('music')), 2)
+
+    def test_cursor_pages_forward_and_back(self):
+        for n in range(5):
+            self.make_user(f'user{n}', bio='music')
+        expected = self.usernames(self.backend.search('music', per_page=10))
+
+        first = self.backend.search('music', per_page=2)
+        self.assertEqual(self.usernames(first), expected[:2])
+        self.assertFalse(first.has_previous)
+
+        second = self.backend.search('music', cursor=first.next_cursor, per_page=2)
+        self.assertEqual(self.usernames(second), expected[2:4])
+
+        third = self.backend.search('music', cursor=second.next_cursor, per_page=2)
+        self.assertEqual(self.usernames(third), expected[4:])
+        self.assertFalse(third.has_next)
+
+        back = self.backend.search('music', cursor=third.prev_cursor, per_page=2)
+        self.assertEqual(self.usernames(back), expected[2:4])
+        self.assertEqual(self.usernames(self.backend.search('music', cursor=back.prev_cursor, per_page=2)), expected[:2])
+
+    def test_autocomplete(self):
+        alice = self.make_user('Alice')
+        alina = self.make_user('alina')
+        self.make_user('albert', city=self.other_city)
+        self.make_user('bob')
+
+        self.assertEqual(self.backend.autocomplete(' AL', city_code=self.city.pk), [(alice.pk, 'Alice'), (alina.pk, 'alina')])
+        self.assertEqual([name for _, name in self.backend.autocomplete('al')], ['albert', 'Alice', 'alina'])
+        self.assertEqual(len(self.backend.autocomplete('al', limit=1)), 1)
+        self.assertEqual(self.backend.autocomplete(''), [])
+
+
+@override_settings(SEARCH_BACKEND='python')
+class SearchIndexSignalTests(SearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user('alice', bio='gardening')
+        self.backend = search.PythonSearchBackend()
+        self.assertEqual(self.usernames(self.backend.search('garden')), ['alice'])
+
+    def test_bio_change_reindexes(self):
+        self.user.bio = 'pottery'
+        self.user.save()
+
+        self.assertEqual(self.usernames(self.backend.search('garden')), [])
+        self.assertEqual(self.usernames(self.backend.search('pottery')), ['alice'])
+
+    def test_interest_change_reindexes(self):
+        hiking = Interest.objects.get(interest_name='Hiking')
+        self.user.interests.add(hiking)
+        self.assertEqual(self.usernames(self.backend.search('hik')), ['alice'])
+
+        self.user.interests.remove(hiking)
+        self.assertEqual(self.usernames(self.backend.search('hik')), [])
+
+    def test_unrelated_save_keeps_document(self):
+        before = SearchDocument.objects.get(user=self.user).updated_at
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual(SearchDocument.objects.get(user=self.user).updated_at, before)
+
+
+@override_settings(SEARCH_BACKEND='python')
+class SearchViewTests(SearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.make_user('alice', bio='music')
+        self.client.force_login(self.user)
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        # Garbage, a wrong-length key, and an empty cursor.
+        for cursor in ('not-a-cursor', encode_cursor([1.0]), ''):
+            response = self.client.get(reverse('core:search'), {'q': 'music', 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([row['username'] for row in response.json()['results']], ['alice'])
+
+    def test_autocomplete_view(self):
+        response = self.client.get(reverse('core:autocomplete'), {'q': 'ali', 'city': self.city.pk})
+        self.assertEqual(response.json()['results'], [{'id': self.user.pk, 'username': 'alice'}])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'to_tsquery and pg_trgm need PostgreSQL')
+class PostgresSearchBackendTests(SearchTestCase):
+    def setUp(self):
+        super().setUp()
+        search.setup_postgres()
+        self.backend = search.PostgresSearchBackend()
+
+    def test_prefix_query_and_similarity_rank(self):
+        self.make_user('musa', bio='')
+        self.make_user('zed', bio='music lover')
+        self.make_user('bob', bio='gardening')
+
+        page = self.backend.search('mus')
+        self.assertEqual(self.usernames(page), ['musa', 'zed'])
+        self.assertGreater(page.object_list[0].search_rank, page.object_list[1].search_rank)
+
+    def test_cursor_pages_over_rank_keyset(self):
+        for n in range(5):
+            self.make_user(f'user{n}', bio='music')
+        expected = self.usernames(self.backend.search('music', per_page=10))
+
+        first = self.backend.search('music', per_page=2)
+        second = self.backend.search('music', cursor=first.next_cursor, per_page=2)
+        back = self.backend.search('music', cursor=second.prev_cursor, per_page=2)
+
+        self.assertEqual(self.usernames(first) + self.usernames(second), expected[:4])
+        self.assertEqual(self.usernames(back), expected[:2])
@@ -1,8 +1,12 @@
 from django.urls import path
 
+from . import views
+
 app_name = 'core'
 
 urlpatterns = [
-    # Search and notification endpoints are added later
-    # (apps/core/views.py doesn't exist yet — nothing to route to).
-]
\ No newline at end of file
+    path('neighborhoods/<int:city_code>/', views.neighborhoods_view, name='neighborhoods'),
+    path('search/', views.search_view, name='search'),
+    path('search/autocomplete/', views.autocomplete_view, name='autocomplete'),
+    # Notification endpoints are added later.
+]
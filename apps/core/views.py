@@ -0,0 +1,67 @@
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_GET
+
+from apps.core import reference, search
+from apps.core.decorators import login_required_custom
+
+NEIGHBORHOODS_MAX_AGE = 5 * 60  # seconds; clients revalidate with the ETag after this
+
+
+def _neighborhoods_etag(request, city_code):
+    payload = reference.neighborhood_payload(city_code)
+    return payload[1] if payload else None
+
+
+@require_GET
+@condition(etag_func=_neighborhoods_etag)
+def neighborhoods_view(request, city_code):
+    """Neighborhoods of one city as JSON, for the dependent select on the signup form."""
+    payload = reference.neighborhood_payload(city_code)
+    if payload is None:
+        return JsonResponse({'error': 'Unknown city.'}, status=404)
+
+    response = HttpResponse(payload[0], content_type='application/json')
+    patch_cache_control(response, public=True, max_age=NEIGHBORHOODS_MAX_AGE)
+    return response
+
+
+def _city_param(request):
+    try:
+        return int(request.GET['city'])
+    except (KeyError, ValueError):
+        return None
+
+
+@require_GET
+@login_required_custom
+def search_view(request):
+    """Full-text user search as JSON: ?q=...&city=...&cursor=..."""
+    page = search.get_backend().search(
+        request.GET.get('q', ''),
+        city_code=_city_param(request),
+        cursor=request.GET.get('cursor'),
+    )
+    return JsonResponse({
+        'results': [
+            {
+                'id': user.pk,
+                'username': user.username,
+                'city': user.city.city_name if user.city_id else None,
+                'neighborhood': user.neighborhood.area_name if user.neighborhood_id else None,
+            }
+            for user in page
+        ],
+        'next_cursor': page.next_cursor,
+        'prev_cursor': page.prev_cursor,
+    })
+
+
+@require_GET
+@login_required_custom
+def autocomplete_view(request):
+    """Username prefix suggestions as JSON: ?q=...&city=..."""
+    suggestions = search.get_backend().autocomplete(request.GET.get('q', ''), city_code=_city_param(request))
+    return JsonResponse({
+        'results': [{'id': user_id, 'username': username} for user_id, username in suggestions],
+    })
@@ -0,0 +1,8 @@
+#!/bin/sh
+# Vercel static build (vercel.json): vendor the font, bundle the CSS and
+# collect hashed, precompressed files into staticfiles/ (the distDir).
+# It runs before the Python build, which ships staticfiles.json and
+# static/build/ in the lambda so STATIC_MANIFEST pages can resolve them.
+set -e
+python3 -m pip install -r requirements.txt brotli
+STATIC_MANIFEST=True python3 manage.py build_assets
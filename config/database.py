@@ -0,0 +1,72 @@
+"""
+DATABASES['default'] for each DB_CONNECTION_MODE.
+
+Vercel runs every request in a short-lived lambda, so how connections
+are held matters more than usual:
+
+    persistent  Django keeps one connection per worker for conn_max_age
+                seconds and pings it before reuse (CONN_HEALTH_CHECKS).
+                Fine for a long-running server; on lambdas each warm
+                instance holds a connection open, which adds up under
+                bursts against Neon's connection limit.
+    pool        Django 5.1+'s native psycopg pool (OPTIONS['pool']). Each
+                instance borrows from a small pool and returns the
+                connection at the end of the request; idle connections
+                are checked before being handed out. Needs psycopg 3
+                with the pool extra (`psycopg[binary,pool]`).
+    pgbouncer   For a transaction-mode pooler in front of Postgres (e.g.
+                Neon's "-pooler" endpoint): no persistent connections,
+                and server-side cursors disabled because they don't
+                survive transaction pooling.
+
+Modes only change PostgreSQL settings; SQLite ignores them apart from
+conn_max_age. The ENGINE is swapped for the instrumented subclasses in
+apps/core/db_backends so RequestMetrics can report connection setup time.
+"""
+
+import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
+
+MODES = ('persistent', 'pool', 'pgbouncer')
+
+INSTRUMENTED_ENGINES = {
+    'django.db.backends.postgresql': 'apps.core.db_backends.postgresql',
+    'django.db.backends.sqlite3': 'apps.core.db_backends.sqlite3',
+}
+
+
+def database_settings(url, mode='persistent', ssl_require=False, conn_max_age=600,
+                      pool_min_size=0, pool_max_size=4, pool_timeout=10):
+    if mode not in MODES:
+        raise ImproperlyConfigured(f"DB_CONNECTION_MODE must be one of {', '.join(MODES)}, not {mode!r}")
+
+    db = dj_database_url.parse(url, conn_max_age=conn_max_age, ssl_require=ssl_require)
+    is_postgres = db['ENGINE'] == 'django.db.backends.postgresql'
+    db['ENGINE'] = INSTRUMENTED_ENGINES.get(db['ENGINE'], db['ENGINE'])
+    if not is_postgres:
+        return db
+
+    if mode == 'persistent':
+        db['CONN_HEALTH_CHECKS'] = True
+    elif mode == 'pool':
+        # Django refuses persistent connections on top of its own pool.
+        db['CONN_MAX_AGE'] = 0
+        db.setdefault('OPTIONS', {})['pool'] = _pool_options(pool_min_size, pool_max_size, pool_timeout)
+    elif mode == 'pgbouncer':
+        db['CONN_MAX_AGE'] = 0
+        db['DISABLE_SERVER_SIDE_CURSORS'] = True
+    return db
+
+
+def _pool_options(min_size, max_size, timeout):
+    try:
+        from psycopg_pool import ConnectionPool
+    except ImportError as e:
+        raise ImproperlyConfigured(
+            "DB_CONNECTION_MODE=pool needs psycopg 3 with the pool extra: pip install 'psycopg[binary,pool]'"
+        ) from e
+    options = {'min_size': min_size, 'max_size': max_size, 'timeout': timeout}
+    # psycopg_pool >= 3.2 can validate a connection as it leaves the pool.
+    if hasattr(ConnectionPool, 'check_connection'):
+        options['check'] = ConnectionPool.check_connection
+    return options
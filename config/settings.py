@@ -2,7 +2,8 @@ import os
 from pathlib import Path
 
 from decouple import config
-import dj_database_url
+
+from config.database import database_settings
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -14,6 +15,10 @@ DEBUG = config('DEBUG', cast=bool)
 ALLOWED_HOSTS = config('ALLOWED_HOSTS').split(',')
 CSRF_TRUSTED_ORIGINS = config('CSRF_TRUSTED_ORIGINS').split(',')
 
+# Prewarm URLs, templates and reference data when config/wsgi.py is
+# imported (lambda init) rather than on the first request.
+FAST_START = config('FAST_START', default=False, cast=bool)
+
 if not DEBUG:
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
@@ -43,6 +48,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -59,13 +65,22 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Spelled out instead of APP_DIRS so every worker keeps its
+            # compiled templates; runserver's autoreloader still resets
+            # the cache when a template changes on disk.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.core.context_processors.notifications',
             ],
         },
     },
@@ -77,12 +92,19 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database — parsed from the required DATABASE_URL. DB_SSL_REQUIRE lets the
 # same settings.py work against local psql (SSL off) and Neon (SSL required)
 # without any hardcoded assumption baked into the code.
+# DB_CONNECTION_MODE is 'persistent', 'pool' or 'pgbouncer'; see
+# config/database.py, and compare them with `manage.py check_database`.
 # ---------------------------------------------------------------------------
+DB_CONNECTION_MODE = config('DB_CONNECTION_MODE', default='persistent')
 DATABASES = {
-    'default': dj_database_url.parse(
+    'default': database_settings(
         config('DATABASE_URL'),
-        conn_max_age=600,
+        mode=DB_CONNECTION_MODE,
         ssl_require=config('DB_SSL_REQUIRE', cast=bool),
+        conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+        pool_min_size=config('DB_POOL_MIN_SIZE', default=0, cast=int),
+        pool_max_size=config('DB_POOL_MAX_SIZE', default=4, cast=int),
+        pool_timeout=config('DB_POOL_TIMEOUT', default=10, cast=int),
     )
 }
 
@@ -91,6 +113,18 @@ DATABASES = {
 # ---------------------------------------------------------------------------
 AUTH_USER_MODEL = 'accounts.User'
 
+# With IDENTITY_CACHE on, request.user is built from a cached identity
+# snapshot (apps/accounts/identity.py) instead of a User query per request.
+# SESSION_ENGINE='django.contrib.sessions.backends.cached_db' likewise reads
+# sessions from the cache. Both need a cache every process shares
+# (Redis/Memcached in CACHES): with the default per-process LocMemCache a
+# logout, password change or deactivation in one worker would go unseen
+# by the others. `manage.py check` fails if either is enabled on locmem
+# (apps/accounts/checks.py).
+AUTHENTICATION_BACKENDS = ['apps.accounts.backends.CachedUserBackend']
+IDENTITY_CACHE = config('IDENTITY_CACHE', default=False, cast=bool)
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
@@ -105,6 +139,31 @@ LOGIN_URL = 'accounts:login'
 LOGIN_REDIRECT_URL = 'accounts:dashboard'
 LOGOUT_REDIRECT_URL = 'accounts:login'
 
+# ---------------------------------------------------------------------------
+# Rate limiting — shared counter store for apps.core.ratelimit. The
+# database store works across serverless instances without Redis;
+# CacheStore is fine once a shared cache (Redis/Memcached) is configured
+# in CACHES.
+# ---------------------------------------------------------------------------
+RATE_LIMIT_STORE = config('RATE_LIMIT_STORE', default='apps.core.ratelimit.DatabaseStore')
+# Proxies in front of the app that append to X-Forwarded-For; the client IP
+# is the entry that many hops from the right. Vercel's edge is one.
+RATE_LIMIT_TRUSTED_PROXIES = config('RATE_LIMIT_TRUSTED_PROXIES', default=1, cast=int)
+
+# ---------------------------------------------------------------------------
+# Access checks — seconds to cache group-membership / friendship checks
+# across requests (apps/core/access.py). 0 keeps them request-scoped only;
+# anything else needs a shared cache in CACHES (apps/core/checks.py).
+# ---------------------------------------------------------------------------
+ACCESS_CACHE_TTL = config('ACCESS_CACHE_TTL', default=0, cast=int)
+
+# ---------------------------------------------------------------------------
+# Search — user search backend (apps/core/search.py): 'postgres', 'python'
+# (in-process inverted index), or 'auto' to use PostgreSQL full-text when
+# available.
+# ---------------------------------------------------------------------------
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='auto')
+
 # ---------------------------------------------------------------------------
 # Internationalization
 # ---------------------------------------------------------------------------
@@ -119,10 +178,30 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# `manage.py build_assets` always collects with MANIFEST_STATIC_STORAGE:
+# hashed names (safe to cache forever) plus .gz/.br variants. Serving them
+# needs the staticfiles.json it writes next to the files, and a manifest
+# storage without one fails every {% static %} with a 500. The Vercel
+# build (build_files.sh) runs build_assets and ships staticfiles.json in
+# the lambda, and vercel.json turns STATIC_MANIFEST on there; elsewhere it
+# stays off (plain names) unless the deployment ships STATIC_ROOT from a build.
+# STATICFILES_STORAGE was removed in Django 5.1, so this must be STORAGES.
+MANIFEST_STATIC_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STATIC_MANIFEST = config('STATIC_MANIFEST', default=False, cast=bool)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': MANIFEST_STATIC_STORAGE if STATIC_MANIFEST
+        else 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Stream every upload to a temporary file in chunks instead of holding
+# up to 2.5 MB per file in memory; apps/accounts/avatars.py validates it
+# from there.
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -131,6 +210,32 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ---------------------------------------------------------------------------
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
 
+# ---------------------------------------------------------------------------
+# Outbox — with OUTBOX_ENABLED=True, emails, notification writes and avatar
+# thumbnails are queued in the database and delivered by
+# `python manage.py run_outbox`. Off by default: the Vercel deployment runs
+# no worker, so queued work would never be delivered and it runs inline.
+# Only enable it where a run_outbox worker (or cron) is running.
+# ---------------------------------------------------------------------------
+OUTBOX_ENABLED = config('OUTBOX_ENABLED', default=False, cast=bool)
+
+# ---------------------------------------------------------------------------
+# Performance budgets — max DB queries per URL name, optionally per method
+# ('POST accounts:login'), measured with warm in-process caches.
+# RequestMetricsMiddleware logs a warning when a request goes over;
+# apps.core.testing.QueryBudgetMixin fails tests.
+# ---------------------------------------------------------------------------
+QUERY_BUDGETS = {
+    'accounts:signup': 0,
+    'POST accounts:signup': 15,
+    'accounts:login': 0,
+    'POST accounts:login': 20,
+    'accounts:dashboard': 2,  # session + User row; 0 with cached sessions and IDENTITY_CACHE
+    'core:neighborhoods': 0,
+    'core:search': 4,
+    'core:autocomplete': 3,
+}
+
 # ---------------------------------------------------------------------------
 # Logging — exceptions are logged server-side, never shown raw to users
 # ---------------------------------------------------------------------------
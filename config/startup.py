@@ -0,0 +1,139 @@
+"""
+Cold-start helpers for the Vercel WSGI entry point.
+
+With FAST_START=True, config/wsgi.py calls prewarm() while the lambda is
+initializing, so work that would otherwise land on the first request
+happens during init instead:
+
+    urls        populate the root URL resolver (every app's urls.py and
+                the admin's per-model patterns) so the first reverse() or
+                resolve() is a dict lookup
+    templates   compile the project's templates into the cached loader
+    assets      read the build_assets manifest and critical CSS that
+                base.html inlines
+    reference   load City/Neighborhood/Interest (reference.py), which also
+                opens the database connection the first request reuses
+
+Heavy optional dependencies stay out of this path by construction:
+Pillow is only imported by ImageField validation, and the management-only
+modules (data generation, benchmarks, batch jobs, the asset build) are
+never imported by the request path. `manage.py profile_startup` reports per-module import
+time and fails if any module in DEFERRED_MODULES shows up at startup.
+
+measure_cold_start() times a fresh interpreter from launch to its first
+response; the benchmark suite and profile_startup both use it.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Must not be imported while booting the WSGI app.
+DEFERRED_MODULES = (
+    'PIL',
+    'apps.core.assets',
+    'apps.core.datagen',
+    'apps.core.benchmarks',
+    'apps.accounts.recommendations',
+)
+
+
+def project_templates():
+    """Template names under TEMPLATES DIRS and this project's apps (not Django's)."""
+    from django.apps import apps
+    from django.conf import settings
+
+    roots = [Path(d) for engine in settings.TEMPLATES for d in engine.get('DIRS', [])]
+    roots += [
+        Path(app.path) / 'templates'
+        for app in apps.get_app_configs() if app.name.startswith('apps.')
+    ]
+    names = set()
+    for root in roots:
+        if root.is_dir():
+            names.update(p.relative_to(root).as_posix() for p in root.rglob('*.html'))
+    return sorted(names)
+
+
+def prewarm():
+    from django.db import DatabaseError
+    from django.template.loader import get_template
+    from django.urls import get_resolver
+
+    from apps.core import reference
+    from apps.core.templatetags import assets
+
+    timings = {}
+
+    start = time.perf_counter()
+    get_resolver().reverse_dict  # noqa: B018 — populates every nested resolver
+    timings['urls_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for name in project_templates():
+        get_template(name)
+    timings['templates_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    assets.build()
+    timings['assets_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    try:
+        reference.get()
+    except DatabaseError as e:
+        # The first request will load it instead.
+        logger.warning(f"Prewarm skipped reference data: {e}")
+    timings['reference_ms'] = (time.perf_counter() - start) * 1000
+
+    logger.info(json.dumps({'prewarm': {k: round(v, 2) for k, v in timings.items()}}))
+    return timings
+
+
+_FIRST_RESPONSE_SCRIPT = '''
+import io, json, sys, time
+start = time.perf_counter()
+from config.wsgi import application
+booted = time.perf_counter()
+status = []
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'QUERY_STRING': '',
+    'SERVER_NAME': sys.argv[2], 'SERVER_PORT': '443', 'HTTP_HOST': sys.argv[2],
+    'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'https', 'wsgi.input': io.BytesIO(),
+    'wsgi.errors': sys.stderr, 'wsgi.multithread': False, 'wsgi.multiprocess': False,
+    'wsgi.run_once': True, 'wsgi.version': (1, 0), 'HTTP_X_FORWARDED_PROTO': 'https',
+}
+b''.join(application(environ, lambda s, h, exc_info=None: status.append(s)))
+done = time.perf_counter()
+print(json.dumps({'status': status[0], 'boot_ms': (booted - start) * 1000,
+                  'first_request_ms': (done - booted) * 1000}))
+'''
+
+
+def measure_cold_start(path='/login/', fast_start=False):
+    """
+    Launch a fresh interpreter, boot config.wsgi, serve one GET of `path`
+    and return {'status', 'boot_ms', 'first_request_ms', 'total_ms'} where
+    total_ms is launch-to-response wall time as seen from outside.
+    """
+    from django.conf import settings
+
+    env = dict(os.environ, FAST_START='True' if fast_start else 'False')
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    host = next((h for h in settings.ALLOWED_HOSTS if h and not h.startswith('.') and h != '*'), 'localhost')
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', _FIRST_RESPONSE_SCRIPT, path, host],
+        capture_output=True, text=True, env=env, cwd=settings.BASE_DIR, check=True,
+    )
+    total_ms = (time.perf_counter() - start) * 1000
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    data['total_ms'] = total_ms
+    return data
@@ -4,4 +4,12 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# FAST_START moves first-request work (URLconf, templates, reference data)
+# into lambda init; see config/startup.py.
+from django.conf import settings  # noqa: E402
+
+if settings.FAST_START:
+    from config.startup import prewarm
+    prewarm()